@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark de saída - LivChat Setup v0.1
+Linhas/s do Logger e do BoxDrawer nos cenários comuns de uma instalação:
+passos com contador, saída de comandos no modo --dev, seções e boxes de erro.
+A saída vai para /dev/null com buffer de linha, como num terminal, e o
+benchmark conta as syscalls write() por linha.
+
+Uso: python3 benchmarks/bench_output.py [--lines 20000] [--repeat 5]
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.logger import BoxDrawer, Colors, Logger
+
+
+class CountingDevNull(io.FileIO):
+    """/dev/null que conta as syscalls write()"""
+
+    def __init__(self):
+        super().__init__(os.devnull, "w")
+        self.syscalls = 0
+
+    def write(self, data):
+        self.syscalls += 1
+        return super().write(data)
+
+
+def terminal_like():
+    """(stream com buffer de linha igual ao de um terminal, contador de syscalls)"""
+    raw = CountingDevNull()
+    return io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8", line_buffering=True), raw
+
+
+def scenario_steps(count: int):
+    logger = Logger()
+    logger.start_progress(count)
+    for i in range(count):
+        logger.success(f"Instalado app-{i % 40}")
+    return count
+
+
+def scenario_dev_output(count: int):
+    logger = Logger(dev_mode=True)
+    for i in range(count):
+        logger.command_output(f"Step {i % 50}/50 : RUN apt-get install -y pacote-{i % 7}", source="web-01")
+    return count
+
+
+def scenario_boxes(count: int):
+    logger = Logger()
+    boxes = count // 7  # cada iteração escreve ~7 linhas
+    for i in range(boxes):
+        logger.section(f"INSTALANDO APLICAÇÕES ({i % 5})")
+        logger.error(f"Falha ao publicar stack app-{i % 40}", hint="Verifique os logs do serviço")
+    return boxes * 7
+
+
+def scenario_box_lines(count: int):
+    box = BoxDrawer(103)
+    contents = [f"{Colors.BRANCO}linha {i % 100}{Colors.RESET}" for i in range(100)]
+    for i in range(count // 2):
+        box.line_centered(contents[i % 100])
+        box.line_left(contents[(i + 1) % 100])
+    return count // 2 * 2
+
+
+SCENARIOS = [
+    ("passos com contador", scenario_steps),
+    ("saída de comandos (--dev)", scenario_dev_output),
+    ("seções e boxes de erro", scenario_boxes),
+    ("BoxDrawer (sem escrever)", scenario_box_lines),
+]
+
+
+def measure(label: str, scenario, count: int, repeat: int):
+    """Melhor de `repeat` execuções"""
+    best = None
+    for _ in range(repeat):
+        stream, raw = terminal_like()
+        original = sys.stdout
+        sys.stdout = stream
+        try:
+            start = time.perf_counter()
+            lines = scenario(count)
+            elapsed = time.perf_counter() - start
+        finally:
+            sys.stdout = original
+            stream.close()
+        if best is None or elapsed < best:
+            best = elapsed
+    print(f"  {label:<28} {lines / best:12,.0f} linhas/s  {raw.syscalls / lines:5.2f} write()/linha")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de saída do Logger/BoxDrawer")
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Escrevendo {args.lines} linhas por cenário (melhor de {args.repeat})")
+    for label, scenario in SCENARIOS:
+        measure(label, scenario, args.lines, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
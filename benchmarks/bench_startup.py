@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização - LivChat Setup v0.1
+Mede o tempo de `setup.py <comando>` (wall clock) e os imports mais caros
+(-X importtime). Sai com código 1 se algum comando passar do orçamento.
+
+Uso: python3 benchmarks/bench_startup.py [--runs 10] [--budget-ms 150]
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SETUP = os.path.join(BASE_DIR, "setup.py")
+
+# Comandos com orçamento (ms, mediana). --version é a referência mínima.
+DEFAULT_COMMANDS = ["--version", "list", "status"]
+
+# Módulos que nunca devem ser carregados por esses comandos
+FORBIDDEN = ("paramiko", "jinja2", "termios", "tty", "subprocess", "http.client", "core.menu")
+# Exceções por comando: status fala com a Docker API
+ALLOWED = {"status": ("http.client",)}
+# status sai com 1 quando não há Docker na máquina do benchmark
+EXIT_CODES = {"status": (0, 1)}
+
+
+def run_once(command: str, importtime: bool = False):
+    """Executa setup.py e devolve (segundos, stderr)"""
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += [SETUP] + command.split()
+    start = time.perf_counter()
+    result = subprocess.run(cmd, cwd=BASE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode not in EXIT_CODES.get(command, (0,)):
+        raise RuntimeError(f"setup.py {command} saiu com código {result.returncode}: {result.stderr.strip()[-300:]}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr: str):
+    """[(cumulativo_us, módulo)] das linhas de -X importtime"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            cumulative = int(parts[1])
+        except ValueError:
+            continue  # cabeçalho
+        modules.append((cumulative, parts[2].strip()))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização do setup.py")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="Orçamento por comando (mediana)")
+    parser.add_argument("--top", type=int, default=8, help="Imports mais caros a exibir")
+    parser.add_argument("commands", nargs="*", default=DEFAULT_COMMANDS)
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        print("Aviso: sem root, setup.py para no check_root (tempos ficam subestimados)")
+
+    failed = False
+    for command in args.commands:
+        run_once(command)  # aquece cache de disco e o índice do catálogo
+        times = [run_once(command)[0] * 1000 for _ in range(args.runs)]
+        median = statistics.median(times)
+
+        _, stderr = run_once(command, importtime=True)
+        modules = parse_importtime(stderr)
+        loaded = {name for _, name in modules}
+        forbidden = [m for m in FORBIDDEN if m in loaded and m not in ALLOWED.get(command, ())]
+
+        status = "OK" if median <= args.budget_ms and not forbidden else "FALHOU"
+        failed |= status != "OK"
+        print(f"\nsetup.py {command or '(menu)'}: mediana {median:.1f} ms, mín {min(times):.1f} ms "
+              f"(orçamento {args.budget_ms:.0f} ms) [{status}]")
+        if forbidden:
+            print(f"  módulos proibidos carregados: {', '.join(forbidden)}")
+        top_level = [(us, name) for us, name in modules if "." not in name or name.startswith("core.")]
+        for us, name in sorted(top_level, reverse=True)[:args.top]:
+            print(f"  {us / 1000:7.2f} ms  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks - LivChat Setup v0.1
+Números repetíveis para os caminhos quentes, gravados em JSON e comparados
+com uma baseline
+
+Casos:
+  menu.draw.N          tempo de um frame do menu (_draw_menu) com N apps
+  box.line_centered    linhas/s do BoxDrawer
+  logger.prod/dev      linhas/s do Logger (stream com buffer de linha)
+  config.load.1000     load_config + lista de instâncias com 1000 registros
+  config.export.1000   leitura de todos os 1000 registros
+  startup.<comando>    partida a frio do setup.py (subprocesso)
+  scheduler.makespan   makespan/limite inferior num grafo sintético de
+                       dependências com durações falsas (1.00 = ótimo)
+
+Cada caso roda `--repeat` vezes e vale a mediana. O resultado vai para
+benchmarks/results/<data>.json e é comparado com a baseline versionada
+(benchmarks/baseline.json); a suíte sai com código 1 se algum caso piorar
+mais que --threshold. Ao aceitar uma mudança de desempenho, grave a nova
+referência com --save-baseline e inclua o arquivo no commit. Os números
+dependem da máquina: a comparação avisa quando a baseline veio de outra.
+
+Uso: python3 benchmarks/suite.py [--repeat 5] [--only menu,logger] [--threshold 0.25]
+                                 [--baseline ARQUIVO] [--save-baseline] [--quick]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+# Altura de terminal fixa para o menu montar sempre o mesmo número de linhas
+os.environ["LINES"] = "40"
+os.environ["COLUMNS"] = "120"
+
+
+class Case:
+    """Um benchmark: função que mede uma vez e devolve o valor"""
+
+    def __init__(self, name: str, unit: str, better: str, measure: Callable[[], float], quick: bool = True):
+        self.name = name
+        self.unit = unit
+        self.better = better  # "lower" ou "higher"
+        self.measure = measure
+        self.quick = quick
+
+
+# ===== Menu =====
+
+def _fake_catalog(count: int, root: str):
+    from core.catalog import Catalog
+
+    apps_dir = os.path.join(root, f"apps-{count}")
+    os.makedirs(apps_dir, exist_ok=True)
+    categories = ["Infraestrutura", "Banco de dados", "Automação", "Comunicação", "Monitoramento"]
+    for i in range(count):
+        with open(os.path.join(apps_dir, f"app{i:04d}.json"), "w") as f:
+            json.dump({"id": f"app{i:04d}", "name": f"Aplicação {i}", "category": categories[i % 5],
+                       "order": i, "depends": []}, f)
+    return Catalog(apps_dir, os.path.join(root, f"index-{count}.json"))
+
+
+def menu_case(count: int, root: str, frames: int = 200) -> Callable[[], float]:
+    def measure():
+        import core.menu as menu_module
+        from core.logger import Logger
+        from core.screen import ScreenBuffer
+
+        catalog = _fake_catalog(count, root)
+        original = menu_module.get_catalog
+        menu_module.get_catalog = lambda: catalog
+        try:
+            menu = menu_module.InteractiveMenu(Logger(stream=io.StringIO()), {})
+        finally:
+            menu_module.get_catalog = original
+        menu.screen = ScreenBuffer(stream=io.StringIO())
+        menu._draw_menu()
+        start = time.perf_counter()
+        for frame in range(frames):
+            # Cada frame é uma tecla: cursor anda uma linha (rola a janela nas listas longas)
+            menu.viewport.move_to(frame % count)
+            menu._draw_menu()
+        return (time.perf_counter() - start) / frames * 1000
+    return measure
+
+
+# ===== Saída =====
+
+def box_case(lines: int = 100000) -> Callable[[], float]:
+    def measure():
+        from core.logger import BoxDrawer, Colors
+
+        box = BoxDrawer(103)
+        contents = [f"{Colors.BRANCO}Instalando app-{i}{Colors.RESET}" for i in range(100)]
+        start = time.perf_counter()
+        for i in range(lines):
+            box.line_centered(contents[i % 100])
+        return lines / (time.perf_counter() - start)
+    return measure
+
+
+def logger_case(dev: bool, lines: int = 20000) -> Callable[[], float]:
+    def measure():
+        from bench_output import scenario_dev_output, scenario_steps, terminal_like
+
+        stream, _ = terminal_like()
+        original = sys.stdout
+        sys.stdout = stream
+        try:
+            start = time.perf_counter()
+            count = (scenario_dev_output if dev else scenario_steps)(lines)
+            elapsed = time.perf_counter() - start
+        finally:
+            sys.stdout = original
+            stream.close()
+        return count / elapsed
+    return measure
+
+
+# ===== Configuração =====
+
+def _config_with_instances(root: str, count: int) -> str:
+    from core.config_store import ConfigStore
+
+    path = os.path.join(root, f"config-{count}", "config.json")
+    if os.path.exists(path):
+        return path
+    store = ConfigStore(Path(path))
+    store.load()
+    for i in range(count):
+        store.put_instance(f"app{i % 40:02d}", f"i{i}", {
+            "app": f"app{i % 40:02d}", "instance": f"i{i}", "stack": f"app{i % 40:02d}_i{i}",
+            "installed_at": 1700000000.0 + i, "fingerprint": {"stack": "0" * 64, "env": "1" * 64, "images": {}},
+        })
+    return path
+
+
+def config_load_case(root: str, count: int = 1000) -> Callable[[], float]:
+    def measure():
+        from core.config_store import ConfigStore
+
+        path = _config_with_instances(root, count)
+        start = time.perf_counter()
+        store = ConfigStore(Path(path))
+        store.load()
+        instances = store.list_instances()
+        elapsed = time.perf_counter() - start
+        assert len(instances) == count
+        return elapsed * 1000
+    return measure
+
+
+def config_export_case(root: str, count: int = 1000) -> Callable[[], float]:
+    def measure():
+        from core.config_store import ConfigStore
+
+        path = _config_with_instances(root, count)
+        start = time.perf_counter()
+        data = ConfigStore(Path(path)).export()
+        elapsed = time.perf_counter() - start
+        assert sum(len(app["instances"]) for app in data["applications"].values()) == count
+        return elapsed * 1000
+    return measure
+
+
+# ===== Partida a frio =====
+
+def startup_case(command: str) -> Callable[[], float]:
+    def measure():
+        from bench_startup import run_once
+
+        return run_once(command)[0] * 1000
+    return measure
+
+
+# ===== Agendador =====
+
+def synthetic_graph(apps: int = 40, seed: int = 7):
+    """Grafo em camadas (infra -> bancos -> apps) com durações falsas em segundos"""
+    rng = random.Random(seed)
+    names = [f"app{i:02d}" for i in range(apps)]
+    deps: Dict[str, List[str]] = {}
+    durations: Dict[str, float] = {}
+    for i, name in enumerate(names):
+        earlier = names[:i]
+        deps[name] = rng.sample(earlier, min(len(earlier), rng.choice((0, 1, 1, 2)))) if i >= 4 else []
+        durations[name] = rng.uniform(0.005, 0.03)
+    return deps, durations
+
+
+def lower_bound(deps: Dict[str, List[str]], durations: Dict[str, float], jobs: int) -> float:
+    """max(caminho crítico, trabalho total / jobs): nenhum agendador faz melhor"""
+    finish: Dict[str, float] = {}
+
+    def critical(app: str) -> float:
+        if app not in finish:
+            finish[app] = durations[app] + max((critical(dep) for dep in deps[app]), default=0.0)
+        return finish[app]
+
+    return max(max(critical(app) for app in deps), sum(durations.values()) / jobs)
+
+
+def scheduler_case(jobs: int = 4) -> Callable[[], float]:
+    def measure():
+        from core.scheduler import InstallScheduler
+
+        deps, durations = synthetic_graph()
+        cancel = threading.Event()
+        start = time.perf_counter()
+        results = InstallScheduler(deps, jobs=jobs).run(lambda app: time.sleep(durations[app]), cancel=cancel)
+        makespan = time.perf_counter() - start
+        assert all(status == "done" for status in results.values())
+        return makespan / lower_bound(deps, durations, jobs)
+    return measure
+
+
+# ===== Execução =====
+
+def build_cases(root: str) -> List[Case]:
+    cases = [Case(f"menu.draw.{count}", "ms/frame", "lower", menu_case(count, root)) for count in (8, 200, 2000)]
+    cases += [
+        Case("box.line_centered", "linhas/s", "higher", box_case()),
+        Case("logger.prod", "linhas/s", "higher", logger_case(dev=False)),
+        Case("logger.dev", "linhas/s", "higher", logger_case(dev=True)),
+        Case("config.load.1000", "ms", "lower", config_load_case(root)),
+        Case("config.export.1000", "ms", "lower", config_export_case(root)),
+        Case("startup.version", "ms", "lower", startup_case("--version"), quick=False),
+        Case("startup.list", "ms", "lower", startup_case("list"), quick=False),
+        Case("scheduler.makespan", "x ótimo", "lower", scheduler_case()),
+    ]
+    return cases
+
+
+def run_case(case: Case, repeat: int) -> Dict:
+    case.measure()  # aquecimento (imports, caches de disco)
+    samples = [case.measure() for _ in range(repeat)]
+    return {
+        "unit": case.unit,
+        "better": case.better,
+        "value": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "samples": samples,
+    }
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> Dict[str, Dict]:
+    """Variação de cada caso contra a baseline (positivo = pior)"""
+    verdicts = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("value"):
+            verdicts[name] = {"change": None, "status": "novo"}
+            continue
+        if result["better"] == "lower":
+            change = (result["value"] - base["value"]) / base["value"]
+        else:
+            change = (base["value"] - result["value"]) / base["value"]
+        status = "REGRESSÃO" if change > threshold else ("melhor" if change < -threshold else "ok")
+        verdicts[name] = {"change": change, "status": status, "baseline": base["value"]}
+    return verdicts
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR, capture_output=True,
+                              text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suíte de benchmarks dos caminhos quentes")
+    parser.add_argument("--repeat", type=int, default=5, help="Execuções por caso (vale a mediana)")
+    parser.add_argument("--only", default="", help="Prefixos dos casos, separados por vírgula (ex.: menu,logger)")
+    parser.add_argument("--quick", action="store_true", help="Pula os casos que criam subprocessos")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Piora relativa que conta como regressão (padrão: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="JSON de referência")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava este resultado como a baseline")
+    parser.add_argument("--output", help="Arquivo do resultado (padrão: benchmarks/results/<data>.json)")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="livchat-bench-")
+    try:
+        prefixes = [p.strip() for p in args.only.split(",") if p.strip()]
+        cases = [case for case in build_cases(root)
+                 if (not prefixes or any(case.name.startswith(p) for p in prefixes))
+                 and (case.quick or not args.quick)]
+        print(f"{len(cases)} casos, {args.repeat} execuções cada (mediana)\n")
+        results = {}
+        for case in cases:
+            results[case.name] = run_case(case, args.repeat)
+            print(f"  {case.name:<22} {results[case.name]['value']:>14,.3f} {case.unit}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    document = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    print(f"\nResultado: {os.path.relpath(output)}")
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        verdicts = compare(results, baseline.get("results", {}), args.threshold)
+        meta = baseline.get("meta", {})
+        print(f"\nComparação com {os.path.relpath(args.baseline)} "
+              f"({meta.get('revision') or '?'} de {meta.get('timestamp', '?')}, limite {args.threshold:.0%})")
+        machine = {key: document["meta"][key] for key in ("python", "platform", "cpus")}
+        if any(meta.get(key) != value for key, value in machine.items()):
+            print(f"Aviso: baseline medida em outra máquina ({meta.get('platform', '?')}, "
+                  f"{meta.get('cpus', '?')} CPUs, Python {meta.get('python', '?')}): compare só a tendência")
+        print()
+        for name, verdict in verdicts.items():
+            change = "" if verdict["change"] is None else f"{verdict['change']:+7.1%} pior" \
+                if verdict["change"] >= 0 else f"{-verdict['change']:7.1%} melhor"
+            print(f"  {name:<22} {change:<16} {verdict['status']}")
+            if verdict["status"] == "REGRESSÃO":
+                regressions.append(name)
+    elif not args.save_baseline:
+        print("Sem baseline: use --save-baseline para gravar esta execução como referência")
+
+    if args.save_baseline:
+        shutil.copyfile(output, args.baseline)
+        print(f"Baseline gravada em {os.path.relpath(args.baseline)}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressões: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Agente Residente - LivChat Setup v0.1
+Processo de longa duração que mantém o estado caro de montar entre uma
+chamada e outra do setup.py: cliente Docker, tabela de status alimentada
+pelos eventos (com o cache de CPU/memória), pool SSH e catálogo
+
+- `setup.py agent` atende em config.d/agent.sock (permissão 0600)
+- `list` e `status` (sem --watch/--profile) são enviados ao agente quando
+  ele está no ar; sem agente, rodam no próprio processo como antes
+- o lado do cliente fica em core/agent_client.py (caminho de partida)
+- protocolo: uma linha JSON com o pedido, respostas em linhas JSON
+  ({"out": texto} ... {"exit": código}); {"fallback": true} devolve o
+  comando para o processo que chamou
+- os comandos rodam um de cada vez (a saída de print() é redirecionada
+  para a conexão do cliente)
+- tabelas de status sem consulta há WATCH_IDLE segundos são fechadas, e no
+  máximo MAX_WATCHES ficam abertas (a menos usada sai primeiro)
+"""
+
+import os
+import json
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from .agent_client import AGENT_SOCKET, AgentError, connect, eligible, send_message
+
+# Cada tabela de status mantém uma assinatura de /events e amostras de CPU
+MAX_WATCHES = 8
+WATCH_IDLE = 600.0
+
+
+class _Reply:
+    """Saída de um comando: acumula o texto e envia a cada flush()"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._parts: List[str] = []
+
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        return len(text)
+
+    def flush(self):
+        if self._parts:
+            text, self._parts = "".join(self._parts), []
+            self.send({"out": text})
+
+    def send(self, message: Dict):
+        try:
+            send_message(self.sock, message)
+        except OSError:
+            pass  # cliente saiu (Ctrl+C): o comando termina mesmo assim
+
+    @staticmethod
+    def isatty() -> bool:
+        return False
+
+
+class Agent:
+    """Servidor do agente: estado quente compartilhado pelos comandos atendidos"""
+
+    def __init__(self, logger, commands: Dict, socket_path: str = AGENT_SOCKET,
+                 max_watches: int = MAX_WATCHES, watch_idle: float = WATCH_IDLE):
+        """
+        Args:
+            logger: Logger do processo do agente (o log de eventos é compartilhado)
+            commands: subcomando -> handler(args, logger), o mesmo mapa do setup.py
+            socket_path: onde o agente atende
+            max_watches: tabelas de status abertas ao mesmo tempo
+            watch_idle: segundos sem consulta até uma tabela ser fechada
+        """
+        self.logger = logger
+        self.commands = commands
+        self.socket_path = socket_path
+        self.cwd = os.path.realpath(os.getcwd())
+        self.started_at = time.time()
+        self.served = 0
+        self._client = None
+        self._pool = None
+        self.max_watches = max_watches
+        self.watch_idle = watch_idle
+        self._watches: "OrderedDict[tuple, object]" = OrderedDict()  # da menos para a mais usada
+        self._watch_used: Dict[tuple, float] = {}
+        self._lock = threading.Lock()  # um comando por vez (stdout é redirecionado)
+        self._server = None
+
+    # ===== Estado quente =====
+
+    def docker(self):
+        """Cliente Docker compartilhado (conexões keep-alive por thread)"""
+        if self._client is None:
+            from .docker_api import DockerClient
+            self._client = DockerClient()
+        return self._client
+
+    def ssh_pool(self):
+        """Pool SSH que fica aberto entre os comandos (o reaper fecha o que ficar ocioso)"""
+        if self._pool is None:
+            from .ssh import get_pool
+            self._pool = get_pool()
+            self._pool.prompt = None  # o terminal do agente não é o do cliente: sem pedido de senha
+        return self._pool
+
+    def watch(self, app: Optional[str], interval: float):
+        """
+        Tabela de status mantida pelos eventos do Docker. A primeira consulta
+        de cada filtro custa o mesmo que o status avulso; as seguintes só
+        aplicam o que os eventos marcaram.
+        """
+        from .watch import StatusWatch
+
+        key = (app, interval)
+        watch = self._watches.get(key)
+        if watch is None:
+            watch = StatusWatch(self.logger, self.docker(), app=app, interval=interval)
+            watch.snapshot()  # réplicas e a primeira amostra de CPU
+            watch.start()
+            self._watches[key] = watch
+        else:
+            watch.update()
+            self._watches.move_to_end(key)
+        self._watch_used[key] = time.monotonic()
+        self.evict_watches()
+        return watch
+
+    def evict_watches(self):
+        """Fecha as tabelas ociosas e as menos usadas acima de max_watches"""
+        now = time.monotonic()
+        for key in list(self._watches):
+            if now - self._watch_used.get(key, now) > self.watch_idle or len(self._watches) > self.max_watches:
+                self._watch_used.pop(key, None)
+                self._watches.pop(key).close()
+
+    # ===== Atendimento =====
+
+    def execute(self, request: Dict, reply: _Reply):
+        """Roda um comando do cliente com a saída indo para a conexão"""
+        from contextlib import redirect_stderr, redirect_stdout
+        from io import StringIO
+        from .cli import CLIParser
+        from .catalog import get_catalog
+        from .logger import Logger
+
+        if os.path.realpath(request.get("cwd") or "") != self.cwd:
+            reply.send({"fallback": True})  # config.json e config.d/ são relativos ao diretório
+            return
+        try:
+            with redirect_stderr(StringIO()):  # o erro do argparse aparece no cliente, que refaz o parse
+                args = CLIParser().parse_args(request.get("argv") or [])
+        except SystemExit:
+            reply.send({"fallback": True})
+            return
+        if not eligible(args):
+            reply.send({"fallback": True})
+            return
+
+        args.agent = self
+        code = 0
+        with self._lock, redirect_stdout(reply):
+            self.served += 1
+            get_catalog().invalidate()  # apps/ pode ter mudado desde o último comando
+            logger = Logger(dev_mode=args.dev, stream=reply, events=self.logger.events)
+            try:
+                self.commands[args.command](args, logger)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                logger.exception(e)
+                code = 1
+            finally:
+                reply.flush()
+        reply.send({"exit": code})
+
+    def info(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started_at,
+            "served": self.served,
+            "watches": [app or "*" for app, _ in self._watches],
+            "ssh": self._pool.stats() if self._pool else {},
+        }
+
+    def _handle(self, sock):
+        line = sock.makefile("rb").readline()
+        if not line:
+            return
+        request = json.loads(line)
+        reply = _Reply(sock)
+        action = request.get("control")
+        if action == "info":
+            reply.send(self.info())
+        elif action == "stop":
+            reply.send({"stopping": True})
+            threading.Thread(target=self._server.shutdown, daemon=True).start()
+        else:
+            self.execute(request, reply)
+
+    # ===== Ciclo de vida =====
+
+    def serve(self):
+        """Atende até Ctrl+C, SIGTERM ou `setup.py agent stop`"""
+        import signal
+        import socketserver
+
+        agent = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                agent._handle(self.request)
+
+        class Server(socketserver.ThreadingUnixStreamServer):
+            def service_actions(self):
+                # Chamado a cada volta do serve_forever: fecha tabelas ociosas
+                # sem esperar o próximo comando (nunca bloqueia no comando em curso)
+                if agent._lock.acquire(blocking=False):
+                    try:
+                        agent.evict_watches()
+                    finally:
+                        agent._lock.release()
+
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        running = connect(self.socket_path)
+        if running is not None:
+            running.close()
+            raise AgentError(f"Agente já em execução em {self.socket_path}")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # sobra de um agente que não encerrou direito
+
+        previous_umask = os.umask(0o077)  # socket 0600: só o dono (root) conecta
+        try:
+            self._server = Server(self.socket_path, Handler)
+        finally:
+            os.umask(previous_umask)
+        self._server.daemon_threads = True
+
+        def terminate(signum, frame):
+            raise KeyboardInterrupt
+        signal.signal(signal.SIGTERM, terminate)
+
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.close()
+
+    def close(self):
+        """Fecha o socket, a assinatura de eventos e as conexões SSH"""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+        for watch in self._watches.values():
+            watch.close()
+        self._watches.clear()
+        self._watch_used.clear()
+        if self._pool is not None:
+            self._pool.close_all()
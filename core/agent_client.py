@@ -0,0 +1,103 @@
+"""
+Cliente do Agente - LivChat Setup v0.1
+Parte do agente que roda em toda chamada de `list`/`status`: decide pelo
+argv se o comando pode ir para o agente residente (core/agent.py) e repassa
+a saída dele; sem agente no ar, devolve None e o setup.py roda o comando
+no próprio processo
+
+Fica separado do servidor porque está no caminho de partida: só os, sys e
+json são importados antes de achar o socket.
+"""
+
+import os
+import sys
+import json
+from typing import Dict, List, Optional
+
+# Relativo ao diretório de trabalho, como config.json e config.d/
+AGENT_SOCKET = os.path.join("config.d", "agent.sock")
+# Subcomandos que o agente atende (somente leitura, sem terminal interativo)
+AGENT_COMMANDS = ("list", "status")
+# Opções que sempre rodam no próprio processo (terminal ao vivo, perfil, ajuda)
+LOCAL_OPTIONS = ("--no-agent", "--profile", "--profile-out", "--watch", "-w", "-h", "--help", "--version")
+CONNECT_TIMEOUT = 1.0
+
+
+class AgentError(Exception):
+    """Falha ao iniciar ou falar com o agente"""
+
+
+def wants_agent(argv: List[str]) -> bool:
+    """Triagem só pelo argv, antes do argparse (o agente confere de novo com eligible)"""
+    words = [arg for arg in argv if not arg.startswith("-")]
+    return (bool(words) and words[0] in AGENT_COMMANDS
+            and not any(arg.partition("=")[0] in LOCAL_OPTIONS for arg in argv))
+
+
+def eligible(args) -> bool:
+    """O comando pode ser atendido pelo agente?"""
+    return (args.command in AGENT_COMMANDS and not args.no_agent
+            and not args.profile and not args.profile_out
+            and not getattr(args, "watch", False))
+
+
+def connect(socket_path: str):
+    """Socket conectado ao agente, ou None se ele não estiver no ar"""
+    if not os.path.exists(socket_path):
+        return None
+    import socket
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        # Socket velho (agente morto) ou sem permissão: roda no processo
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def send_message(sock, request: Dict):
+    sock.sendall(json.dumps(request).encode() + b"\n")
+
+
+def forward(argv: List[str], socket_path: str = AGENT_SOCKET) -> Optional[int]:
+    """
+    Executa o comando no agente, repassando a saída
+
+    Returns:
+        Código de saída, ou None quando o comando deve rodar no próprio processo
+    """
+    sock = connect(socket_path)
+    if sock is None:
+        return None
+    with sock:
+        try:
+            send_message(sock, {"argv": argv, "cwd": os.getcwd()})
+            for line in sock.makefile("rb"):
+                message = json.loads(line)
+                if "out" in message:
+                    sys.stdout.write(message["out"])
+                    sys.stdout.flush()
+                elif "exit" in message:
+                    return message["exit"]
+                elif message.get("fallback"):
+                    return None
+        except (OSError, ValueError) as e:
+            raise AgentError(f"Falha na conexão com o agente: {e}")
+    raise AgentError("O agente encerrou a conexão antes do fim do comando")
+
+
+def control(action: str, socket_path: str = AGENT_SOCKET) -> Dict:
+    """Pedido de controle (stop/info) ao agente em execução"""
+    sock = connect(socket_path)
+    if sock is None:
+        raise AgentError(f"Agente não está em execução ({socket_path})")
+    with sock:
+        send_message(sock, {"control": action})
+        line = sock.makefile("rb").readline()
+    if not line:
+        raise AgentError("O agente encerrou a conexão sem responder")
+    return json.loads(line)
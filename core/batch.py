@@ -0,0 +1,125 @@
+"""
+Execução em Lote - LivChat Setup v0.1
+Compila os passos de um plano em um único script e o executa em um canal SSH
+
+Cada passo roda isolado (stdin em /dev/null, stderr junto do stdout) e é
+delimitado por marcadores com um nonce aleatório. A saída é lida em fluxo:
+o resultado de cada passo é informado assim que o marcador de fim chega,
+então o progresso continua passo a passo, mas o custo de rede é de um
+round-trip por lote em vez de um por comando.
+"""
+
+import time
+import secrets
+from typing import Callable, List, Optional
+
+from .steps import Step
+
+MARK = "\x1e"
+
+
+class StepResult:
+    """Resultado de um passo do lote (code None = não executado)"""
+
+    __slots__ = ("step", "code", "output", "seconds")
+
+    def __init__(self, step: Step, code: Optional[int] = None, output: str = "", seconds: float = 0.0):
+        self.step = step
+        self.code = code
+        self.output = output
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.code == 0
+
+
+def compile_script(steps: List[Step], nonce: str) -> str:
+    """Script sh que executa os passos em ordem e para no primeiro que falhar"""
+    lines = ["exec 2>&1"]
+    for index, step in enumerate(steps):
+        lines.append(f"printf '\\036{nonce} begin {index}\\n'")
+        lines.append(f"( {step.command}\n) </dev/null")
+        lines.append("rc=$?")
+        lines.append(f"printf '\\036{nonce} end {index} %d\\n' \"$rc\"")
+        lines.append("[ \"$rc\" -eq 0 ] || exit \"$rc\"")
+    lines.append("exit 0")
+    return "\n".join(lines) + "\n"
+
+
+class MarkerParser:
+    """Separa a saída de cada passo a partir do fluxo de bytes do canal"""
+
+    def __init__(self, steps: List[Step], nonce: str, on_step: Callable[[StepResult], None] = None):
+        self.nonce = nonce
+        self.on_step = on_step
+        self.results = [StepResult(step) for step in steps]
+        self._pending = b""
+        self._current: Optional[int] = None
+        self._output: List[str] = []
+        self._started = 0.0
+
+    def feed(self, chunk: bytes):
+        self._pending += chunk
+        *lines, self._pending = self._pending.split(b"\n")
+        for line in lines:
+            self._line(line.decode(errors="replace"))
+
+    def close(self, exit_code: int = None):
+        """Fim do fluxo; um passo sem marcador de fim (shell morreu) recebe o código de saída"""
+        if self._pending:
+            self._line(self._pending.decode(errors="replace"))
+            self._pending = b""
+        if self._current is not None:
+            self._line(f"{MARK}{self.nonce} end {self._current} {exit_code if exit_code else -1}")
+
+    def _line(self, line: str):
+        text, sep, marker = line.partition(f"{MARK}{self.nonce} ")
+        if not sep:
+            if self._current is not None:
+                self._output.append(line)
+            return
+
+        # Saída sem \n final fica antes do marcador na mesma linha
+        if text and self._current is not None:
+            self._output.append(text)
+
+        parts = marker.split()
+        if parts[0] == "begin":
+            self._current = int(parts[1])
+            self._output = []
+            self._started = time.monotonic()
+        elif parts[0] == "end":
+            result = self.results[int(parts[1])]
+            result.code = int(parts[2])
+            result.output = "\n".join(self._output)
+            result.seconds = time.monotonic() - self._started
+            self._current = None
+            if self.on_step:
+                self.on_step(result)
+
+
+class RemoteBatch:
+    """Executa planos de passos em um servidor, um canal (um round-trip) por lote"""
+
+    def __init__(self, pool, server):
+        self.pool = pool
+        self.server = server
+
+    def run(self, steps: List[Step], on_step: Callable[[StepResult], None] = None,
+            timeout: float = None) -> List[StepResult]:
+        """
+        Args:
+            on_step: chamado para cada passo concluído, na ordem, durante a execução
+
+        Returns:
+            Um resultado por passo; passos após uma falha ficam com code None
+        """
+        if not steps:
+            return []
+        nonce = secrets.token_hex(8)
+        parser = MarkerParser(steps, nonce, on_step)
+        result = self.pool.run(self.server, "sh -s", timeout=timeout, stdin=compile_script(steps, nonce),
+                               on_output=lambda chunk, is_stderr: parser.feed(chunk) if not is_stderr else None)
+        parser.close(result.code)
+        return parser.results
@@ -0,0 +1,184 @@
+"""
+Catálogo - LivChat Setup v0.1
+Aplicações declaradas em apps/<id>.json, com índice compacto em cache
+
+Na inicialização só o índice é lido (id, nome, categoria, dependências).
+A definição completa (imagens, portas, recursos, templates) só é lida
+quando a aplicação é realmente instalada.
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+
+from .profiler import span
+
+# os.path em vez de pathlib: este módulo está no caminho de `setup.py list`
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS_DIR = os.path.join(BASE_DIR, "apps")
+INDEX_PATH = os.path.join(BASE_DIR, ".cache", "catalog-index.json")
+
+INDEX_VERSION = 1
+
+# Campos da definição que vão para o índice
+INDEX_FIELDS = ("id", "name", "category", "order", "depends")
+
+
+class CatalogError(Exception):
+    """Definição de aplicação inválida ou inexistente"""
+
+
+class Catalog:
+    """Catálogo de aplicações com índice invalidado por mtime/tamanho e hash"""
+
+    def __init__(self, apps_dir: str = APPS_DIR, index_path: str = INDEX_PATH):
+        self.apps_dir = str(apps_dir)
+        self.index_path = str(index_path)
+        self._entries: Optional[List[Dict]] = None
+        self._by_id: Dict[str, Dict] = {}
+        self._definitions: Dict[str, Dict] = {}
+
+    # ===== Índice =====
+
+    def entries(self) -> List[Dict]:
+        """Entradas do índice, na ordem do menu"""
+        if self._entries is None:
+            with span("catalog.index"):
+                self._load_index()
+        return self._entries
+
+    def invalidate(self):
+        """Descarta o que está em memória (a próxima leitura confere os arquivos de novo)"""
+        self._entries = None
+        self._by_id = {}
+        self._definitions = {}
+
+    def entry(self, app_id: str) -> Optional[Dict]:
+        """Entrada do índice de uma aplicação"""
+        self.entries()
+        return self._by_id.get(app_id)
+
+    def _load_index(self):
+        cached = self._read_index()
+        files = self._scan()
+        cached_files = cached.get("files", {}) if cached else {}
+
+        # Reaproveita entradas de arquivos inalterados (mtime/tamanho iguais)
+        records = {}
+        changed = False
+        for name, (mtime_ns, size) in files.items():
+            old = cached_files.get(name)
+            if old and old["mtime_ns"] == mtime_ns and old["size"] == size:
+                records[name] = old
+                continue
+
+            import hashlib  # só quando algum arquivo mudou
+            data = self._read(name)
+            digest = hashlib.sha256(data).hexdigest()
+            if old and old["sha256"] == digest:
+                # Só o mtime mudou (touch, checkout): conteúdo igual
+                records[name] = dict(old, mtime_ns=mtime_ns, size=size)
+            else:
+                definition = self._parse(name, data)
+                records[name] = {
+                    "mtime_ns": mtime_ns,
+                    "size": size,
+                    "sha256": digest,
+                    "entry": {field: definition.get(field) for field in INDEX_FIELDS},
+                }
+            changed = True
+
+        if set(cached_files) != set(files):
+            changed = True
+
+        if changed:
+            self._write_index({"version": INDEX_VERSION, "files": records})
+
+        entries = [dict(record["entry"], file=name) for name, record in records.items()]
+        entries.sort(key=lambda e: (e.get("order") or 0, e["id"]))
+        self._entries = entries
+        self._by_id = {e["id"]: e for e in entries}
+
+    def _scan(self) -> Dict[str, tuple]:
+        """Arquivos de definição com (mtime_ns, tamanho)"""
+        files = {}
+        if not os.path.isdir(self.apps_dir):
+            return files
+        with os.scandir(self.apps_dir) as it:
+            for item in it:
+                if item.name.endswith(".json") and item.is_file():
+                    st = item.stat()
+                    files[item.name] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def _read_index(self) -> Optional[Dict]:
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != INDEX_VERSION:
+            return None
+        return index
+
+    def _write_index(self, index: Dict):
+        """Grava o índice atomicamente (falha de escrita não impede o uso)"""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp = f"{self.index_path}.tmp{os.getpid()}"
+            with open(tmp, "w") as f:
+                json.dump(index, f, separators=(",", ":"))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass
+
+    # ===== Definições completas =====
+
+    def load(self, app_id: str) -> Dict:
+        """Definição completa de uma aplicação (lida sob demanda e memorizada)"""
+        if app_id not in self._definitions:
+            entry = self.entry(app_id)
+            if entry is None:
+                raise CatalogError(f"Aplicação desconhecida: {app_id}")
+            with span("catalog.load", app=app_id):
+                data = self._read(entry["file"])
+                self._definitions[app_id] = self._parse(entry["file"], data)
+        return self._definitions[app_id]
+
+    def _read(self, name: str) -> bytes:
+        with open(os.path.join(self.apps_dir, name), "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _parse(name: str, data: bytes) -> Dict:
+        try:
+            definition = json.loads(data)
+        except ValueError as e:
+            raise CatalogError(f"apps/{name}: JSON inválido ({e})")
+        if not isinstance(definition, dict) or not definition.get("id") or not definition.get("name"):
+            raise CatalogError(f"apps/{name}: campos 'id' e 'name' são obrigatórios")
+        definition.setdefault("depends", [])
+        return definition
+
+    # ===== Dependências =====
+
+    def dependency_map(self, app_ids: List[str]) -> Dict[str, List[str]]:
+        """Mapa app -> dependências, considerando apenas as apps informadas"""
+        wanted = set(app_ids)
+        deps = {}
+        for app_id in app_ids:
+            entry = self.entry(app_id)
+            declared = entry.get("depends") or [] if entry else []
+            deps[app_id] = [dep for dep in declared if dep in wanted]
+        return deps
+
+
+_default_catalog: Optional[Catalog] = None
+
+
+def get_catalog() -> Catalog:
+    """Catálogo padrão (apps/ do projeto), compartilhado pelo processo"""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = Catalog()
+    return _default_catalog
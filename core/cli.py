@@ -22,10 +22,22 @@ class CLIParser:
 Exemplos:
   python3 setup.py                    # Menu interativo
   python3 setup.py --dev               # Modo desenvolvimento
+  python3 setup.py --profile install n8n  # Tempo de cada fase + trace (Perfetto)
+  python3 setup.py --profile --profile-out n8n.json install n8n
   python3 setup.py install n8n        # Instala N8N diretamente
   python3 setup.py install n8n --instance dev  # Instala N8N dev
+  python3 setup.py install postgres redis n8n --jobs 2  # Instala em paralelo
+  python3 setup.py install --plan      # O que mudou em cada instância
+  python3 setup.py install --changed   # Reinstala só o que mudou
+  python3 setup.py install --resume    # Continua instalação interrompida
   python3 setup.py list                # Lista aplicações disponíveis
   python3 setup.py status              # Status dos serviços
+  python3 setup.py status --watch      # Status ao vivo (eventos do Docker)
+  python3 setup.py add-server vps1 203.0.113.10 --key ~/.ssh/id_ed25519
+  python3 setup.py use vps1            # Comandos seguintes rodam no vps1
+  python3 setup.py install n8n --servers vps1,vps2  # Vários servidores
+  python3 setup.py status --all-servers --json      # Status da frota em JSON
+  python3 setup.py agent               # Agente residente: status em milissegundos
             """
         )
         
@@ -36,6 +48,25 @@ Exemplos:
             help='Modo desenvolvimento com logs completos'
         )
         
+        parser.add_argument(
+            '--profile',
+            action='store_true',
+            help='Mede o tempo de cada fase: mostra as mais lentas e grava um trace do Chrome'
+        )
+        
+        parser.add_argument(
+            '--profile-out',
+            default=None,
+            metavar='ARQUIVO',
+            help='Onde gravar o trace do --profile (padrão: .cache/profiles/)'
+        )
+        
+        parser.add_argument(
+            '--no-agent',
+            action='store_true',
+            help='Executa no próprio processo mesmo com o agente em execução'
+        )
+        
         parser.add_argument(
             '--version',
             action='version',
@@ -52,13 +83,48 @@ Exemplos:
         )
         install_parser.add_argument(
             'app',
-            help='Nome da aplicação para instalar'
+            nargs='*',
+            help='Nome da(s) aplicação(ões) para instalar'
         )
         install_parser.add_argument(
             '--instance',
             default='default',
             help='Nome da instância (para multi-instância)'
         )
+        install_parser.add_argument(
+            '--jobs', '-j',
+            type=int,
+            default=4,
+            metavar='N',
+            help='Número de instalações simultâneas (padrão: 4)'
+        )
+        install_parser.add_argument(
+            '--plan',
+            action='store_true',
+            help='Mostra o que mudou desde o último deploy sem instalar (sem apps: todas as instâncias)'
+        )
+        install_parser.add_argument(
+            '--changed',
+            action='store_true',
+            help='Reinstala só as instâncias registradas que mudaram'
+        )
+        install_parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continua a última instalação interrompida, pulando os passos já concluídos'
+        )
+        install_parser.add_argument(
+            '--no-pull',
+            dest='prepull',
+            action='store_false',
+            help='Não baixa as imagens antes dos deploys (cada deploy baixa as suas)'
+        )
+        install_parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Publica de novo mesmo os stacks sem mudanças'
+        )
+        self._add_fleet_arguments(install_parser, timeout=900)
         
         # Comando list
         list_parser = subparsers.add_parser(
@@ -80,31 +146,121 @@ Exemplos:
             '--app',
             help='Status de uma aplicação específica'
         )
+        status_parser.add_argument(
+            '--watch', '-w',
+            action='store_true',
+            help='Acompanha ao vivo pelos eventos do Docker (Ctrl+C sai)'
+        )
+        status_parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            metavar='SEG',
+            help='Intervalo de amostragem de CPU/memória (padrão: 5s; 0 desativa)'
+        )
+        self._add_fleet_arguments(status_parser, timeout=60)
         
-        # Comando add-server (para modo remoto futuro)
+        # Comando add-server (modo remoto)
         server_parser = subparsers.add_parser(
             'add-server',
-            help='Adiciona servidor remoto (futuro)'
+            help='Adiciona servidor remoto (SSH)'
+        )
+        server_parser.add_argument(
+            'name',
+            help='Nome do servidor (ex: servidor1)'
+        )
+        server_parser.add_argument(
+            'host',
+            help='Endereço IP ou hostname'
+        )
+        server_parser.add_argument(
+            '--user', '-u',
+            default='root',
+            help='Usuário SSH (padrão: root)'
+        )
+        server_parser.add_argument(
+            '--port', '-p',
+            type=int,
+            default=22,
+            help='Porta SSH (padrão: 22)'
+        )
+        server_parser.add_argument(
+            '--key', '-i',
+            dest='key_filename',
+            metavar='ARQUIVO',
+            help='Chave privada (padrão: agente SSH)'
+        )
+        server_parser.add_argument(
+            '--password',
+            action='store_true',
+            help='Autenticação por senha (pedida a cada sessão, nunca gravada)'
         )
         
-        # Comando use (para modo remoto futuro)
+        # Comando use (modo remoto)
         use_parser = subparsers.add_parser(
             'use',
-            help='Seleciona servidor para usar (futuro)'
+            help='Seleciona servidor para usar ("local" volta ao modo local)'
         )
         use_parser.add_argument(
             'server',
-            help='Nome ou ID do servidor'
+            help='Nome do servidor ou "local"'
+        )
+        
+        # Comando agent (processo residente que atende list/status)
+        agent_parser = subparsers.add_parser(
+            'agent',
+            help='Agente residente: list/status reaproveitam Docker, SSH e cache'
+        )
+        agent_parser.add_argument(
+            'action',
+            nargs='?',
+            choices=['run', 'stop', 'info'],
+            default='run',
+            help='run: atende em primeiro plano (padrão); stop: encerra; info: estado do agente'
         )
         
         return parser
     
-    def parse_args(self):
-        """Parse dos argumentos da linha de comando"""
-        args = self.parser.parse_args()
+    @staticmethod
+    def _add_fleet_arguments(parser, timeout: int):
+        """Opções de execução em vários servidores (install/status)"""
+        targets = parser.add_mutually_exclusive_group()
+        targets.add_argument(
+            '--servers',
+            metavar='A,B,C',
+            help='Executa nos servidores informados (separados por vírgula)'
+        )
+        targets.add_argument(
+            '--all-servers',
+            action='store_true',
+            help='Executa em todos os servidores cadastrados'
+        )
+        parser.add_argument(
+            '--parallel',
+            type=int,
+            default=8,
+            metavar='N',
+            help='Servidores processados ao mesmo tempo (padrão: 8)'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=timeout,
+            metavar='SEG',
+            help=f'Tempo máximo por servidor (padrão: {timeout}s)'
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Resumo em JSON em vez da tabela'
+        )
+    
+    def parse_args(self, argv=None):
+        """Parse dos argumentos da linha de comando (padrão: sys.argv)"""
+        args = self.parser.parse_args(argv)
         
         # Se não passou nenhum comando e não é --version, assume menu interativo
-        if args.command is None and '--version' not in sys.argv:
+        if args.command is None and '--version' not in (sys.argv if argv is None else argv):
             args.menu = True
         else:
             args.menu = False
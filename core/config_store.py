@@ -0,0 +1,209 @@
+"""
+Configuração - LivChat Setup v0.1
+Armazenamento concorrente da configuração
+
+- config.json guarda só o bloco global (domínio, e-mail, rede, smtp...)
+- Cada aplicação/instância fica em config.d/applications/<app>/<instancia>.json,
+  lida e gravada sem tocar no resto
+- Toda escrita é atômica (arquivo temporário + fsync + rename) e protegida
+  por flock, então instalações paralelas não perdem registros umas das outras
+- Um config.json antigo com "applications" preenchido é importado uma vez
+"""
+
+import os
+import json
+import fcntl
+import copy
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+DEFAULT_CONFIG = {
+    "version": "0.1",
+    "global": {
+        "domain": "",
+        "admin_email": "",
+        "docker_network": "livchat_network"
+    },
+    "applications": {}
+}
+
+
+class ConfigError(Exception):
+    """Configuração inválida ou ilegível"""
+
+
+def atomic_write_json(path: Path, data, indent: Optional[int] = 2):
+    """Grava JSON de forma atômica: temporário no mesmo diretório, fsync e rename"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    # 0600 desde a criação: o config guarda senhas de banco e chaves de criptografia
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)  # temporário que sobrou de uma queda mantém o modo antigo
+    with os.fdopen(fd, "w") as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def _read_json(path: Path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        raise ConfigError(f"{path}: JSON inválido ({e})")
+
+
+def _drop_server_passwords(data: Dict):
+    """Senhas SSH gravadas por versões antigas viram ask_password (pedida a cada sessão)"""
+    for server in (data.get("servers") or {}).values():
+        if server.pop("password", None):
+            server["ask_password"] = True
+
+
+class ConfigStore:
+    """Configuração global + registros por aplicação/instância em arquivos separados"""
+
+    def __init__(self, path: Path = Path("config.json")):
+        self.path = Path(path)
+        self.shards_dir = self.path.parent / "config.d" / "applications"
+        self.locks_dir = self.path.parent / "config.d" / "locks"
+
+    # ===== Locks =====
+
+    @contextmanager
+    def _locked(self, name: str):
+        """flock exclusivo em config.d/locks/<name>.lock"""
+        self.locks_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.locks_dir / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    # ===== Bloco global (config.json) =====
+
+    def load(self) -> Dict:
+        """Lê config.json (criando o padrão se não existir) e importa aplicações antigas"""
+        data = _read_json(self.path)
+        if data is None:
+            with self._locked("global"):
+                data = _read_json(self.path)
+                if data is None:
+                    data = copy.deepcopy(DEFAULT_CONFIG)
+                    atomic_write_json(self.path, data)
+        if data.get("applications"):
+            data = self._import_legacy()
+        if any("password" in server for server in (data.get("servers") or {}).values()):
+            data = self.update(_drop_server_passwords)
+        return data
+
+    def update(self, change: Callable[[Dict], None]) -> Dict:
+        """Altera config.json sob lock (read-modify-write) e devolve o novo conteúdo"""
+        with self._locked("global"):
+            data = _read_json(self.path) or copy.deepcopy(DEFAULT_CONFIG)
+            change(data)
+            atomic_write_json(self.path, data)
+            return data
+
+    def _import_legacy(self) -> Dict:
+        """
+        Move o mapa "applications" do config.json para os shards. Formatos aceitos:
+        {"n8n": {...}} (instância default) ou {"n8n": {"instances": {"dev": {...}}}}
+        """
+        with self._locked("global"):
+            data = _read_json(self.path) or copy.deepcopy(DEFAULT_CONFIG)
+            for app_id, record in (data.get("applications") or {}).items():
+                if isinstance(record, dict) and isinstance(record.get("instances"), dict):
+                    instances = record["instances"]
+                else:
+                    instances = {"default": record}
+                for instance, value in instances.items():
+                    # Não sobrescreve registros que já existem nos shards
+                    if self.get_instance(app_id, instance) is None:
+                        self.put_instance(app_id, instance, value if isinstance(value, dict) else {"value": value})
+            data["applications"] = {}
+            atomic_write_json(self.path, data)
+            return data
+
+    # ===== Registros por instância =====
+
+    def _shard(self, app_id: str, instance: str) -> Path:
+        for part in (app_id, instance):
+            if not part or "/" in part or part.startswith("."):
+                raise ConfigError(f"Nome inválido: {part!r}")
+        return self.shards_dir / app_id / f"{instance}.json"
+
+    def get_instance(self, app_id: str, instance: str = "default") -> Optional[Dict]:
+        """Registro de uma instância (None se não existir)"""
+        return _read_json(self._shard(app_id, instance))
+
+    def put_instance(self, app_id: str, instance: str, record: Dict):
+        """Grava o registro inteiro de uma instância"""
+        with self._locked(f"{app_id}.{instance}"):
+            atomic_write_json(self._shard(app_id, instance), record)
+
+    def update_instance(self, app_id: str, instance: str, change: Callable[[Dict], None]) -> Dict:
+        """Read-modify-write de uma instância sob lock próprio (não bloqueia as outras)"""
+        shard = self._shard(app_id, instance)
+        with self._locked(f"{app_id}.{instance}"):
+            record = _read_json(shard) or {}
+            change(record)
+            atomic_write_json(shard, record)
+            return record
+
+    def delete_instance(self, app_id: str, instance: str = "default") -> bool:
+        shard = self._shard(app_id, instance)
+        with self._locked(f"{app_id}.{instance}"):
+            try:
+                shard.unlink()
+                return True
+            except FileNotFoundError:
+                return False
+
+    def list_instances(self, app_id: str = None) -> List[Tuple[str, str]]:
+        """(app, instância) existentes, só listando diretórios (nenhum arquivo é lido)"""
+        result = []
+        if not self.shards_dir.is_dir():
+            return result
+        apps = [app_id] if app_id else sorted(os.listdir(self.shards_dir))
+        for app in apps:
+            app_dir = self.shards_dir / app
+            if not app_dir.is_dir():
+                continue
+            for name in sorted(os.listdir(app_dir)):
+                if name.endswith(".json") and not name.startswith("."):
+                    result.append((app, name[:-len(".json")]))
+        return result
+
+    def export(self) -> Dict:
+        """Documento completo no formato antigo do config.json (para backup/inspeção)"""
+        data = self.load()
+        applications: Dict[str, Dict] = {}
+        for app_id, instance in self.list_instances():
+            applications.setdefault(app_id, {"instances": {}})["instances"][instance] = \
+                self.get_instance(app_id, instance)
+        data["applications"] = applications
+        return data
+
+
+_stores: Dict[str, ConfigStore] = {}
+
+
+def get_store(path: Path = Path("config.json")) -> ConfigStore:
+    """Store compartilhado por caminho de config.json"""
+    key = os.path.abspath(path)
+    if key not in _stores:
+        _stores[key] = ConfigStore(Path(path))
+    return _stores[key]
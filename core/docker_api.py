@@ -0,0 +1,204 @@
+"""
+Cliente Docker - LivChat Setup v0.1
+Acesso direto à Docker Engine API via unix socket, sem depender do CLI docker
+"""
+
+import os
+import json
+import socket
+import threading
+import http.client
+from urllib.parse import urlencode, quote
+
+DEFAULT_SOCKET = "/var/run/docker.sock"
+
+
+class DockerError(Exception):
+    """Falha ao falar com a Docker Engine API"""
+
+    def __init__(self, message: str, status: int = None):
+        super().__init__(message)
+        self.status = status
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTPConnection que conecta num unix socket em vez de TCP"""
+
+    def __init__(self, socket_path: str, timeout: float = 5.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def default_socket_path() -> str:
+    """Socket do Docker, respeitando DOCKER_HOST=unix://..."""
+    host = os.environ.get("DOCKER_HOST", "")
+    if host.startswith("unix://"):
+        return host[len("unix://"):]
+    return DEFAULT_SOCKET
+
+
+def split_ref(ref: str):
+    """(nome, tag) de uma referência; imagens fixadas por digest não têm tag separada"""
+    if "@" in ref:
+        return ref, None
+    name, sep, tag = ref.rpartition(":")
+    if not sep or "/" in tag:
+        return ref, "latest"  # sem tag, ou ":" era a porta do registry
+    return name, tag
+
+
+class DockerClient:
+    """Cliente mínimo da Engine API com uma conexão keep-alive por thread"""
+
+    def __init__(self, socket_path: str = None, timeout: float = 5.0):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def available(self) -> bool:
+        """Indica se o socket do Docker existe"""
+        return os.path.exists(self.socket_path)
+
+    def _connection(self) -> UnixHTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _url(path: str, params: dict = None) -> str:
+        if params:
+            query = {k: (json.dumps(v) if isinstance(v, (dict, list)) else v) for k, v in params.items()}
+            return f"{path}?{urlencode(query)}"
+        return path
+
+    def request(self, method: str, path: str, params: dict = None, body=None):
+        """Executa uma requisição e devolve o JSON decodificado"""
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.request(method, self._url(path, params), body=payload, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (ConnectionError, http.client.HTTPException, socket.timeout, OSError) as e:
+                self._reset()
+                # Conexão keep-alive pode ter sido fechada pelo daemon: tenta uma vez de novo
+                if attempt == 1:
+                    raise DockerError(f"Docker indisponível em {self.socket_path}: {e}")
+
+        if response.status >= 400:
+            try:
+                message = json.loads(data).get("message", "")
+            except ValueError:
+                message = data.decode(errors="replace")
+            raise DockerError(f"{method} {path}: {response.status} {message}", response.status)
+
+        if not data:
+            return None
+        return json.loads(data)
+
+    def get(self, path: str, params: dict = None):
+        return self.request("GET", path, params)
+
+    def stream(self, path: str, params: dict = None, on_connect=None, method: str = "GET",
+               headers: dict = None):
+        """
+        Lê um endpoint que transmite JSON por linha (/events, /images/create) em
+        uma conexão própria, sem timeout de leitura. on_connect recebe a conexão,
+        para quem precisar encerrar o fluxo a partir de outra thread.
+        """
+        conn = UnixHTTPConnection(self.socket_path, timeout=self.timeout)
+        try:
+            conn.request(method, self._url(path, params), headers=headers or {})
+            response = conn.getresponse()
+            if response.status >= 400:
+                try:
+                    message = json.loads(response.read()).get("message", "")
+                except ValueError:
+                    message = ""
+                raise DockerError(f"{method} {path}: {response.status} {message}".rstrip(), response.status)
+            conn.sock.settimeout(None)
+            if on_connect:
+                on_connect(conn)
+            while True:
+                line = response.readline()
+                if not line:
+                    return
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        except (ConnectionError, http.client.HTTPException, socket.timeout, OSError) as e:
+            raise DockerError(f"Fluxo {path} interrompido: {e}")
+        finally:
+            conn.close()
+
+    # ===== Endpoints usados pelo setup =====
+
+    def services(self, filters: dict = None):
+        """Serviços do Swarm com contagem de réplicas (ServiceStatus)"""
+        params = {"status": "true"}
+        if filters:
+            params["filters"] = filters
+        return self.get("/services", params)
+
+    def containers(self, filters: dict = None):
+        """Containers em execução"""
+        params = {"filters": filters} if filters else None
+        return self.get("/containers/json", params)
+
+    def events(self, filters: dict = None, on_connect=None):
+        """Fluxo de eventos do daemon (gerador; termina quando a conexão fecha)"""
+        params = {"filters": filters} if filters else None
+        return self.stream("/events", params, on_connect)
+
+    def container_stats(self, container_id: str):
+        """Amostra única de uso de CPU/memória de um container"""
+        return self.get(f"/containers/{quote(container_id)}/stats", {"stream": "false", "one-shot": "true"})
+
+    def pull(self, ref: str, on_connect=None, auth: dict = None):
+        """
+        Baixa uma imagem; gerador com as mensagens de progresso do daemon
+
+        Args:
+            auth: credenciais do registry ({"username", "password"} ou
+                {"identitytoken"}), enviadas em X-Registry-Auth
+        """
+        name, tag = split_ref(ref)
+        params = {"fromImage": name}
+        if tag:
+            params["tag"] = tag
+        headers = None
+        if auth:
+            import base64
+            encoded = base64.urlsafe_b64encode(json.dumps(auth).encode()).decode()
+            headers = {"X-Registry-Auth": encoded}
+        return self.stream("/images/create", params, on_connect, method="POST", headers=headers)
+
+    def image_id(self, ref: str):
+        """Id da imagem local (None se ainda não foi baixada)"""
+        try:
+            return self.get(f"/images/{quote(ref, safe='/:@')}/json").get("Id")
+        except DockerError as e:
+            if e.status == 404:
+                return None
+            raise
@@ -0,0 +1,133 @@
+"""
+Log de Eventos - LivChat Setup v0.1
+Cada chamada do Logger vira também um evento estruturado, gravado em
+config.d/logs/events.jsonl para análise depois de uma instalação
+
+- uma linha JSON por evento: horário (ts), relógio monotônico de alta
+  resolução (mono), execução (run), nível, mensagem, app/instância/host e
+  duração quando conhecida
+- a escrita é feita por uma thread em segundo plano alimentada por uma fila:
+  quem loga só monta o dicionário e enfileira, nunca espera disco
+- fila cheia descarta o evento (e conta) em vez de travar a instalação
+- rotação por tamanho: events.jsonl.1 ... events.jsonl.N
+- a fila é esvaziada na saída do processo (atexit)
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+from typing import Dict, Optional
+
+# os.path em vez de pathlib: o sink é criado por todo comando, inclusive `setup.py list`
+EVENTS_DIR = os.path.join("config.d", "logs")
+EVENTS_FILE = "events.jsonl"
+MAX_BYTES = 5 * 1024 * 1024
+BACKUPS = 3
+QUEUE_SIZE = 10000
+# Eventos gravados por escrita (a thread junta o que já estiver na fila)
+BATCH = 256
+
+_STOP = object()
+
+
+class EventSink:
+    """Arquivo JSONL com rotação, escrito por uma thread em segundo plano"""
+
+    def __init__(self, path: str = None, max_bytes: int = MAX_BYTES, backups: int = BACKUPS,
+                 queue_size: int = QUEUE_SIZE):
+        self.path = str(path) if path else os.path.join(EVENTS_DIR, EVENTS_FILE)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.run = f"{int(time.time())}-{os.getpid()}"
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def emit(self, event: Dict):
+        """Enfileira um evento (não bloqueia)"""
+        if self._closed:
+            return
+        if self._thread is None:
+            self._start()
+        event["run"] = self.run
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        # Thread e arquivo só existem se algum evento for emitido
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="event-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _writer(self):
+        stream = None
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < BATCH:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                events = [event for event in batch if event is not _STOP]
+                stop = len(events) < len(batch)
+                if events:
+                    if stream is None:
+                        stream = self._open()
+                    stream.write("".join(
+                        json.dumps(event, ensure_ascii=False, separators=(",", ":"), default=str) + "\n"
+                        for event in events
+                    ))
+                    stream.flush()
+                    self.written += len(events)
+                    if stream.tell() >= self.max_bytes:
+                        stream.close()
+                        self._rotate()
+                        stream = None
+                if stop:
+                    break
+        except OSError:
+            # Disco cheio ou sem permissão: o log de eventos nunca derruba a instalação
+            self._closed = True
+        finally:
+            if stream is not None:
+                stream.close()
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        return open(self.path, "a", encoding="utf-8")
+
+    def _rotate(self):
+        """events.jsonl -> events.jsonl.1 -> ... -> events.jsonl.N (o mais antigo sai)"""
+        for index in range(self.backups - 1, 0, -1):
+            source = f"{self.path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.unlink(self.path)
+
+    def close(self, timeout: float = 2.0):
+        """Grava o que estiver na fila e encerra a thread"""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
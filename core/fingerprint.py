@@ -0,0 +1,171 @@
+"""
+Fingerprints - LivChat Setup v0.1
+Impressão digital do que foi publicado em cada instância, para reinstalar
+sem publicar de novo os stacks que não mudaram
+
+- stack: sha256 dos arquivos renderizados
+- env: sha256 dos comandos de publicação (rede, caminhos, nome do stack)
+- images: id de cada imagem do stack como está no host (referências
+  fixadas por @sha256 usam o próprio digest)
+
+A fingerprint fica no registro da instância (config.d/applications/) e é
+gravada depois de um deploy bem-sucedido. A consulta ao host (ids das
+imagens e stacks existentes) é feita em lote: uma chamada para todas as
+instâncias do plano.
+"""
+
+import re
+import json
+import shlex
+import hashlib
+from typing import Dict, Iterable, List, Optional, Set
+
+from .stats import STACK_LABEL
+
+IMAGE_LINE = re.compile(r"""^\s*image:\s*["']?([^\s"'#]+)""", re.M)
+
+# Componentes na ordem em que aparecem no diff
+COMPONENTS = ("stack", "env", "images")
+
+
+def images_of(files: Dict[str, str], definition: Dict = None) -> List[str]:
+    """Imagens usadas pelos arquivos do stack (ou as da definição, se não houver `image:`)"""
+    refs = {ref for name, text in files.items() if name.endswith((".yaml", ".yml"))
+            for ref in IMAGE_LINE.findall(text)}
+    if not refs and definition:
+        refs = set(definition.get("images") or [])
+    return sorted(refs)
+
+
+def _digest(payload) -> str:
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def files_digest(files: Dict[str, str]) -> str:
+    """sha256 do conteúdo renderizado de um stack"""
+    return _digest(sorted(files.items()))
+
+
+class Fingerprint:
+    """Estado publicado de uma instância"""
+
+    __slots__ = ("stack", "env", "images")
+
+    def __init__(self, stack: str, env: str, images: Dict[str, Optional[str]]):
+        self.stack = stack
+        self.env = env
+        self.images = images
+
+    @classmethod
+    def build(cls, files: Dict[str, str], steps, images: Dict[str, Optional[str]]) -> "Fingerprint":
+        """Fingerprint dos arquivos renderizados, dos passos do plano e das imagens do host"""
+        return cls(
+            files_digest(files),
+            _digest([step.command for step in steps]),
+            dict(sorted(images.items())),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> Optional["Fingerprint"]:
+        if not isinstance(data, dict) or not all(key in data for key in COMPONENTS):
+            return None
+        return cls(data["stack"], data["env"], dict(data["images"]))
+
+    def to_dict(self) -> Dict:
+        return {"stack": self.stack, "env": self.env, "images": self.images}
+
+    def diff(self, other: Optional["Fingerprint"]) -> List[str]:
+        """Componentes que mudaram em relação a `other` (vazio = nada mudou)"""
+        if other is None:
+            return list(COMPONENTS)
+        changed = [name for name in ("stack", "env") if getattr(self, name) != getattr(other, name)]
+        if self.images != other.images:
+            changed.append("images")
+        return changed
+
+    def changed_images(self, other: Optional["Fingerprint"]) -> List[str]:
+        previous = other.images if other else {}
+        return [ref for ref, image_id in self.images.items() if previous.get(ref) != image_id]
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Fingerprint) and not self.diff(other)
+
+    def __hash__(self):
+        return hash((self.stack, self.env, tuple(self.images.items())))
+
+
+class Probe:
+    """O que existe no host: id de cada imagem e stacks publicados"""
+
+    __slots__ = ("images", "deployed")
+
+    def __init__(self, images: Dict[str, Optional[str]] = None, deployed: Set[str] = None):
+        self.images = images or {}
+        self.deployed = deployed or set()
+
+    def image_ids(self, refs: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {ref: self.images.get(ref) for ref in refs}
+
+
+def pinned_id(ref: str) -> Optional[str]:
+    """Digest de uma referência fixada (imagem@sha256:...)"""
+    return ref.partition("@")[2] or None
+
+
+def probe_command(stacks: Iterable[str], refs: Iterable[str]) -> str:
+    """Script que lista o id de cada imagem e quantos serviços cada stack tem"""
+    lines = []
+    refs = [ref for ref in refs if not pinned_id(ref)]
+    if refs:
+        lines.append(f"for i in {' '.join(shlex.quote(r) for r in refs)}; do "
+                     "printf 'image\\t%s\\t%s\\n' \"$i\" \"$(docker image inspect --format '{{.Id}}' \"$i\" 2>/dev/null)\"; done")
+    stacks = list(stacks)
+    if stacks:
+        lines.append(f"for s in {' '.join(shlex.quote(s) for s in stacks)}; do "
+                     f"printf 'stack\\t%s\\t%s\\n' \"$s\" \"$(docker service ls -q --filter label={STACK_LABEL}=\"$s\" | wc -l)\"; done")
+    return "\n".join(lines) or "true"
+
+
+def parse_probe(output: str, refs: Iterable[str] = ()) -> Probe:
+    """Probe a partir da saída de probe_command"""
+    probe = Probe({ref: pinned_id(ref) for ref in refs if pinned_id(ref)})
+    for line in output.splitlines():
+        kind, _, rest = line.partition("\t")
+        name, _, value = rest.partition("\t")
+        value = value.strip()
+        if kind == "image":
+            probe.images[name] = value or None
+        elif kind == "stack" and value.isdigit() and int(value) > 0:
+            probe.deployed.add(name)
+    return probe
+
+
+def remote_probe(pool, server, stacks: Iterable[str], refs: Iterable[str]) -> Probe:
+    """Consulta o servidor em um único comando SSH"""
+    refs = list(refs)
+    result = pool.run(server, probe_command(stacks, refs), timeout=60)
+    return parse_probe(result.stdout if result.ok else "", refs)
+
+
+def local_probe(client, stacks: Iterable[str], refs: Iterable[str]) -> Probe:
+    """Consulta a Docker API local (sem Docker: nada publicado, imagens desconhecidas)"""
+    from .docker_api import DockerError
+
+    refs = list(refs)
+    probe = Probe({ref: pinned_id(ref) for ref in refs if pinned_id(ref)})
+    if not client.available():
+        return probe
+    try:
+        for ref in refs:
+            if ref not in probe.images:
+                probe.images[ref] = client.image_id(ref)
+        stacks = set(stacks)
+        if stacks:
+            for service in client.services() or []:
+                stack = (service.get("Spec", {}).get("Labels") or {}).get(STACK_LABEL)
+                if stack in stacks:
+                    probe.deployed.add(stack)
+    except DockerError:
+        pass
+    return probe
@@ -0,0 +1,395 @@
+"""
+Frota - LivChat Setup v0.1
+Executa install/status em vários servidores ao mesmo tempo
+
+- concorrência limitada (--parallel) sobre o pool SSH compartilhado
+- timeout por servidor: um host lento ou travado não segura os outros
+- falhas isoladas: a exceção de um servidor vira uma linha "falhou" na tabela
+- resultado agregado em tabela (BoxDrawer) ou JSON (--json)
+"""
+
+import json
+import time
+import threading
+from concurrent.futures import Future, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+
+from .logger import BoxDrawer
+from .profiler import span
+from .ssh import ServerInfo, SSHError, configured_servers, get_pool
+
+
+class FleetError(Exception):
+    """Seleção de servidores inválida"""
+
+
+def resolve_targets(config: Dict, names: Optional[str] = None, all_servers: bool = False) -> List[ServerInfo]:
+    """Servidores de --servers a,b,c ou --all-servers (na ordem informada)"""
+    servers = configured_servers(config)
+    if all_servers:
+        if not servers:
+            raise FleetError("Nenhum servidor cadastrado (use: setup.py add-server)")
+        return [servers[name] for name in sorted(servers)]
+
+    wanted = []
+    for name in (names or "").split(","):
+        name = name.strip()
+        if name and name not in wanted:
+            wanted.append(name)
+    unknown = [name for name in wanted if name not in servers]
+    if unknown:
+        raise FleetError(f"Servidor desconhecido: {', '.join(unknown)}")
+    return [servers[name] for name in wanted]
+
+
+class HostResult:
+    """Resultado de uma operação em um servidor"""
+
+    __slots__ = ("server", "status", "detail", "seconds", "data")
+
+    def __init__(self, server: ServerInfo, status: str, detail: str = "", seconds: float = 0.0, data: Dict = None):
+        self.server = server
+        self.status = status          # ok | failed | timeout
+        self.detail = detail
+        self.seconds = seconds
+        self.data = data or {}
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def to_dict(self) -> Dict:
+        return {
+            "server": self.server.name,
+            "host": self.server.host,
+            "status": self.status,
+            "detail": self.detail,
+            "seconds": round(self.seconds, 3),
+            "data": self.data,
+        }
+
+
+class HostLogger:
+    """
+    Logger de um servidor dentro da frota. Em produção não imprime (as
+    saídas de hosts paralelos se misturariam): guarda os eventos e a tabela
+    final mostra o resumo. Em dev imprime com o nome do servidor como prefixo.
+    """
+
+    def __init__(self, logger, server: ServerInfo):
+        self.logger = logger
+        self.server = server
+        self.dev = logger.dev
+        self.colors = logger.colors
+        self.succeeded: List[str] = []
+        self.errors: List[str] = []
+
+    def _echo(self, method: str, message: str):
+        # Sem impressão em produção, mas o evento estruturado é gravado do mesmo jeito
+        with self.logger.context(host=self.server.name):
+            if self.dev:
+                getattr(self.logger, method)(f"[{self.server.name}] {message}")
+            else:
+                self.logger.record(method, message)
+
+    def context(self, since: float = None, **fields):
+        return self.logger.context(since, **{**fields, "host": self.server.name})
+
+    def record(self, level: str, message: str, duration: float = None, **extra):
+        with self.logger.context(host=self.server.name):
+            self.logger.record(level, message, duration, **extra)
+
+    def start_progress(self, total: int):
+        pass
+
+    def progress_bar(self, current: int, total: int, message: str = ""):
+        pass
+
+    def section(self, title: str):
+        self._echo("debug", title)
+
+    def success(self, message: str):
+        self.succeeded.append(message)
+        self._echo("success", message)
+
+    def error(self, message: str, hint: str = None):
+        self.errors.append(message)
+        self._echo("error", message)
+
+    def step(self, message: str):
+        self._echo("step", message)
+
+    def info(self, message: str):
+        self._echo("info", message)
+
+    def warning(self, message: str):
+        self._echo("warning", message)
+
+    def debug(self, message: str):
+        self._echo("debug", message)
+
+    def command(self, cmd: str, output: str = None, code: int = None, seconds: float = None):
+        with self.logger.context(host=self.server.name):
+            if self.dev:
+                self.logger.command(f"[{self.server.name}] {cmd}", output, code, seconds)
+            else:
+                self.logger.record("command", cmd, duration=seconds, code=code,
+                                   output=output[-2000:] if output else None)
+
+    def command_start(self, cmd: str, source: str = None):
+        with self.logger.context(host=self.server.name):
+            if self.dev:
+                self.logger.command_start(cmd, source=f"[{self.server.name}] {source or ''}".strip())
+            else:
+                self.logger.record("command_start", cmd, source=source)
+
+    def command_output(self, line: str, source: str = None, stderr: bool = False):
+        if self.dev:
+            self.logger.command_output(line, source=f"[{self.server.name}] {source or ''}".strip(), stderr=stderr)
+
+    def command_end(self, code: int, seconds: float = None, source: str = None):
+        with self.logger.context(host=self.server.name):
+            if self.dev:
+                self.logger.command_end(code, seconds, source=f"[{self.server.name}] {source or ''}".strip())
+            else:
+                self.logger.record("command_end", "", duration=seconds, code=code, source=source)
+
+    def exception(self, e: Exception):
+        self.error(f"Falha: {e}")
+
+
+class FleetRunner:
+    """Executa uma operação por servidor com concorrência e timeout por host"""
+
+    def __init__(self, logger, parallel: int = 8, timeout: float = 900.0, pool=None, quiet: bool = False):
+        self.logger = logger
+        self.quiet = quiet
+        self.parallel = max(1, parallel)
+        self.timeout = timeout
+        self.pool = pool or get_pool()
+
+    def run(self, targets: List[ServerInfo], operation: Callable[[ServerInfo, HostLogger], Dict]) -> List[HostResult]:
+        """
+        Roda operation(server, host_logger) em todos os alvos. A operação devolve
+        um dict com "detail" (texto da tabela) e dados extras para o JSON; uma
+        exceção ou erro registrado no host_logger marca o servidor como falho.
+
+        Returns:
+            Resultados na ordem dos alvos
+        """
+        results: Dict[str, HostResult] = {}
+        if not self.quiet:
+            self.logger.start_progress(len(targets))
+        pending = {}
+        queue = list(targets)
+
+        def submit(server: ServerInfo):
+            # Uma thread daemon por host (no máximo `parallel` em voo): um host que
+            # estourou o timeout e continua preso não segura a saída do processo
+            host_logger = HostLogger(self.logger, server)
+            future = Future()
+
+            def work():
+                if future.set_running_or_notify_cancel():
+                    future.set_result(self._call(operation, server, host_logger))
+
+            threading.Thread(target=work, name=f"fleet-{server.name}", daemon=True).start()
+            pending[future] = (server, time.monotonic())
+
+        try:
+            # Só `parallel` hosts em voo: o relógio do timeout começa quando o host começa
+            while queue and len(pending) < self.parallel:
+                submit(queue.pop(0))
+
+            while pending:
+                now = time.monotonic()
+                next_deadline = min(start + self.timeout for _, start in pending.values())
+                done, _ = wait(list(pending), timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    server, _ = pending.pop(future)
+                    results[server.name] = future.result()
+                    self._report(results[server.name])
+
+                now = time.monotonic()
+                for future, (server, start) in list(pending.items()):
+                    if now - start >= self.timeout:
+                        # Fecha o transporte: os canais do host falham e a thread termina
+                        pending.pop(future)
+                        future.cancel()
+                        self.pool.evict(server, blocking=False)
+                        results[server.name] = HostResult(server, "timeout", f"sem resposta em {self.timeout:.0f}s",
+                                                          now - start)
+                        self._report(results[server.name])
+
+                while queue and len(pending) < self.parallel:
+                    submit(queue.pop(0))
+        finally:
+            self.logger.progress = None
+
+        return [results[server.name] for server in targets]
+
+    @staticmethod
+    def _call(operation, server: ServerInfo, host_logger: HostLogger) -> HostResult:
+        start = time.monotonic()
+        try:
+            with span("host", host=server.name):
+                data = operation(server, host_logger) or {}
+        except (SSHError, OSError) as e:
+            # Mensagens do pool já começam com o nome do servidor (coluna própria na tabela)
+            detail = str(e)
+            if detail.startswith(f"{server.name}: "):
+                detail = detail[len(server.name) + 2:]
+            return HostResult(server, "failed", detail, time.monotonic() - start)
+        except Exception as e:
+            return HostResult(server, "failed", f"{type(e).__name__}: {e}", time.monotonic() - start)
+
+        seconds = time.monotonic() - start
+        detail = data.pop("detail", "")
+        if host_logger.errors or data.get("ok") is False:
+            return HostResult(server, "failed", host_logger.errors[-1] if host_logger.errors else detail,
+                              seconds, data)
+        return HostResult(server, "ok", detail or (host_logger.succeeded[-1] if host_logger.succeeded else ""),
+                          seconds, data)
+
+    def _report(self, result: HostResult):
+        """Uma linha por servidor assim que ele termina (a tabela vem no final)"""
+        if self.quiet:
+            return
+        if result.ok:
+            self.logger.success(f"{result.server.name}: concluído em {result.seconds:.1f}s")
+        else:
+            self.logger.error(f"{result.server.name}: {result.detail}")
+
+
+def summary(operation: str, results: List[HostResult], seconds: float) -> Dict:
+    """Resumo legível por máquina"""
+    counts = {"ok": 0, "failed": 0, "timeout": 0}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    return {
+        "operation": operation,
+        "servers": len(results),
+        "ok": counts["ok"],
+        "failed": counts["failed"],
+        "timeout": counts["timeout"],
+        "seconds": round(seconds, 3),
+        "slowest": round(max((r.seconds for r in results), default=0.0), 3),
+        "results": [r.to_dict() for r in results],
+    }
+
+
+def print_summary(logger, title: str, results: List[HostResult], seconds: float):
+    """Tabela agregada no estilo das boxes do projeto"""
+    colors = logger.colors
+    box = BoxDrawer(103)
+    labels = {
+        "ok": f"{colors.VERDE}✓ ok{colors.RESET}      ",
+        "failed": f"{colors.VERMELHO}✗ falhou{colors.RESET}  ",
+        "timeout": f"{colors.AMARELO}⚠ timeout{colors.RESET} ",
+    }
+
+    print(f"\n{colors.CINZA}{box.top()}{colors.RESET}")
+    print(box.line_centered(f"{colors.BRANCO}{title} ({len(results)} servidores){colors.RESET}"))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+    print(box.line_left(f"{colors.CINZA}{'SERVIDOR':<16}{'HOST':<22}{'RESULTADO':<11}{'TEMPO':>8}  DETALHE{colors.RESET}"))
+    for result in results:
+        detail = result.detail.replace("\n", " ")
+        if len(detail) > 38:
+            detail = detail[:37] + "…"
+        line = (f"{colors.BRANCO}{result.server.name[:15]:<16}{colors.RESET}"
+                f"{colors.CINZA}{result.server.host[:21]:<22}{colors.RESET}"
+                f"{labels.get(result.status, result.status)}"
+                f"{result.seconds:>7.1f}s  {colors.CINZA}{detail}{colors.RESET}")
+        print(box.line_left(line))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+
+    ok = sum(1 for r in results if r.ok)
+    slowest = max((r.seconds for r in results), default=0.0)
+    footer = (f"{colors.VERDE}{ok} ok{colors.RESET} {colors.CINZA}·{colors.RESET} "
+              f"{colors.VERMELHO}{len(results) - ok} com falha{colors.RESET} {colors.CINZA}· "
+              f"total {seconds:.1f}s (mais lento {slowest:.1f}s){colors.RESET}")
+    print(box.line_centered(footer))
+    print(f"{colors.CINZA}{box.bottom()}{colors.RESET}")
+
+
+def print_json(operation: str, results: List[HostResult], seconds: float):
+    print(json.dumps(summary(operation, results, seconds), ensure_ascii=False, indent=2))
+
+
+# ===== Operações por servidor =====
+
+def remote_status(pool, app: str = None):
+    """Operação de status: serviços do Swarm e réplicas convergidas"""
+
+    def operation(server: ServerInfo, host_logger: HostLogger) -> Dict:
+        command = "docker service ls --format '{{.Name}}\t{{.Replicas}}'"
+        result = pool.run(server, command, timeout=30)
+        host_logger.command(command, result.stdout or result.stderr, result.code)
+        if not result.ok:
+            raise SSHError(result.stderr.strip() or f"docker service ls retornou {result.code}")
+
+        services = {}
+        for line in result.stdout.splitlines():
+            name, _, replicas = line.partition("\t")
+            if app and not (name == app or name.startswith(f"{app}_")):
+                continue
+            running, _, desired = replicas.split(" ")[0].partition("/")
+            services[name] = {"running": int(running or 0), "desired": int(desired or 0)}
+
+        converged = sum(1 for s in services.values() if s["running"] >= s["desired"])
+        return {
+            "detail": f"{len(services)} serviços, {converged} convergidos",
+            "converged": converged,
+            "services": services,
+        }
+
+    return operation
+
+
+def remote_install(config: Dict, app_ids: List[str], instance: str, jobs: int,
+                   force: bool = False, resume: bool = False):
+    """
+    Operação de instalação: um Installer por servidor, com o log do host.
+    Com resume e sem apps, cada servidor retoma o próprio lote interrompido.
+    """
+    from .installer import Installer
+    from .journal import pending_run
+
+    def operation(server: ServerInfo, host_logger: HostLogger) -> Dict:
+        apps, target_instance = app_ids, instance
+        if resume and not apps:
+            run = pending_run(server)
+            if run is None:
+                return {"detail": "nada para retomar", "ok": True, "apps": [], "instance": instance}
+            apps, target_instance = run["apps"], run["instance"]
+        installer = Installer(host_logger, dict(config), "remote", jobs=jobs, server=server,
+                              force=force, resume=resume)
+        ok = installer.install(apps, instance=target_instance)
+        return {
+            "detail": f"{len(host_logger.succeeded)} passos concluídos" if ok else "",
+            "ok": ok,
+            "apps": apps,
+            "instance": target_instance,
+        }
+
+    return operation
+
+
+def remote_plan(config: Dict, app_ids: List[str], instance: str, jobs: int, apply: bool = False):
+    """Operação de plano: diff das instâncias do servidor (e, com apply, instala as pendentes)"""
+    from .installer import Installer
+
+    def operation(server: ServerInfo, host_logger: HostLogger) -> Dict:
+        installer = Installer(host_logger, dict(config), "remote", jobs=jobs, server=server)
+        entries = installer.plan([(app_id, instance) for app_id in app_ids] if app_ids else None)
+        pending = [entry for entry in entries if entry.pending]
+        ok = installer.apply(entries) if apply and pending else True
+        return {
+            "detail": f"{len(pending)} para publicar, {len(entries) - len(pending)} inalteradas",
+            "ok": ok,
+            "plan": [{"stack": e.stack, "status": e.status, "changes": e.changes, "images": e.images}
+                     for e in entries],
+        }
+
+    return operation
@@ -0,0 +1,464 @@
+"""
+Instalador - LivChat Setup v0.1
+Orquestra a instalação das aplicações selecionadas (menu ou linha de comando)
+"""
+
+import time
+import threading
+from typing import Dict, List, Tuple
+
+from .catalog import get_catalog
+from .scheduler import InstallScheduler
+from .config_store import get_store
+from .runner import CommandRunner
+from .steps import Step, preflight_plan, app_plan, count_steps, remote_dir, wait_step
+from .fingerprint import (Fingerprint, Probe, files_digest, images_of, probe_command, parse_probe,
+                          local_probe, remote_probe)
+from .journal import Journal, start_run, finish_run, pending_run
+from .profiler import span, add_span
+from .render import get_renderer, resolve_variables, ensure_secrets, stack_name, output_name, write_bundle
+
+
+# Tempo máximo de um passo local (docker pull de imagens grandes incluído)
+STEP_TIMEOUT = 1800
+# Tempo padrão para os serviços de um stack convergirem (apps/<id>.json: ready_timeout)
+READY_TIMEOUT = 300
+
+
+class PlanEntry:
+    """Uma linha do plano de instalação: o que mudou desde o último deploy"""
+
+    __slots__ = ("app", "instance", "stack", "status", "changes", "images")
+
+    def __init__(self, app: str, instance: str, stack: str, status: str, changes: List[str], images: List[str]):
+        self.app = app
+        self.instance = instance
+        self.stack = stack
+        self.status = status      # novo, alterado, inalterado, ausente
+        self.changes = changes    # componentes da fingerprint que mudaram
+        self.images = images      # imagens com id diferente do último deploy
+
+    @property
+    def pending(self) -> bool:
+        return self.status != "inalterado"
+
+
+class Installer:
+    """Instala um conjunto de aplicações usando o agendador paralelo"""
+
+    def __init__(self, logger, config: dict, mode: str = "local", jobs: int = 4, server=None,
+                 force: bool = False, resume: bool = False, prepull: bool = True):
+        """
+        Args:
+            server: ServerInfo alvo no modo remoto (padrão: servidor escolhido com `use`)
+            force: publica de novo mesmo stacks sem mudanças
+            resume: pula os passos que o diário registra como concluídos
+            prepull: baixa as imagens em segundo plano antes dos deploys
+        """
+        self.logger = logger
+        self.config = config
+        self.mode = mode
+        self.jobs = jobs
+        self.server = server
+        self.force = force
+        self.resume = resume
+        self.prepull = prepull
+        self.docker = None
+        if mode == "remote" and server is None:
+            from .ssh import current_server
+            self.server = current_server(config)
+        self.batch = None
+        self.sync = None
+        self.runner = CommandRunner(logger)
+        self.readiness = None
+        self.cancel = threading.Event()
+        # Situação de cada app na última instalação: "done" | "failed" | "skipped"
+        self.results: Dict[str, str] = {}
+        if self.server is not None:
+            from .ssh import get_pool
+            from .batch import RemoteBatch
+            from .sync import BundleSync
+            self.batch = RemoteBatch(get_pool(), self.server)
+            self.sync = BundleSync(get_pool(), self.server)
+        self.catalog = get_catalog()
+        self.renderer = get_renderer()
+        self.store = get_store()
+
+    def install(self, app_ids: List[str], instance: str = "default") -> bool:
+        """
+        Instala as aplicações informadas
+
+        Returns:
+            True se todas foram instaladas
+        """
+        self.results = {}
+        unknown = [app_id for app_id in app_ids if not self.catalog.entry(app_id)]
+        if unknown:
+            self.logger.error(f"Aplicação desconhecida: {', '.join(unknown)}")
+            return False
+
+        # Imagens começam a baixar já, enquanto o servidor é verificado e os stacks renderizados
+        pulls = self._start_pulls(app_ids)
+        run_started = False
+        ok = False
+        try:
+            # Conta total de passos para progress
+            total_steps = len(app_ids) + 3  # Apps + validação + finalização
+            if pulls is not None:
+                total_steps += 1
+            # Cada passo do plano também aparece no progresso
+            upload = self.server is not None
+            total_steps += sum(count_steps(self.catalog.load(app_id), upload) for app_id in app_ids)
+            self.logger.start_progress(total_steps)
+
+            self.logger.section("INSTALANDO APLICAÇÕES")
+
+            # --resume continua o lote pendente da instância (mesmo id); sem ele, lote novo
+            resumed = pending_run(self.server, instance) if self.resume else None
+            run_id = start_run(app_ids, instance, self.server, run_id=resumed["id"] if resumed else None)
+            run_started = True
+            # Abre já o diário das apps que este lote ainda não abriu: uma app que
+            # nem chegou a começar não pode herdar o "concluído" de outra execução
+            for app_id in app_ids:
+                journal = Journal(app_id, instance, self.server, run_id=run_id)
+                if not journal.entries():
+                    journal.begin()
+            with span("preflight", host=self._host()):
+                # Com a app docker na seleção o Engine vem do próprio plano dela
+                # (e as demais dependem dela): verificar antes impediria a instalação
+                if not self._run_steps(preflight_plan(installs_docker="docker" in app_ids)):
+                    return False
+
+            # Segredos compartilhados gerados antes das threads (todas as apps veem os mesmos)
+            # e persistidos sob lock, para execuções paralelas gerarem os mesmos valores
+            with span("secrets", host=self._host()):
+                stored = self.store.update(ensure_secrets)
+            self.config["secrets"] = stored["secrets"]
+
+            if pulls is not None:
+                # Renderiza tudo durante os downloads (o _install_app reaproveita o resultado memorizado)
+                for app_id in app_ids:
+                    self._render_stack(self.catalog.load(app_id), instance)
+                with span("pull.wait", host=self._host()):
+                    self._wait_pulls(pulls)
+
+            ok = self._install_all(app_ids, instance, run_id)
+            self.logger.success("Finalizando instalação")
+            return ok
+        finally:
+            # Qualquer saída (preflight, exceção, Ctrl+C) libera os downloads e a
+            # assinatura de eventos e fecha o lote (o registro do lote fica pendente se falhou)
+            if pulls is not None:
+                pulls.cancel()
+            if self.readiness is not None:
+                self.readiness.close()
+                self.readiness = None
+            if run_started:
+                finish_run(ok, self.server, instance)
+
+    def _install_all(self, app_ids: List[str], instance: str, run_id: str) -> bool:
+        """Instala as apps na ordem das dependências, em paralelo até self.jobs"""
+        scheduler = InstallScheduler(self.catalog.dependency_map(app_ids), jobs=self.jobs)
+        self.logger.debug(f"Instalando {len(app_ids)} aplicações com {scheduler.jobs} em paralelo")
+
+        # Eventos estruturados de cada app levam app/instância/host; "Instalado X" leva a duração da app
+        started = {}
+
+        def install_app(app_id: str):
+            started[app_id] = time.monotonic()
+            with self.logger.context(started[app_id], app=app_id, instance=instance, host=self._host()), \
+                    span("app", app=app_id, instance=instance, host=self._host()):
+                self._install_app(app_id, instance, run_id)
+
+        def on_done(app_id: str):
+            with self.logger.context(started.get(app_id), app=app_id, instance=instance, host=self._host()):
+                self.logger.success(f"Instalado {self._name(app_id)}")
+
+        def on_error(app_id: str, e: Exception):
+            with self.logger.context(started.get(app_id), app=app_id, instance=instance, host=self._host()):
+                self.logger.error(f"Falha ao instalar {self._name(app_id)}: {e}")
+
+        def on_skip(app_id: str, dep: str):
+            with self.logger.context(app=app_id, instance=instance, host=self._host()):
+                self.logger.error(f"{self._name(app_id)} não instalado: dependência {self._name(dep)} falhou")
+
+        results = scheduler.run(install_app, on_done=on_done, on_error=on_error, on_skip=on_skip,
+                                cancel=self.cancel)
+        self.results = results
+        return all(status == "done" for status in results.values())
+
+    def _start_pulls(self, app_ids: List[str]):
+        """Dispara o download das imagens das apps (None se não há o que baixar ou Docker local)"""
+        refs = [ref for app_id in app_ids for ref in (self.catalog.load(app_id).get("images") or [])]
+        if not refs or not self.prepull:
+            return None
+        if self.server is not None:
+            from .ssh import get_pool
+            from .pull import RemotePuller
+            return RemotePuller(get_pool(), self.server).start(refs)
+        from .docker_api import DockerClient
+        from .pull import ImagePuller
+        client = DockerClient()
+        if not client.available():
+            return None
+        return ImagePuller(client).start(refs)
+
+    def _wait_pulls(self, pulls):
+        """Espera os downloads com a barra de progresso; falhas só geram aviso"""
+        results = pulls.wait(on_progress=self.logger.progress_bar)
+        failed = [result for result in results.values() if not result.ok]
+        for result in failed:
+            self.logger.warning(f"Imagem {result.ref} não baixada: {result.detail}")
+        for result in results.values():
+            self.logger.debug(f"Imagem {result.ref}: {'ok' if result.ok else 'falhou'} em {result.seconds:.1f}s")
+        seconds = time.monotonic() - pulls.started_at
+        self.logger.success(f"Baixando imagens ({len(results) - len(failed)}/{len(results)} em {seconds:.1f}s)")
+
+    def apply(self, entries: List[PlanEntry]) -> bool:
+        """Instala só as entradas pendentes de um plano, agrupadas por instância"""
+        by_instance = {}
+        for entry in entries:
+            if entry.pending:
+                by_instance.setdefault(entry.instance, []).append(entry.app)
+        ok = True
+        for instance, app_ids in by_instance.items():
+            ok = self.install(app_ids, instance=instance) and ok
+        return ok
+
+    def _run_steps(self, steps, label: str = None, outputs: dict = None, journal: Journal = None) -> bool:
+        """
+        Executa os passos de um plano, informando cada um ao logger assim que termina.
+        Remoto: um único script por plano (um round-trip). Local: um processo por
+        passo, com a saída transmitida linha a linha.
+
+        Args:
+            outputs: se informado, recebe a saída de cada passo remoto (chave do passo)
+            journal: diário onde cada passo concluído é registrado assim que termina
+        """
+        if self.batch is not None:
+            def report(result):
+                # O lote roda num único canal: cada passo vira um span com o tempo medido no servidor
+                add_span(f"step.{result.step.key}", result.seconds or 0.0, code=result.code)
+                self.logger.command(result.step.command.splitlines()[0], result.output, result.code, result.seconds)
+                self._report_step(result.step, result.ok, result.output, result.code)
+                self._journal_step(journal, result.step, result.ok, result.seconds, result.output)
+                if outputs is not None:
+                    outputs[result.step.key] = result.output
+
+            with span("batch", steps=len(steps)):
+                results = self.batch.run(steps, on_step=report)
+            return all(result.ok for result in results)
+
+        for step in steps:
+            with span(f"step.{step.key}"):
+                result = self.runner.run(step.command, timeout=STEP_TIMEOUT, cancel=self.cancel, label=label)
+            self._report_step(step, result.ok, result.output, result.code,
+                              hint=f"Log completo: {result.transcript}")
+            self._journal_step(journal, step, result.ok, result.seconds, result.output)
+            if not result.ok:
+                return False
+        return True
+
+    @staticmethod
+    def _journal_step(journal, step, ok: bool, seconds: float, output: str):
+        if journal is None:
+            return
+        if ok:
+            journal.step(step, seconds)
+        else:
+            journal.failed(step, output)
+
+    def _wait_ready(self, stack: str, timeout: float):
+        """Só libera as dependentes quando os serviços do stack convergirem"""
+        if self.readiness is None:
+            from .readiness import ReadinessMonitor
+            self.readiness = ReadinessMonitor()
+        if not self.readiness.client.available():
+            self.logger.warning(f"Docker API indisponível: prontidão de {stack} não verificada")
+            return
+        with span("ready.wait", stack=stack):
+            result = self.readiness.wait_stack(stack, timeout)
+        if result.failed:
+            self.logger.error(f"Update de {stack} revertido pelo swarm: {result.detail}")
+            raise RuntimeError(f"{stack} não subiu (update revertido)")
+        if not result.ready:
+            self.logger.error(f"Aguardando serviços de {stack}: {result.detail}")
+            raise RuntimeError(f"{stack} não ficou pronto em {timeout:.0f}s")
+        self.logger.debug(f"{stack}: {result.detail} após {result.checks} verificações")
+        self.logger.success(f"Serviços de {stack} prontos ({result.seconds:.1f}s)")
+
+    def _report_step(self, step, ok: bool, output: str, code: int, hint: str = None):
+        if ok:
+            self.logger.success(step.label)
+        else:
+            last = output.strip().splitlines()[-1:] or [f"código {code}"]
+            self.logger.error(f"{step.label}: {last[0]}", hint)
+
+    def _host(self) -> str:
+        """Nome do alvo nos eventos estruturados"""
+        return self.server.name if self.server is not None else "local"
+
+    def _name(self, app_id: str) -> str:
+        return self.catalog.entry(app_id)["name"]
+
+    def _install_app(self, app_id: str, instance: str, run_id: str):
+        """Instala uma única aplicação (roda em thread do pool)"""
+        # Definição completa só é lida para as apps selecionadas
+        definition = self.catalog.load(app_id)
+        stack = stack_name(app_id, instance)
+        journal = Journal(app_id, instance, self.server, run_id=run_id).load()
+        if self.resume and journal.is_done():
+            self.logger.success(f"Stack {stack} já concluído na execução anterior")
+            return
+
+        bundle, files = self._render_stack(definition, instance)
+        deploy = self._app_steps(definition, stack, files, bundle)
+        refs = images_of(files, definition)
+        fingerprint = None
+
+        if bundle is not None and not self.force:
+            probe = self._probe([stack], refs)
+            fingerprint = Fingerprint.build(files, deploy, probe.image_ids(refs))
+            if stack in probe.deployed and fingerprint == self._recorded(app_id, instance):
+                self.logger.success(f"Stack {stack} sem mudanças (deploy ignorado)")
+                journal.done()
+                return
+
+        plan = list(deploy)
+        if self.server is not None:
+            if bundle is not None:
+                sync_step = Step("sync", f"Enviando arquivos do stack {stack}", files_digest(files))
+                if not self._resumed(sync_step, journal):
+                    with span("sync", stack=stack):
+                        report = self.sync.sync(bundle, remote_dir(stack))
+                    self.logger.success(f"{sync_step.label} ({report.summary()})")
+                    journal.step(sync_step)
+                plan.append(wait_step(stack, definition.get("ready_timeout", READY_TIMEOUT)))
+                # Ids das imagens depois do deploy, no mesmo lote (sem round-trip extra)
+                plan.append(Step("images", f"Registrando imagens de {stack}", probe_command([], refs)))
+            outputs = {}
+            if not self._run_steps(self._pending(plan, journal), outputs=outputs, journal=journal):
+                raise RuntimeError("passo remoto falhou")
+            if bundle is not None:
+                images = parse_probe(outputs.get("images", ""), refs).image_ids(refs)
+                fingerprint = Fingerprint.build(files, deploy, images)
+        else:
+            if not self._run_steps(self._pending(plan, journal), label=stack, journal=journal):
+                raise RuntimeError("passo falhou")
+            if bundle is not None:
+                ready_step = Step("ready", f"Aguardando serviços de {stack}", stack)
+                if not self._resumed(ready_step, journal):
+                    self._wait_ready(stack, definition.get("ready_timeout", READY_TIMEOUT))
+                    journal.step(ready_step)
+                fingerprint = Fingerprint.build(files, deploy, self._probe([], refs).image_ids(refs))
+
+        def record(data: dict):
+            data.update(app=app_id, instance=instance, stack=stack,
+                        bundle=str(bundle) if bundle else None)
+            deployed = {"installed_at": time.time()}
+            if fingerprint is not None:
+                deployed["fingerprint"] = fingerprint.to_dict()
+            if self.server is not None:
+                # A mesma instância pode existir em vários servidores da frota
+                data.setdefault("servers", {})[self.server.name] = deployed
+            else:
+                data.pop("fingerprint", None)
+                data.update(deployed)
+        self.store.update_instance(app_id, instance, record)
+        journal.done()
+
+    def _resumed(self, step, journal: Journal) -> bool:
+        """Passo já concluído antes da interrupção (só com --resume): informa e pula"""
+        if self.resume and journal.completed(step):
+            self.logger.success(f"{step.label} (já concluído)")
+            return True
+        return False
+
+    def _pending(self, steps, journal: Journal):
+        """Passos que ainda faltam; a coleta de imagens sempre roda (a saída é usada)"""
+        return [step for step in steps if step.key == "images" or not self._resumed(step, journal)]
+
+    def _app_steps(self, definition: dict, stack: str, files: dict, bundle):
+        """Plano da aplicação (local: arquivos lidos direto de .cache/stacks/)"""
+        network = self.config.get("global", {}).get("docker_network", "livchat_network")
+        directory = bundle if self.server is None else None
+        return app_plan(definition, stack, files, network, directory=directory)
+
+    def _probe(self, stacks, refs) -> Probe:
+        """Ids das imagens e stacks publicados no host alvo (uma consulta)"""
+        with span("fingerprint.probe", host=self._host()):
+            if self.server is not None:
+                from .ssh import get_pool
+                return remote_probe(get_pool(), self.server, stacks, refs)
+            if self.docker is None:
+                from .docker_api import DockerClient
+                self.docker = DockerClient()
+            return local_probe(self.docker, stacks, refs)
+
+    def _recorded(self, app_id: str, instance: str):
+        """Fingerprint do último deploy desta instância no host alvo"""
+        record = self.store.get_instance(app_id, instance) or {}
+        if self.server is not None:
+            record = (record.get("servers") or {}).get(self.server.name) or {}
+        return Fingerprint.from_dict(record.get("fingerprint"))
+
+    def deployed_targets(self) -> List[Tuple[str, str]]:
+        """(app, instância) já publicadas no host alvo, segundo os registros"""
+        targets = []
+        for app_id, instance in self.store.list_instances():
+            record = self.store.get_instance(app_id, instance) or {}
+            if self.server is not None:
+                found = self.server.name in (record.get("servers") or {})
+            else:
+                found = "installed_at" in record
+            if found and self.catalog.entry(app_id):
+                targets.append((app_id, instance))
+        return targets
+
+    def plan(self, targets: List[Tuple[str, str]] = None) -> List[PlanEntry]:
+        """
+        Diff de (app, instância) contra o último deploy, sem publicar nada
+        (padrão: todas as instâncias publicadas no host). Renderiza tudo
+        (memorizado) e consulta o host uma única vez.
+        """
+        if targets is None:
+            targets = self.deployed_targets()
+        # Mesmos segredos da instalação; se ainda não existem, são gerados só em memória
+        self.config["secrets"] = dict(self.store.load().get("secrets") or self.config.get("secrets") or {})
+        ensure_secrets(self.config)
+        pending = []
+        for app_id, instance in targets:
+            definition = self.catalog.load(app_id)
+            bundle, files = self._render_stack(definition, instance)
+            if bundle is None:
+                continue  # infraestrutura: os passos são idempotentes e sempre verificados
+            stack = stack_name(app_id, instance)
+            pending.append((app_id, instance, stack, files, self._app_steps(definition, stack, files, bundle),
+                            images_of(files, definition)))
+
+        probe = self._probe([item[2] for item in pending], sorted({ref for item in pending for ref in item[5]}))
+        entries = []
+        for app_id, instance, stack, files, steps, refs in pending:
+            current = Fingerprint.build(files, steps, probe.image_ids(refs))
+            previous = self._recorded(app_id, instance)
+            changes = current.diff(previous)
+            if previous is None:
+                status = "novo"
+            elif stack not in probe.deployed:
+                status = "ausente"  # registrado, mas o stack não existe mais no host
+            else:
+                status = "alterado" if changes else "inalterado"
+            entries.append(PlanEntry(app_id, instance, stack, status, changes, current.changed_images(previous)))
+        return entries
+
+    def _render_stack(self, definition: dict, instance: str):
+        """Renderiza os templates da app (memorizado: instância sem mudanças não renderiza de novo)"""
+        templates = definition.get("templates") or []
+        if not templates:
+            return None, {}
+        with span("render", app=definition["id"], instance=instance, host=self._host()):
+            variables = resolve_variables(definition, self.config, instance)
+            files = {output_name(t): self.renderer.render(t, variables) for t in templates}
+            bundle = write_bundle(stack_name(definition["id"], instance), files)
+        self.logger.debug(f"Stack {bundle.name} renderizado em {bundle}")
+        return bundle, files
@@ -0,0 +1,205 @@
+"""
+Diário de Instalação - LivChat Setup v0.1
+Registro append-only dos passos concluídos, para retomar instalações interrompidas
+
+- um arquivo por alvo/app/instância em config.d/journal/<alvo>/<app>/<instância>.jsonl
+- cada linha é um JSON; a linha é gravada e sincronizada (fsync) assim que
+  o passo termina, então um Ctrl+C, queda do SSH ou OOM perde no máximo o
+  passo em andamento
+- uma linha cortada no meio (queda durante a escrita) é ignorada na leitura
+- "begin" abre uma nova execução; só o que vem depois do último "begin" vale
+- cada lote tem um id, gravado no "begin" dos diários que ele abriu: ao
+  retomar, só contam os passos e o "done" registrados pelo próprio lote
+- o lote de cada instância (id e apps) fica em
+  config.d/journal/<alvo>/runs/<instância>.json, para `install --resume`
+"""
+
+import os
+import json
+import time
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config_store import ConfigError, atomic_write_json, _read_json
+
+JOURNAL_DIR = Path("config.d") / "journal"
+
+
+def step_digest(step) -> str:
+    """Identidade de um passo: se o comando mudou, o passo não conta como concluído"""
+    return hashlib.sha256(f"{step.key}\0{step.command}".encode()).hexdigest()[:16]
+
+
+def _target_name(server=None) -> str:
+    return server.name if server is not None else "local"
+
+
+class Journal:
+    """Diário de uma app/instância em um alvo (local ou servidor)"""
+
+    def __init__(self, app_id: str, instance: str, server=None, base_dir: Path = JOURNAL_DIR,
+                 run_id: str = None):
+        """
+        Args:
+            run_id: lote que está sendo executado; uma execução aberta por outro
+                lote não vale (nem passos, nem "done")
+        """
+        self.path = Path(base_dir) / _target_name(server) / app_id / f"{instance}.jsonl"
+        self.run_id = run_id
+        self._completed: Optional[Dict[str, str]] = None
+
+    # ===== Escrita =====
+
+    def _append(self, entry: Dict):
+        """Uma linha, gravada com O_APPEND e fsync antes de devolver"""
+        entry["t"] = time.time()
+        data = (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode()
+        new_file = not self.path.exists()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if new_file:
+            _fsync_dir(self.path.parent)
+
+    def begin(self):
+        """Nova execução: passos anteriores deixam de contar"""
+        entry = {"event": "begin"}
+        if self.run_id is not None:
+            entry["run"] = self.run_id
+        self._append(entry)
+        self._completed = {}
+
+    def step(self, step, seconds: float = None):
+        """Passo concluído com sucesso"""
+        entry = {"event": "step", "key": step.key, "digest": step_digest(step)}
+        if seconds is not None:
+            entry["seconds"] = round(seconds, 3)
+        self._append(entry)
+        if self._completed is not None:
+            self._completed[step.key] = entry["digest"]
+
+    def failed(self, step, detail: str = ""):
+        self._append({"event": "failed", "key": step.key, "detail": detail[-500:]})
+
+    def done(self):
+        """App/instância concluída"""
+        self._append({"event": "done"})
+
+    # ===== Leitura =====
+
+    def entries(self) -> List[Dict]:
+        """
+        Linhas da última execução (linhas corrompidas são ignoradas); com run_id,
+        vazio se a última execução foi aberta por outro lote
+        """
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return []
+        entries: List[Dict] = []
+        for line in raw.splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("event") == "begin":
+                entries = []
+            entries.append(entry)
+        if self.run_id is not None and (not entries or entries[0].get("run") != self.run_id):
+            return []
+        return entries
+
+    def load(self):
+        """Carrega os passos concluídos da última execução (para retomar)"""
+        self._completed = {}
+        for entry in self.entries():
+            if entry.get("event") == "step":
+                self._completed[entry["key"]] = entry.get("digest")
+        return self
+
+    def is_done(self) -> bool:
+        entries = self.entries()
+        return bool(entries) and entries[-1].get("event") == "done"
+
+    def completed(self, step) -> bool:
+        """Se o passo (com o mesmo comando) já foi concluído nesta execução"""
+        if self._completed is None:
+            self.load()
+        return self._completed.get(step.key) == step_digest(step)
+
+    def last_failure(self) -> Optional[Dict]:
+        failures = [entry for entry in self.entries() if entry.get("event") == "failed"]
+        return failures[-1] if failures else None
+
+
+# ===== Lote da execução =====
+
+def run_path(server=None, instance: str = "default", base_dir: Path = JOURNAL_DIR) -> Path:
+    return Path(base_dir) / _target_name(server) / "runs" / f"{instance}.json"
+
+
+def new_run_id() -> str:
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(3).hex()}"
+
+
+def start_run(app_ids: List[str], instance: str, server=None, base_dir: Path = JOURNAL_DIR,
+              run_id: str = None) -> str:
+    """
+    Registra o lote em andamento da instância (lido por install --resume)
+
+    Args:
+        run_id: lote retomado (mantém o id, que os diários já registraram)
+
+    Returns:
+        id do lote
+    """
+    run_id = run_id or new_run_id()
+    atomic_write_json(run_path(server, instance, base_dir), {
+        "id": run_id, "apps": list(app_ids), "instance": instance, "started_at": time.time(), "finished": False,
+    })
+    return run_id
+
+
+def finish_run(ok: bool, server=None, instance: str = "default", base_dir: Path = JOURNAL_DIR):
+    path = run_path(server, instance, base_dir)
+    data = _read_json(path)
+    if data is not None:
+        data.update(finished=ok, finished_at=time.time())
+        atomic_write_json(path, data)
+
+
+def pending_run(server=None, instance: str = None, base_dir: Path = JOURNAL_DIR) -> Optional[Dict]:
+    """
+    Lote interrompido ou com falha (None se o último terminou bem). Sem
+    instância: o mais recente entre as instâncias do alvo
+    """
+    if instance is not None:
+        paths = [run_path(server, instance, base_dir)]
+    else:
+        runs_dir = Path(base_dir) / _target_name(server) / "runs"
+        try:
+            paths = [runs_dir / name for name in os.listdir(runs_dir) if name.endswith(".json")]
+        except FileNotFoundError:
+            return None
+    pending = []
+    for path in paths:
+        try:
+            data = _read_json(path)
+        except ConfigError:
+            continue
+        if data and not data.get("finished"):
+            pending.append(data)
+    return max(pending, key=lambda data: data.get("started_at", 0), default=None)
+
+
+def _fsync_dir(path: Path):
+    dir_fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
@@ -0,0 +1,124 @@
+"""
+Teclado - LivChat Setup v0.1
+Leitura de teclas não bloqueante com selectors: drena tudo que chegou e
+interpreta sequências de escape com timeout (ESC sozinho não trava o menu)
+"""
+
+import os
+import codecs
+import selectors
+import time
+from typing import List
+
+# Sequências CSI/SS3 (sem o ESC inicial) -> nome da tecla
+ESCAPE_KEYS = {
+    "[A": "UP", "[B": "DOWN", "[C": "RIGHT", "[D": "LEFT",
+    "OA": "UP", "OB": "DOWN", "OC": "RIGHT", "OD": "LEFT",
+    "[H": "HOME", "[F": "END", "OH": "HOME", "OF": "END",
+    "[1~": "HOME", "[7~": "HOME", "[4~": "END", "[8~": "END",
+    "[5~": "PGUP", "[6~": "PGDN", "[3~": "DELETE",
+}
+
+SINGLE_KEYS = {
+    " ": "SPACE",
+    "\r": "ENTER",
+    "\n": "ENTER",
+    "\x7f": "BACKSPACE",
+    "\x08": "BACKSPACE",
+}
+
+
+class KeyReader:
+    """Lê teclas de um fd em modo cbreak sem bloquear o loop do menu"""
+
+    def __init__(self, fd: int, esc_timeout: float = 0.05):
+        self.fd = fd
+        self.esc_timeout = esc_timeout
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(fd, selectors.EVENT_READ)
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.pending = ""
+        self.eof = False
+
+    def close(self):
+        self.selector.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _ready(self, timeout: float) -> bool:
+        return bool(self.selector.select(timeout))
+
+    def _drain(self):
+        """Lê todos os bytes disponíveis agora, sem esperar"""
+        while True:
+            data = os.read(self.fd, 4096)
+            if not data:
+                self.eof = True
+                break
+            self.pending += self.decoder.decode(data)
+            if not self._ready(0):
+                break
+
+    def read_keys(self, timeout: float = None) -> List[str]:
+        """
+        Espera até `timeout` segundos por entrada e devolve todas as teclas
+        pendentes (lista vazia = timeout, útil como tick do loop).
+        Fim da entrada vira a tecla 'EOF'.
+        """
+        if self.eof:
+            return ["EOF"]
+        if not self.pending and not self._ready(timeout):
+            return []
+        self._drain()
+
+        keys = []
+        while self.pending:
+            key, consumed = self._parse(self.pending)
+            if consumed == 0:
+                # Sequência de escape incompleta: espera um pouco pelo resto
+                deadline = time.monotonic() + self.esc_timeout
+                remaining = self.esc_timeout
+                while remaining > 0 and consumed == 0:
+                    if self._ready(remaining):
+                        self._drain()
+                        key, consumed = self._parse(self.pending)
+                    remaining = deadline - time.monotonic()
+                if consumed == 0:
+                    # Não veio mais nada: o que temos vale como está
+                    key, consumed = self._parse(self.pending, final=True)
+            self.pending = self.pending[consumed:]
+            if key:
+                keys.append(key)
+        if self.eof:
+            keys.append("EOF")
+        return keys
+
+    @staticmethod
+    def _parse(buffer: str, final: bool = False):
+        """(tecla, caracteres consumidos); consumed == 0 pede mais bytes"""
+        ch = buffer[0]
+        if ch != "\x1b":
+            return SINGLE_KEYS.get(ch, ch), 1
+
+        if len(buffer) == 1:
+            return ("ESC", 1) if final else (None, 0)
+
+        intro = buffer[1]
+        if intro not in "[O":
+            # ESC seguido de outra tecla (Alt+tecla ou ESC digitado rápido)
+            return "ESC", 1
+
+        # Sequência termina no primeiro caractere entre '@' e '~'
+        for end in range(2, len(buffer)):
+            if "@" <= buffer[end] <= "~":
+                seq = buffer[1:end + 1]
+                return ESCAPE_KEYS.get(seq, ""), end + 1
+        if final:
+            # Sequência truncada: descarta
+            return "", len(buffer)
+        return None, 0
+
@@ -4,8 +4,41 @@ Implementação baseada no método do projeto original para alinhamento perfeito
 """
 
 import os
+import re
 import sys
-from datetime import datetime
+import time
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+
+# Códigos de cor ANSI, que não ocupam espaço na tela
+ANSI_PATTERN = re.compile(r'\x1b\[[0-9;]*m')
+# Sucesso/erro levam a duração do passo: o tempo desde o último marco da mesma
+# thread (seção, passo, sucesso, erro ou início do contexto)
+TIMED_LEVELS = ("success", "error")
+MARK_LEVELS = ("section", "step", "success", "error")
+# Cursor para o topo, limpa a tela e o histórico de rolagem (equivalente ao `clear`)
+CLEAR_SCREEN = "\033[H\033[2J\033[3J"
+
+
+@lru_cache(maxsize=4096)
+def visible_len(text: str) -> int:
+    """
+    Largura do texto na tela, sem os códigos ANSI (memorizada: as mesmas linhas se repetem muito).
+    Caracteres largos (CJK, emoji) ocupam duas colunas; acentos combinantes, nenhuma.
+    """
+    if "\x1b" in text:
+        text = ANSI_PATTERN.sub('', text)
+    if text.isascii():
+        return len(text)
+    import unicodedata
+    width = 0
+    for char in text:
+        if unicodedata.combining(char):
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+    return width
+
 
 class Colors:
     """Paleta de cores profissional como o projeto original"""
@@ -29,55 +62,48 @@ class BoxDrawer:
     def __init__(self, width: int = 103):
         self.width = width
         self.inner_width = width - 2  # 101 para largura total de 103
+        # Bordas não mudam: montadas uma vez por largura
+        self._top = f"╭{'─' * self.inner_width}╮"
+        self._bottom = f"╰{'─' * self.inner_width}╯"
+        self._separator = f"├{'─' * self.inner_width}┤"
+        self._left = f"{Colors.CINZA}│{Colors.RESET}"
+        self._right = f"{Colors.CINZA}│{Colors.RESET}"
+        self._empty = f"{self._left}{' ' * self.inner_width}{self._right}"
     
     def top(self) -> str:
         # Exatamente 103 caracteres (1 + 101 + 1)
-        return f"╭{'─' * self.inner_width}╮"
+        return self._top
     
     def bottom(self) -> str:
         # Exatamente 103 caracteres (1 + 101 + 1)
-        return f"╰{'─' * self.inner_width}╯"
+        return self._bottom
     
     def empty(self) -> str:
         # Exatamente 103 caracteres (1 + 101 espaços + 1)
-        colors = Colors()
-        return f"{colors.CINZA}│{colors.RESET}{' ' * self.inner_width}{colors.CINZA}│{colors.RESET}"
+        return self._empty
     
     def line_centered(self, content: str) -> str:
         """
         Centraliza texto considerando cores ANSI
         Método idêntico ao projeto original
         """
-        import re
-        
-        # Remove códigos ANSI para calcular tamanho real
-        clean_content = re.sub(r'\x1b\[[0-9;]*m', '', content)
-        content_length = len(clean_content)
-        
-        # Calcula espaçamento para centralizar
-        total_padding = self.inner_width - content_length
+        # Calcula espaçamento para centralizar (sem contar os códigos ANSI)
+        total_padding = self.inner_width - visible_len(content)
         left_padding = total_padding // 2
         right_padding = total_padding - left_padding
         
         # Monta a linha com espaçamento calculado e bordas cinza
-        colors = Colors()
-        return f"{colors.CINZA}│{colors.RESET}{' ' * left_padding}{content}{' ' * right_padding}{colors.CINZA}│{colors.RESET}"
+        return f"{self._left}{' ' * left_padding}{content}{' ' * right_padding}{self._right}"
     
     def line_left(self, content: str, indent: int = 2) -> str:
         """Alinha texto à esquerda com indentação"""
-        import re
-        
-        clean_content = re.sub(r'\x1b\[[0-9;]*m', '', content)
-        content_length = len(clean_content)
-        
         # Calcula padding à direita
-        right_padding = self.inner_width - indent - content_length
+        right_padding = self.inner_width - indent - visible_len(content)
         
-        colors = Colors()
-        return f"{colors.CINZA}│{colors.RESET}{' ' * indent}{content}{' ' * right_padding}{colors.CINZA}│{colors.RESET}"
+        return f"{self._left}{' ' * indent}{content}{' ' * right_padding}{self._right}"
     
     def separator(self) -> str:
-        return f"├{'─' * self.inner_width}┤"
+        return self._separator
 
 class Progress:
     """Sistema de progresso com contadores"""
@@ -86,79 +112,155 @@ class Progress:
         self.current = 0
         self.total = total
         self.colors = Colors()
+        # Partes fixas da linha, montadas uma vez
+        self._done = f"  {Colors.VERDE}✓{Colors.RESET} {Colors.CINZA}"
+        self._failed = f"  {Colors.VERMELHO}✗{Colors.RESET} {Colors.CINZA}"
+        self._pending = f"  {Colors.CINZA}◌{Colors.RESET} {Colors.CINZA}"
+        self._suffix = f"/{total}{Colors.RESET} - "
     
     def step(self, message: str) -> str:
         self.current += 1
-        symbol = f"{self.colors.VERDE}✓{self.colors.RESET}"
-        counter = f"{self.colors.CINZA}{self.current}/{self.total}{self.colors.RESET}"
-        return f"  {symbol} {counter} - {message}"
+        return f"{self._done}{self.current}{self._suffix}{message}"
     
     def error(self, message: str) -> str:
-        symbol = f"{self.colors.VERMELHO}✗{self.colors.RESET}"
-        counter = f"{self.colors.CINZA}{self.current}/{self.total}{self.colors.RESET}"
-        return f"  {symbol} {counter} - {message}"
+        return f"{self._failed}{self.current}{self._suffix}{message}"
     
     def pending(self, message: str) -> str:
         self.current += 1
-        symbol = f"{self.colors.CINZA}◌{self.colors.RESET}"
-        counter = f"{self.colors.CINZA}{self.current}/{self.total}{self.colors.RESET}"
-        return f"  {symbol} {counter} - {message}"
+        return f"{self._pending}{self.current}{self._suffix}{message}"
+
+@lru_cache(maxsize=None)
+def _logo_frame(width: int) -> str:
+    """Logo completo (bordas + arte), montado uma vez por largura"""
+    box = BoxDrawer(width)
+    c = Colors
+    # IMPORTANTE: Logo com espaços extras para alinhamento (como no original)
+    logo_lines = [
+        f"{c.LARANJA}     ██╗     ██╗██╗   ██╗ ██████╗██╗  ██╗ █████╗ ████████╗     {c.RESET}",
+        f"{c.LARANJA}     ██║     ██║██║   ██║██╔════╝██║  ██║██╔══██╗╚══██╔══╝     {c.RESET}",
+        f"{c.LARANJA}     ██║     ██║██║   ██║██║     ███████║███████║   ██║        {c.RESET}",
+        f"{c.LARANJA}     ██║     ██║╚██╗ ██╔╝██║     ██╔══██║██╔══██║   ██║        {c.RESET}",
+        f"{c.LARANJA}     ███████╗██║ ╚████╔╝ ╚██████╗██║  ██║██║  ██║   ██║        {c.RESET}",
+        f"{c.LARANJA}     ╚══════╝╚═╝  ╚═══╝   ╚═════╝╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝        {c.RESET}"
+    ]
+    lines = [f"{c.CINZA}{box.top()}{c.RESET}", box.empty(), box.empty()]
+    lines += [box.line_centered(line) for line in logo_lines]
+    lines += [
+        box.empty(),
+        box.line_centered(f'{c.BRANCO}Setup Modular v0.1{c.RESET}'),
+        box.empty(),
+        f"{c.CINZA}{box.bottom()}{c.RESET}",
+        "",
+    ]
+    return "\n".join(lines) + "\n"
 
 class Logger:
     """Logger elegante com dois modos: produção visual e desenvolvimento completo"""
     
-    def __init__(self, dev_mode: bool = False):
+    def __init__(self, dev_mode: bool = False, stream=None, events=None):
         """
         Args:
             dev_mode: True para desenvolvimento, False para produção
+            stream: destino da saída (padrão: sys.stdout no momento da escrita)
+            events: EventSink que recebe cada chamada como evento estruturado
         """
         self.dev = dev_mode
-        self.can_clear = not dev_mode and sys.stdout.isatty()
+        self.stream = stream
+        self.events = events
+        # app/instância/host de quem está logando (cada thread instala uma app)
+        self._context = threading.local()
+        self.can_clear = not dev_mode and (stream or sys.stdout).isatty()
         self.colors = Colors()
         self.box = BoxDrawer(103)
         self.progress = None
+        # Linhas inteiras mesmo com várias threads/comandos escrevendo ao mesmo tempo
+        self._lock = threading.RLock()
+        # Bordas coloridas usadas pelas seções e boxes
+        self._top = f"{Colors.CINZA}{self.box.top()}{Colors.RESET}"
+        self._bottom = f"{Colors.CINZA}{self.box.bottom()}{Colors.RESET}"
+        self._stamp_second = -1
+        self._stamp = ""
+    
+    def _write(self, *lines: str, end: str = "\n"):
+        """Um evento lógico: todas as linhas numa única escrita, seguida de um flush"""
+        data = "\n".join(lines) + end
+        stream = self.stream or sys.stdout
+        with self._lock:
+            stream.write(data)
+            stream.flush()
+    
+    # ===== Eventos estruturados =====
+    
+    @contextmanager
+    def context(self, since: float = None, **fields):
+        """
+        Campos (app, instance, host) anexados aos eventos emitidos por esta thread
+
+        Args:
+            since: time.monotonic() de quando o trabalho começou; vira o marco
+                   de onde conta a duração do próximo sucesso/erro
+        """
+        local = self._context
+        previous = getattr(local, "fields", {})
+        local.fields = {**previous, **{k: v for k, v in fields.items() if v is not None}}
+        if since is not None:
+            local.last = since
+        try:
+            yield self
+        finally:
+            local.fields = previous
+    
+    def record(self, level: str, message: str, duration: float = None, **extra):
+        """
+        Emite um evento estruturado, sem saída na tela. Sem duração explícita,
+        sucesso/erro levam o tempo desde o último marco da mesma thread.
+        """
+        if self.events is None:
+            return
+        local = self._context
+        now = time.monotonic()
+        if level in MARK_LEVELS:
+            last = getattr(local, "last", None)
+            if duration is None and last is not None and level in TIMED_LEVELS:
+                duration = now - last
+            local.last = now
+        event = {"ts": time.time(), "mono": now, "level": level,
+                 "message": ANSI_PATTERN.sub('', message) if "\x1b" in message else message}
+        event.update(getattr(local, "fields", {}))
+        if duration is not None:
+            event["duration"] = round(duration, 6)
+        for key, value in extra.items():
+            if value is not None:
+                event[key] = value
+        self.events.emit(event)
     
     def clear(self):
         """Limpa tela apenas em produção"""
         if self.can_clear:
-            os.system('clear' if os.name != 'nt' else 'cls')
+            if os.name == 'nt':
+                os.system('cls')
+            else:
+                self._write(CLEAR_SCREEN, end="")
     
     def show_logo(self):
         """Logo grande e imponente - Método do projeto original"""
         if not self.dev:
-            self.clear()
-            
-            print(f"{self.colors.CINZA}{self.box.top()}{self.colors.RESET}")
-            print(self.box.empty())
-            print(self.box.empty())
-            
-            # IMPORTANTE: Logo com espaços extras para alinhamento (como no original)
-            logo_lines = [
-                f"{self.colors.LARANJA}     ██╗     ██╗██╗   ██╗ ██████╗██╗  ██╗ █████╗ ████████╗     {self.colors.RESET}",
-                f"{self.colors.LARANJA}     ██║     ██║██║   ██║██╔════╝██║  ██║██╔══██╗╚══██╔══╝     {self.colors.RESET}",
-                f"{self.colors.LARANJA}     ██║     ██║██║   ██║██║     ███████║███████║   ██║        {self.colors.RESET}",
-                f"{self.colors.LARANJA}     ██║     ██║╚██╗ ██╔╝██║     ██╔══██║██╔══██║   ██║        {self.colors.RESET}",
-                f"{self.colors.LARANJA}     ███████╗██║ ╚████╔╝ ╚██████╗██║  ██║██║  ██║   ██║        {self.colors.RESET}",
-                f"{self.colors.LARANJA}     ╚══════╝╚═╝  ╚═══╝   ╚═════╝╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝        {self.colors.RESET}"
-            ]
-            
-            for line in logo_lines:
-                print(self.box.line_centered(line))
-            
-            print(self.box.empty())
-            print(self.box.line_centered(f'{self.colors.BRANCO}Setup Modular v0.1{self.colors.RESET}'))
-            print(self.box.empty())
-            print(f"{self.colors.CINZA}{self.box.bottom()}{self.colors.RESET}")
-            print()
+            clear = CLEAR_SCREEN if self.can_clear and os.name != 'nt' else ""
+            if self.can_clear and not clear:
+                self.clear()
+            self._write(clear + _logo_frame(self.box.width), end="")
     
     def section(self, title: str):
         """Início de nova seção"""
+        self.record("section", title)
         if self.dev:
-            print(f"\n[{self._timestamp()}] === {title.upper()} ===")
+            self._write(f"\n[{self._timestamp()}] === {title.upper()} ===")
         else:
-            print(f"\n{self.colors.CINZA}{self.box.top()}{self.colors.RESET}")
-            print(self.box.line_centered(f'{self.colors.BRANCO}{title}{self.colors.RESET}'))
-            print(f"{self.colors.CINZA}{self.box.bottom()}{self.colors.RESET}\n")
+            self._write(
+                f"\n{self._top}",
+                self.box.line_centered(f'{Colors.BRANCO}{title}{Colors.RESET}'),
+                f"{self._bottom}\n",
+            )
     
     def start_progress(self, total: int):
         """Inicia contador de progresso"""
@@ -167,108 +269,157 @@ class Logger:
     
     def success(self, message: str):
         """Mensagem de sucesso"""
-        if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} {self.colors.VERDE}[success]{self.colors.CINZA} > {self.colors.RESET}{message}")
-        else:
-            if self.progress:
-                print(self.progress.step(message))
+        self.record("success", message)
+        c = Colors
+        with self._lock:
+            if self.dev:
+                self._write(f"{c.CINZA}{self._timestamp()} {c.VERDE}[success]{c.CINZA} > {c.RESET}{message}")
+            elif self.progress:
+                self._write(self.progress.step(message))
             else:
-                print(f"  {self.colors.VERDE}✓{self.colors.RESET} {message}")
+                self._write(f"  {c.VERDE}✓{c.RESET} {message}")
     
     def error(self, message: str, hint: str = None):
         """Mensagem de erro"""
-        if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} {self.colors.VERMELHO}[error]{self.colors.CINZA} > {self.colors.RESET}{message}")
-            if hint:
-                print(f"{self.colors.CINZA}{self._timestamp()} {self.colors.AMARELO}[hint]{self.colors.CINZA} > {self.colors.RESET}{hint}")
-        else:
-            if self.progress:
-                print(self.progress.error(message))
+        self.record("error", message, hint=hint)
+        c = Colors
+        with self._lock:
+            if self.dev:
+                lines = [f"{c.CINZA}{self._timestamp()} {c.VERMELHO}[error]{c.CINZA} > {c.RESET}{message}"]
+                if hint:
+                    lines.append(f"{c.CINZA}{self._timestamp()} {c.AMARELO}[hint]{c.CINZA} > {c.RESET}{hint}")
+                self._write(*lines)
+            elif self.progress:
+                self._write(self.progress.error(message))
             else:
                 self._draw_error_box(message, hint)
     
     def step(self, message: str):
         """Passo em progresso"""
-        if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} [step] > {self.colors.RESET}{message}")
-        else:
-            if self.progress:
-                print(self.progress.pending(message))
+        self.record("step", message)
+        c = Colors
+        with self._lock:
+            if self.dev:
+                self._write(f"{c.CINZA}{self._timestamp()} [step] > {c.RESET}{message}")
+            elif self.progress:
+                self._write(self.progress.pending(message))
             else:
-                print(f"  {self.colors.CINZA}◌{self.colors.RESET} {message}")
+                self._write(f"  {c.CINZA}◌{c.RESET} {message}")
     
     def info(self, message: str):
         """Informação"""
+        self.record("info", message)
+        c = Colors
         if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} {self.colors.AZUL}[info]{self.colors.CINZA} > {self.colors.RESET}{message}")
+            self._write(f"{c.CINZA}{self._timestamp()} {c.AZUL}[info]{c.CINZA} > {c.RESET}{message}")
         else:
             # Em produção, info aparece de forma sutil
-            print(f"  {self.colors.CINZA}ℹ{self.colors.RESET} {self.colors.CINZA}{message}{self.colors.RESET}")
+            self._write(f"  {c.CINZA}ℹ{c.RESET} {c.CINZA}{message}{c.RESET}")
     
     def warning(self, message: str):
         """Aviso"""
+        self.record("warning", message)
+        c = Colors
         if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} {self.colors.AMARELO}[warning]{self.colors.CINZA} > {self.colors.RESET}{message}")
+            self._write(f"{c.CINZA}{self._timestamp()} {c.AMARELO}[warning]{c.CINZA} > {c.RESET}{message}")
         else:
-            print(f"  {self.colors.AMARELO}⚠{self.colors.RESET} {self.colors.AMARELO}{message}{self.colors.RESET}")
+            self._write(f"  {c.AMARELO}⚠{c.RESET} {c.AMARELO}{message}{c.RESET}")
     
-    def command(self, cmd: str, output: str = None, code: int = None):
+    def command(self, cmd: str, output: str = None, code: int = None, seconds: float = None):
         """Log de comando - só em dev"""
+        self.record("command", cmd, duration=seconds, code=code, output=output[-2000:] if output else None)
         if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} {self.colors.BEGE}[command]{self.colors.CINZA} > {self.colors.RESET}{cmd}")
-            if output:
-                # Limita output para não poluir
-                lines = output.strip().split('\n')
-                for line in lines[:10]:
-                    if line.strip():
-                        print(f"{self.colors.CINZA}{self._timestamp()} [output] > {self.colors.RESET}{line}")
-                if len(lines) > 10:
-                    print(f"{self.colors.CINZA}{self._timestamp()} [output] > {self.colors.RESET}... ({len(lines)-10} linhas omitidas)")
-            if code is not None:
-                color = self.colors.VERDE if code == 0 else self.colors.VERMELHO
-                print(f"{self.colors.CINZA}{self._timestamp()} {color}[return]{self.colors.CINZA} > {self.colors.RESET}{code}")
+            c = Colors
+            with self._lock:
+                stamp = self._timestamp()
+                lines = [f"{c.CINZA}{stamp} {c.BEGE}[command]{c.CINZA} > {c.RESET}{cmd}"]
+                if output:
+                    # Limita output para não poluir
+                    output_lines = output.strip().split('\n')
+                    for line in output_lines[:10]:
+                        if line.strip():
+                            lines.append(f"{c.CINZA}{stamp} [output] > {c.RESET}{line}")
+                    if len(output_lines) > 10:
+                        lines.append(f"{c.CINZA}{stamp} [output] > {c.RESET}... ({len(output_lines)-10} linhas omitidas)")
+                if code is not None:
+                    color = c.VERDE if code == 0 else c.VERMELHO
+                    lines.append(f"{c.CINZA}{stamp} {color}[return]{c.CINZA} > {c.RESET}{code}")
+                self._write(*lines)
+    
+    def command_start(self, cmd: str, source: str = None):
+        """Início de um comando em execução (saída chega depois por command_output) - só em dev"""
+        self.record("command_start", cmd, source=source)
+        if self.dev:
+            c = Colors
+            self._write(f"{c.CINZA}{self._timestamp()} {c.BEGE}[command]{c.CINZA} > {c.RESET}{self._source(source)}{cmd}")
+    
+    def command_output(self, line: str, source: str = None, stderr: bool = False):
+        """Uma linha de saída de comando, assim que é produzida - só em dev"""
+        if self.dev and line.strip():
+            tag = "stderr" if stderr else "output"
+            self._write(f"{Colors.CINZA}{self._timestamp()} [{tag}] > {Colors.RESET}{self._source(source)}{line}")
+    
+    def command_end(self, code: int, seconds: float = None, source: str = None):
+        """Código de saída de um comando - só em dev"""
+        self.record("command_end", "", duration=seconds, code=code, source=source)
+        if self.dev:
+            c = Colors
+            color = c.VERDE if code == 0 else c.VERMELHO
+            elapsed = f" {c.CINZA}({seconds:.1f}s){c.RESET}" if seconds is not None else ""
+            self._write(f"{c.CINZA}{self._timestamp()} {color}[return]{c.CINZA} > {c.RESET}{self._source(source)}{code}{elapsed}")
+    
+    def _source(self, source: str = None) -> str:
+        return f"{Colors.BEGE}{source}{Colors.RESET} " if source else ""
     
     def debug(self, message: str):
         """Debug - só em dev"""
+        self.record("debug", message)
         if self.dev:
-            print(f"{self.colors.CINZA}{self._timestamp()} [debug] > {message}{self.colors.RESET}")
+            self._write(f"{Colors.CINZA}{self._timestamp()} [debug] > {message}{Colors.RESET}")
     
     def exception(self, e: Exception):
         """Log de exceção"""
+        import traceback
+        trace = traceback.format_exc()
+        self.record("exception", str(e), type=type(e).__name__, traceback=trace)
         if self.dev:
-            import traceback
-            print(f"[{self._timestamp()}] Exception: {str(e)}")
-            print(traceback.format_exc())
+            self._write(f"[{self._timestamp()}] Exception: {str(e)}", trace)
         else:
             self.error(f"Falha: {str(e)}")
     
     def _timestamp(self) -> str:
-        """Timestamp para modo dev"""
-        return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        """Timestamp para modo dev (formatado uma vez por segundo)"""
+        now = time.time()
+        second = int(now)
+        if second != self._stamp_second:
+            self._stamp = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+            self._stamp_second = second
+        return self._stamp
     
     def _draw_box(self, message: str, color: str = None):
         """Desenha box elegante para produção"""
         if color is None:
-            color = self.colors.CINZA
+            color = Colors.CINZA
         
-        print(f"\n{color}{self.box.top()}{self.colors.RESET}")
-        print(self.box.line_centered(message))
-        print(f"{color}{self.box.bottom()}{self.colors.RESET}\n")
+        self._write(
+            f"\n{color}{self.box.top()}{Colors.RESET}",
+            self.box.line_centered(message),
+            f"{color}{self.box.bottom()}{Colors.RESET}\n",
+        )
     
     def _draw_error_box(self, message: str, hint: str = None):
         """Desenha box de erro elegante"""
+        c = Colors
         # Usa vermelho para top/bottom, mas as bordas verticais são controladas pelos métodos
-        print(f"\n{self.colors.VERMELHO}{self.box.top()}{self.colors.RESET}")
-        
-        error_msg = f"{self.colors.VERMELHO}✗ {message}{self.colors.RESET}"
-        print(self.box.line_centered(error_msg))
-        
+        lines = [
+            f"\n{c.VERMELHO}{self.box.top()}{c.RESET}",
+            self.box.line_centered(f"{c.VERMELHO}✗ {message}{c.RESET}"),
+        ]
         if hint:
-            print(self.box.empty())
-            hint_msg = f"{self.colors.BEGE}{hint}{self.colors.RESET}"
-            print(self.box.line_centered(hint_msg))
-        
-        print(f"{self.colors.VERMELHO}{self.box.bottom()}{self.colors.RESET}\n")
+            lines.append(self.box.empty())
+            lines.append(self.box.line_centered(f"{c.BEGE}{hint}{c.RESET}"))
+        lines.append(f"{c.VERMELHO}{self.box.bottom()}{c.RESET}\n")
+        self._write(*lines)
     
     def progress_bar(self, current: int, total: int, message: str = ""):
         """Barra de progresso simples - só em produção"""
@@ -278,6 +429,6 @@ class Logger:
             filled = int(bar_length * current / total)
             bar = "●" * filled + "◌" * (bar_length - filled)
             
-            print(f"\r  {self.colors.CINZA}[{bar}] {percent}%{self.colors.RESET} {message}", end="")
-            if current >= total:
-                print()  # Nova linha quando completo
\ No newline at end of file
+            # Nova linha quando completo
+            self._write(f"\r  {Colors.CINZA}[{bar}] {percent}%{Colors.RESET} {message}",
+                        end="\n" if current >= total else "")
@@ -6,23 +6,30 @@ Interface visual elegante e sóbria para seleção de aplicações
 import sys
 import tty
 import termios
-import os
-import subprocess
-import re
+import shutil
+import time
 from typing import List, Dict, Optional
-from .logger import Colors
+from .logger import Colors, visible_len
+from .catalog import get_catalog
+from .stats import StatsCollector
+from .screen import ScreenBuffer
+from .viewport import Viewport
+from .search import SearchIndex
+from .keyboard import KeyReader
 
 class InteractiveMenu:
     """Menu TUI profissional com navegação por teclado e visual elegante"""
     
-    def __init__(self, logger, config: dict, mode: str = "local"):
+    def __init__(self, logger, config: dict, mode: str = "local", jobs: int = 4):
         self.logger = logger
         self.config = config
         self.mode = mode
+        self.jobs = jobs
         
         # Estado do menu
-        self.selected_index = 0
         self.selected_items = set()
+        self.jump_buffer = ""
+        self.jump_time = 0.0
         self.search_term = ""
         self.search_mode = False
         
@@ -32,23 +39,45 @@ class InteractiveMenu:
         # Largura do menu (baseado no original)
         self.menu_width = 92
         
-        # Lista de aplicações disponíveis
-        self.apps = [
-            {"id": "docker", "name": "Docker + Swarm", "status": "2/2", "cpu": "0.5%", "mem": "45MB"},
-            {"id": "traefik", "name": "Traefik (SSL)", "status": "2/2", "cpu": "0.3%", "mem": "32MB"},
-            {"id": "portainer", "name": "Portainer", "status": "-", "cpu": "-", "mem": "-"},
-            {"id": "postgres", "name": "PostgreSQL", "status": "2/2", "cpu": "1.2%", "mem": "256MB"},
-            {"id": "redis", "name": "Redis", "status": "-", "cpu": "-", "mem": "-"},
-            {"id": "n8n", "name": "N8N", "status": "2/2", "cpu": "0.8%", "mem": "120MB"},
-            {"id": "chatwoot", "name": "Chatwoot", "status": "-", "cpu": "-", "mem": "-"},
-            {"id": "directus", "name": "Directus", "status": "-", "cpu": "-", "mem": "-"},
-        ]
+        # Lista de aplicações disponíveis (índice do catálogo, sem ler as definições)
+        self.apps = [dict(app, status="-", cpu="-", mem="-") for app in get_catalog().entries()]
+        
+        # Índice de pesquisa montado uma vez; self.view são as apps visíveis após o filtro
+        self.search_index = SearchIndex(self.apps)
+        self.view = list(range(len(self.apps)))
+        
+        # Janela de rolagem (só as linhas visíveis são montadas)
+        self.viewport = Viewport(total=len(self.view))
+        
+        # Colunas STATUS/CPU/MEM vêm do Docker (cache TTL, nunca bloqueia o desenho)
+        self.stats = StatsCollector()
+        self.stats.refresh_async()
         
         # Configurações do terminal
         self.old_settings = None
         
-        # Contador de linhas para redesenho
-        self.last_drawn_lines = 0
+        # Buffer de tela para redesenho diferencial
+        self.screen = ScreenBuffer()
+        self.needs_redraw = False
+        self.drawn_state = None
+        
+        # Intervalo do loop ocioso (atualiza colunas do Docker sem tecla pressionada)
+        self.tick = 0.5
+    
+    @property
+    def selected_index(self) -> int:
+        """Índice do item sob o cursor"""
+        return self.viewport.cursor
+    
+    @selected_index.setter
+    def selected_index(self, index: int):
+        self.viewport.move_to(index)
+    
+    def _current_app(self) -> Optional[Dict]:
+        """App sob o cursor (None se a pesquisa não encontrou nada)"""
+        if not self.view:
+            return None
+        return self.apps[self.view[self.selected_index]]
     
     def run(self):
         """Executa o menu interativo principal"""
@@ -77,60 +106,170 @@ class InteractiveMenu:
         self._draw_menu(first_draw=True)
         
         try:
-            while True:
-                key = self._get_key()
-                
-                if key == 'UP':
-                    if self.selected_index > 0:
-                        self.selected_index -= 1
-                        self._redraw_menu()
-                elif key == 'DOWN':
-                    if self.selected_index < len(self.apps) - 1:
-                        self.selected_index += 1
+            with KeyReader(sys.stdin.fileno()) as reader:
+                while True:
+                    # Espera teclas ou o tick; tudo que chegou é tratado num lote só
+                    keys = reader.read_keys(timeout=self.tick)
+                    if not keys:
+                        # Menu ocioso: novas colunas do Docker ou terminal redimensionado
+                        if self._screen_state() != self.drawn_state:
+                            self.needs_redraw = True
+                    for key in keys:
+                        result = self._handle_key(key)
+                        if result is not None:
+                            return result
+                    # Tecla segurada gera várias teclas por wakeup, mas um único redesenho
+                    if self.needs_redraw:
                         self._redraw_menu()
-                elif key == 'SPACE' or key == 'RIGHT':
-                    # Toggle seleção
-                    current_app = self.apps[self.selected_index]
-                    if current_app['id'] in self.selected_items:
-                        self.selected_items.remove(current_app['id'])
-                    else:
-                        self.selected_items.add(current_app['id'])
-                    self._redraw_menu()
-                elif key.isdigit():
-                    # Seleciona por número
-                    num = int(key) - 1
-                    if 0 <= num < len(self.apps):
-                        self.selected_index = num
-                        self._redraw_menu()
-                elif key == 'ENTER':
-                    # Confirma seleção
-                    if self.selected_items:
-                        return list(self.selected_items)
-                    else:
-                        # Se nada selecionado, seleciona o item atual
-                        current_app = self.apps[self.selected_index]
-                        return [current_app['id']]
-                elif key == 'q' or key == 'Q':
-                    # Sair
-                    return []
                 
         finally:
             self._restore_terminal()
+            self.logger.debug(f"Renderização do menu: {self.screen.stats.summary()}")
+    
+    def _handle_key(self, key: str) -> Optional[List[str]]:
+        """Aplica uma tecla ao estado do menu; devolve a seleção final quando o menu termina"""
+        if not key.isdigit():
+            self.jump_buffer = ""
+        
+        if key == 'UP':
+            if self.selected_index > 0:
+                self.viewport.up()
+                self.needs_redraw = True
+        elif key == 'DOWN':
+            if self.selected_index < len(self.view) - 1:
+                self.viewport.down()
+                self.needs_redraw = True
+        elif key == 'PGUP':
+            self.viewport.page_up()
+            self.needs_redraw = True
+        elif key == 'PGDN':
+            self.viewport.page_down()
+            self.needs_redraw = True
+        elif key == 'HOME':
+            self.viewport.home()
+            self.needs_redraw = True
+        elif key == 'END':
+            self.viewport.end()
+            self.needs_redraw = True
+        elif key == 'SPACE' or key == 'RIGHT':
+            # Toggle seleção
+            current_app = self._current_app()
+            if current_app is None:
+                return None
+            if current_app['id'] in self.selected_items:
+                self.selected_items.remove(current_app['id'])
+            else:
+                self.selected_items.add(current_app['id'])
+            self.needs_redraw = True
+        elif self.search_mode and len(key) == 1 and key.isprintable():
+            # Pesquisando: dígitos e 'q' também são texto da query ("n8n")
+            self._set_search(self.search_term + key)
+        elif key.isdigit():
+            # Seleciona por número (vários dígitos: 1, 12, 123...)
+            if self._jump_to_number(key):
+                self.needs_redraw = True
+        elif key == 'ENTER':
+            # Confirma seleção
+            if self.selected_items:
+                return list(self.selected_items)
+            else:
+                # Se nada selecionado, seleciona o item atual
+                current_app = self._current_app()
+                if current_app is not None:
+                    return [current_app['id']]
+        elif key == 'q' or key == 'Q':
+            # Sair
+            return []
+        elif key == 'BACKSPACE':
+            if self.search_term:
+                self._set_search(self.search_term[:-1])
+        elif key == 'ESC':
+            # ESC limpa a pesquisa
+            if self.search_term:
+                self._set_search("")
+        elif key == 'EOF':
+            # Entrada fechada: nada mais pode ser selecionado
+            return []
+        elif len(key) == 1 and key.isprintable():
+            # Digite para pesquisar
+            self._set_search(self.search_term + key)
+        return None
+    
+    def _set_search(self, term: str):
+        """Atualiza o filtro; cada tecla refina o resultado anterior"""
+        self.search_term = term
+        self.search_mode = bool(term)
+        self.view = self.search_index.search(term)
+        self.viewport.resize(total=len(self.view))
+        self.viewport.home()
+        self.needs_redraw = True
+    
+    def _highlight(self, name: str, color: str) -> str:
+        """Destaca no nome os caracteres que casaram com a pesquisa"""
+        if not self.search_term:
+            return name
+        positions = set(SearchIndex.match_positions(name, self.search_term))
+        if not positions:
+            return name
+        return "".join(
+            f"{self.colors.LARANJA}{self.colors.BOLD}{ch}{self.colors.RESET}{color}" if i in positions else ch
+            for i, ch in enumerate(name)
+        )
+    
+    def _jump_to_number(self, digit: str) -> bool:
+        """Acumula dígitos digitados em sequência e pula para o item com esse número"""
+        now = time.monotonic()
+        if now - self.jump_time > 1.0:
+            self.jump_buffer = ""
+        self.jump_time = now
+        
+        candidate = (self.jump_buffer + digit).lstrip("0")
+        if not candidate or int(candidate) > len(self.view):
+            # Número passou do fim da lista: recomeça a partir deste dígito
+            candidate = digit.lstrip("0")
+        self.jump_buffer = candidate
+        
+        if candidate and 1 <= int(candidate) <= len(self.view):
+            self.selected_index = int(candidate) - 1
+            return True
+        return False
+    
+    def _screen_state(self):
+        """O que, fora as teclas, muda o desenho: coleta do Docker e tamanho do terminal"""
+        self.stats.snapshot()  # dispara nova coleta em segundo plano se o cache venceu
+        return self.stats.version, shutil.get_terminal_size((100, 24))
     
     def _redraw_menu(self):
-        """Redesenha o menu sem limpar input"""
-        # Limpar linhas anteriores
-        for _ in range(self.last_drawn_lines):
-            print(f"\033[1A\033[2K", end="")
-        # Desenhar novo menu
+        """Redesenha o menu repintando só as linhas que mudaram"""
         self._draw_menu()
     
+    def _apply_stats(self, rows):
+        """Atualiza colunas STATUS/CPU/MEM das linhas visíveis a partir do último snapshot do Docker"""
+        snapshot = self.stats.snapshot()
+        for pos in rows:
+            app = self.apps[self.view[pos]]
+            stack = snapshot.get(app['id'])
+            if stack:
+                app.update(stack.columns())
+            else:
+                app.update(status="-", cpu="-", mem="-")
+    
     def _draw_menu(self, first_draw=False):
         """Desenha o menu profissional com largura correta"""
+        self.needs_redraw = False
+        self.drawn_state = self._screen_state()
+        
+        # Linhas fixas: 5 de cabeçalho, 2 de rodapé, 1 de métricas no dev e 1 de folga
+        reserved = 8 + (1 if self.logger.dev else 0)
+        self.viewport.resize(total=len(self.view), height=Viewport.terminal_rows(reserved))
+        rows = self.viewport.visible()
+        self._apply_stats(rows)
+        number_width = len(str(len(self.view)))
         lines = []
         
         if first_draw:
-            lines.append("")  # linha vazia inicial
+            print()  # linha vazia inicial
+            self.screen.reset()
         
         # Header com contador
         selected_count = len(self.selected_items)
@@ -147,7 +286,12 @@ class InteractiveMenu:
         instrucoes = " ↑/↓ navegar · → marcar (●/○) · Enter executar · Digite para pesquisar"
         instrucoes_padding = self.menu_width - len(instrucoes) - 2
         lines.append(f"{self.colors.CINZA}│{self.colors.BEGE}{instrucoes}{' ' * instrucoes_padding}{self.colors.CINZA}│{self.colors.RESET}")
-        lines.append(f"{self.colors.CINZA}│{' ' * (self.menu_width - 2)}│{self.colors.RESET}")
+        if self.search_mode:
+            pesquisa = f" Pesquisa: {self.search_term}▏ ({len(self.view)} encontradas · Backspace apaga)"
+            pesquisa = pesquisa[:self.menu_width - 2]
+            lines.append(f"{self.colors.CINZA}│{self.colors.BRANCO}{pesquisa:<{self.menu_width - 2}}{self.colors.CINZA}│{self.colors.RESET}")
+        else:
+            lines.append(f"{self.colors.CINZA}│{' ' * (self.menu_width - 2)}│{self.colors.RESET}")
         
         # Cabeçalho da tabela
         header_text = " APLICAÇÃO" + " " * 50 + "STATUS    CPU     MEM"
@@ -155,8 +299,12 @@ class InteractiveMenu:
         lines.append(f"{self.colors.CINZA}│{self.colors.BRANCO}{header_text}{' ' * header_padding}{self.colors.CINZA}│{self.colors.RESET}")
         lines.append(f"{self.colors.CINZA}│{' ' * (self.menu_width - 2)}│{self.colors.RESET}")
         
-        # Lista de aplicações
-        for i, app in enumerate(self.apps):
+        # Lista de aplicações (apenas a janela visível)
+        if not self.view:
+            vazio = f" Nenhuma aplicação encontrada para \"{self.search_term}\""[:self.menu_width - 2]
+            lines.append(f"{self.colors.CINZA}│{vazio:<{self.menu_width - 2}}│{self.colors.RESET}")
+        for i in rows:
+            app = self.apps[self.view[i]]
             # É o item com cursor?
             is_current = i == self.selected_index
             
@@ -179,7 +327,7 @@ class InteractiveMenu:
                 text_color = self.colors.CINZA
             
             # Número do item
-            item_number = f"[{i + 1:1d}]"
+            item_number = f"[{i + 1:>{number_width}d}]"
             
             # Nome da aplicação (limitado a 40 chars)
             name = app['name']
@@ -190,6 +338,7 @@ class InteractiveMenu:
             # Total de espaço para aplicação: 60 chars
             app_section = f"{cursor}{symbol} {item_number} {name}"
             padding_to_status = 60 - len(app_section)
+            name = self._highlight(name, self.colors.VERDE if is_selected else text_color)
             
             # Status com cor apropriada
             if app['status'] != '-':
@@ -224,22 +373,26 @@ class InteractiveMenu:
                 line_content = f"{self.colors.CINZA}{cursor}{symbol} {item_number} {name}{' ' * padding_to_status}{self.colors.RESET}{status_str}{cpu_str}{mem_str}"
             
             # Calcular padding final
-            clean_line = re.sub(r'\033\[[0-9;]*m', '', line_content)
-            final_padding = self.menu_width - len(clean_line) - 2
+            final_padding = self.menu_width - visible_len(line_content) - 2
             
             lines.append(f"{self.colors.CINZA}│{self.colors.RESET}{line_content}{' ' * final_padding}{self.colors.CINZA}│{self.colors.RESET}")
         
-        # Footer
-        lines.append(f"{self.colors.CINZA}│{' ' * (self.menu_width - 2)}│{self.colors.RESET}")
+        # Footer (com posição da janela quando a lista não cabe na tela)
+        if len(rows) < len(self.view):
+            position = f"{rows.start + 1}-{rows.stop} de {len(self.view)} · PgUp/PgDn · Home/End "
+            lines.append(f"{self.colors.CINZA}│{position:>{self.menu_width - 2}}│{self.colors.RESET}")
+        else:
+            lines.append(f"{self.colors.CINZA}│{' ' * (self.menu_width - 2)}│{self.colors.RESET}")
+        if self.logger.dev:
+            # Métricas do frame anterior (modo dev)
+            stats = self.screen.stats
+            dev_text = f" frame {stats.frames}: {stats.last_ms:.3f} ms · {stats.last_bytes} bytes · total {stats.bytes} bytes"
+            lines.append(f"{self.colors.CINZA}│{dev_text[:self.menu_width - 2]:<{self.menu_width - 2}}│{self.colors.RESET}")
         footer_line = "─" * (self.menu_width - 2)
         lines.append(f"{self.colors.CINZA}╰{footer_line}╯{self.colors.RESET}")
         
-        # Imprimir tudo de uma vez
-        for line in lines:
-            print(line)
-        
-        # Atualiza contador de linhas desenhadas
-        self.last_drawn_lines = len(lines)
+        # Um único write por frame, só com as linhas alteradas
+        self.screen.render(lines)
     
     def _setup_terminal(self):
         """Configura terminal para captura de teclas"""
@@ -251,39 +404,27 @@ class InteractiveMenu:
         if self.old_settings:
             termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self.old_settings)
     
-    def _get_key(self) -> str:
-        """Captura tecla pressionada"""
-        key = sys.stdin.read(1)
-        
-        # Detecta sequências escape (setas)
-        if key == '\x1b':
-            key2 = sys.stdin.read(1)
-            if key2 == '[':
-                key3 = sys.stdin.read(1)
-                if key3 == 'A':
-                    return 'UP'
-                elif key3 == 'B':
-                    return 'DOWN'
-                elif key3 == 'C':
-                    return 'RIGHT'
-                elif key3 == 'D':
-                    return 'LEFT'
-        
-        # Outras teclas
-        if key == ' ':
-            return 'SPACE'
-        elif key == '\r' or key == '\n':
-            return 'ENTER'
-        
-        return key
+    def _failure_lines(self, selected: List[str], results: Dict[str, str]) -> List[str]:
+        """Apps que não foram instaladas, com o motivo dado pelo agendador"""
+        reasons = {"failed": "falhou", "skipped": "pulada: uma dependência falhou"}
+        names = {app['id']: app['name'] for app in self.apps}
+        lines = []
+        for app_id in selected:
+            status = results.get(app_id)
+            if status == "done":
+                continue
+            # Sem resultado: a instalação parou antes do agendador (verificação do servidor)
+            reason = reasons.get(status, "não instalada")
+            lines.append(f"  {self.colors.VERMELHO}✗{self.colors.RESET} {names.get(app_id, app_id)} "
+                         f"{self.colors.CINZA}- {reason}{self.colors.RESET}")
+        return lines
     
     def _confirm_and_install(self, selected: List[str]):
         """Confirma e instala aplicações selecionadas com visual profissional"""
         self._restore_terminal()
         
         # Limpar menu anterior
-        for _ in range(self.last_drawn_lines):
-            print(f"\033[1A\033[2K", end="")
+        self.screen.clear()
         
         # Importar BoxDrawer para boxes profissionais
         from .logger import BoxDrawer
@@ -310,33 +451,23 @@ class InteractiveMenu:
         except KeyboardInterrupt:
             return
         
-        # Conta total de passos para progress
-        total_steps = len(selected) + 3  # Apps + validação + finalização
-        self.logger.start_progress(total_steps)
-        
-        # Instalação com progress real
-        self.logger.section("INSTALANDO APLICAÇÕES")
-        
-        self.logger.success("Verificando sistema operacional")
-        import time
-        time.sleep(0.5)
-        
-        self.logger.success("Verificando Docker")
-        time.sleep(0.5)
-        
-        for app_id in selected:
-            app = next((a for a in self.apps if a['id'] == app_id), None)
-            if app:
-                self.logger.success(f"Instalando {app['name']}")
-                time.sleep(1)  # TODO: Implementar instalação real
-        
-        self.logger.success("Finalizando instalação")
+        # Instalação paralela respeitando dependências
+        from .installer import Installer
+        installer = Installer(self.logger, self.config, self.mode, jobs=self.jobs)
+        ok = installer.install(selected)
         
         # Box de conclusão
         print(f"\n{self.colors.CINZA}{box.top()}{self.colors.RESET}")
         print(f"{self.colors.CINZA}{box.empty()}{self.colors.RESET}")
-        success_msg = f"{self.colors.VERDE}{self.colors.BOLD}✓ INSTALAÇÃO CONCLUÍDA!{self.colors.RESET}"
-        print(f"{self.colors.CINZA}{box.line_centered(success_msg)}{self.colors.RESET}")
+        if ok:
+            success_msg = f"{self.colors.VERDE}{self.colors.BOLD}✓ INSTALAÇÃO CONCLUÍDA!{self.colors.RESET}"
+            print(f"{self.colors.CINZA}{box.line_centered(success_msg)}{self.colors.RESET}")
+        else:
+            error_msg = f"{self.colors.VERMELHO}{self.colors.BOLD}✗ INSTALAÇÃO NÃO CONCLUÍDA{self.colors.RESET}"
+            print(f"{self.colors.CINZA}{box.line_centered(error_msg)}{self.colors.RESET}")
+            print(f"{self.colors.CINZA}{box.empty()}{self.colors.RESET}")
+            for line in self._failure_lines(selected, installer.results):
+                print(f"{self.colors.CINZA}{box.line_left(line, 4)}{self.colors.RESET}")
         print(f"{self.colors.CINZA}{box.empty()}{self.colors.RESET}")
         print(f"{self.colors.CINZA}{box.bottom()}{self.colors.RESET}")
         
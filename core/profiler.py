@@ -0,0 +1,233 @@
+"""
+Perfil de Execução - LivChat Setup v0.1
+Spans de tempo aninhados para cada fase (config, catálogo, render, pull,
+deploy, prontidão, comandos remotos), ligados com --profile
+
+- span(nome, app=..., host=...) mede um bloco; spans abertos dentro dele na
+  mesma thread herdam app/instância/host
+- desligado (padrão), span() devolve um contexto vazio compartilhado: custo
+  de uma chamada de função
+- no fim: box com as fases mais lentas e arquivo de trace no formato Chrome
+  (trace events), que abre no Perfetto (ui.perfetto.dev) ou em chrome://tracing
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+
+# os.path em vez de pathlib: load_config() importa este módulo em todo comando
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES_DIR = os.path.join(BASE_DIR, ".cache", "profiles")
+
+# Campos herdados pelos spans filhos (atribuição por app e por host)
+INHERITED = ("app", "instance", "host")
+# Linhas na box de fases mais lentas
+SUMMARY_ROWS = 12
+
+
+class _NullSpan:
+    """Contexto vazio usado quando o perfil está desligado"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+_active: Optional["Profiler"] = None
+
+
+class SpanRecord:
+    """Span concluído"""
+
+    __slots__ = ("name", "start", "seconds", "thread", "args")
+
+    def __init__(self, name: str, start: float, seconds: float, thread: int, args: Dict):
+        self.name = name
+        self.start = start
+        self.seconds = seconds
+        self.thread = thread
+        self.args = args
+
+    @property
+    def owner(self) -> str:
+        """app@host (ou imagem@host) de quem gastou o tempo, para a box"""
+        args = self.args
+        subject = args.get("app") or args.get("image") or args.get("stack")
+        return "@".join(str(part) for part in (subject, args.get("host")) if part)
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "args", "start")
+
+    def __init__(self, profiler: "Profiler", name: str, args: Dict):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        stack = self.profiler._stack()
+        if stack:
+            parent = stack[-1].args
+            for key in INHERITED:
+                if key in parent and key not in self.args:
+                    self.args[key] = parent[key]
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        self.profiler._stack().pop()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.profiler._add(self.name, self.start, seconds, self.args)
+        return False
+
+
+class Profiler:
+    """Coleta spans de todas as threads do processo"""
+
+    def __init__(self, label: str = "setup.py"):
+        self.label = label
+        self.origin = time.perf_counter()
+        self.spans: List[SpanRecord] = []
+        self.thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _add(self, name: str, start: float, seconds: float, args: Dict):
+        thread = threading.get_ident()
+        with self._lock:
+            if thread not in self.thread_names:
+                self.thread_names[thread] = threading.current_thread().name
+            self.spans.append(SpanRecord(name, start, seconds, thread, args))
+
+    def span(self, name: str, args: Dict) -> _Span:
+        return _Span(self, name, args)
+
+    def add(self, name: str, seconds: float, args: Dict):
+        """Span que acabou agora e durou `seconds` (medido em outro lugar, ex.: no servidor)"""
+        stack = self._stack()
+        if stack:
+            for key in INHERITED:
+                if key in stack[-1].args and key not in args:
+                    args[key] = stack[-1].args[key]
+        self._add(name, time.perf_counter() - seconds, seconds, args)
+
+    # ===== Resultados =====
+
+    def phases(self) -> List[Dict]:
+        """Tempo por fase (nome do span), da mais lenta para a mais rápida"""
+        by_name: Dict[str, Dict] = {}
+        for record in self.spans:
+            phase = by_name.setdefault(record.name, {"name": record.name, "count": 0, "total": 0.0,
+                                                     "max": 0.0, "slowest": ""})
+            phase["count"] += 1
+            phase["total"] += record.seconds
+            if record.seconds >= phase["max"]:
+                phase["max"] = record.seconds
+                phase["slowest"] = record.owner
+        return sorted(by_name.values(), key=lambda phase: phase["total"], reverse=True)
+
+    def chrome_trace(self) -> Dict:
+        """Trace events (formato JSON do Chrome), com spans completos ("X") em microssegundos"""
+        pid = os.getpid()
+        tids = {thread: index for index, thread in enumerate(self.thread_names, 1)}
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.label}}]
+        events += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tids[thread], "args": {"name": name}}
+                   for thread, name in self.thread_names.items()]
+        for record in sorted(self.spans, key=lambda r: r.start):
+            events.append({
+                "name": record.name,
+                "cat": record.name.split(".")[0],
+                "ph": "X",
+                "ts": round((record.start - self.origin) * 1e6, 3),
+                "dur": round(record.seconds * 1e6, 3),
+                "pid": pid,
+                "tid": tids[record.thread],
+                "args": record.args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str = None) -> str:
+        """Grava o trace (padrão: .cache/profiles/<comando>-<data>.json)"""
+        if not path:
+            command = self.label.split()[-1] if " " in self.label else "setup"
+            path = os.path.join(PROFILES_DIR, f"{command}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False, separators=(",", ":"), default=str)
+        return path
+
+
+# ===== API do módulo =====
+
+def span(name: str, **args):
+    """Mede o bloco `with` quando o perfil está ligado (senão não faz nada)"""
+    profiler = _active
+    if profiler is None:
+        return _NULL_SPAN
+    return profiler.span(name, args)
+
+
+def add_span(name: str, seconds: float, **args):
+    """Registra um span medido em outro lugar que acabou agora"""
+    profiler = _active
+    if profiler is not None:
+        profiler.add(name, seconds, args)
+
+
+def enable(label: str = "setup.py") -> Profiler:
+    global _active
+    _active = Profiler(label)
+    return _active
+
+
+def disable() -> Optional[Profiler]:
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def print_summary(logger, profiler: Profiler, wall: float, trace_path: str = None):
+    """Box com as fases mais lentas (o span raiz, do comando inteiro, é o total)"""
+    from .logger import BoxDrawer
+
+    colors = logger.colors
+    box = BoxDrawer(103)
+    phases = [phase for phase in profiler.phases() if phase["name"] != profiler.label]
+
+    print(f"\n{colors.CINZA}{box.top()}{colors.RESET}")
+    print(box.line_centered(f"{colors.BRANCO}FASES MAIS LENTAS ({wall:.2f}s no total){colors.RESET}"))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+    print(box.line_left(f"{colors.CINZA}{'FASE':<26}{'VEZES':>6}{'TOTAL':>10}{'%':>6}{'MÁXIMO':>10}  MAIS LENTO{colors.RESET}"))
+    for phase in phases[:SUMMARY_ROWS]:
+        share = phase["total"] / wall * 100 if wall > 0 else 0.0
+        line = (f"{colors.BRANCO}{phase['name'][:25]:<26}{colors.RESET}"
+                f"{phase['count']:>6}{phase['total']:>9.2f}s{share:>5.0f}%{phase['max']:>9.2f}s  "
+                f"{colors.CINZA}{phase['slowest'][:30]}{colors.RESET}")
+        print(box.line_left(line))
+    if not phases:
+        print(box.line_left(f"{colors.CINZA}nenhuma fase medida{colors.RESET}"))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+    footer = f"{colors.CINZA}{len(profiler.spans)} spans · fases em paralelo somam mais que o total{colors.RESET}"
+    print(box.line_centered(footer))
+    if trace_path is not None:
+        print(box.line_centered(f"{colors.CINZA}trace: {trace_path}{colors.RESET}"))
+    print(f"{colors.CINZA}{box.bottom()}{colors.RESET}")
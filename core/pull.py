@@ -0,0 +1,276 @@
+"""
+Pré-download de Imagens - LivChat Setup v0.1
+Baixa todas as imagens das aplicações selecionadas em segundo plano, enquanto
+a instalação faz as verificações do servidor e renderiza os stacks
+
+- referências equivalentes (nginx, nginx:latest, docker.io/library/nginx)
+  viram um único download
+- no máximo `workers` downloads ao mesmo tempo
+- local: Docker API (/images/create), com progresso em bytes somado por
+  camada (camadas compartilhadas entre imagens contam uma vez)
+- local: credenciais do `docker login` (~/.docker/config.json: auths,
+  credHelpers/credsStore) vão em X-Registry-Auth, então registries privados
+  também são baixados antecipadamente
+- remoto: `docker pull` por canal SSH, com progresso por imagem (o CLI do
+  servidor usa o próprio login)
+- falha no download não interrompe a instalação: o deploy tenta de novo
+"""
+
+import os
+import json
+import time
+import shlex
+import base64
+import threading
+import subprocess
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .docker_api import DockerError, split_ref
+from .profiler import span
+from .stats import format_mem
+
+DEFAULT_REGISTRY = "docker.io"
+# Endereço com que o `docker login` grava as credenciais do Docker Hub
+INDEX_SERVER = "https://index.docker.io/v1/"
+# Downloads simultâneos: o daemon já paraleliza camadas de cada imagem
+PULL_WORKERS = 3
+PULL_TIMEOUT = 1800
+# Mensagens de /images/create que descrevem o estado de uma camada
+LAYER_STATUS = ("Downloading", "Download complete", "Pull complete", "Already exists")
+
+
+def canonical_ref(ref: str) -> str:
+    """Forma canônica para deduplicar: registry/repositório:tag (ou @digest)"""
+    name, tag = split_ref(ref)
+    digest = None
+    if "@" in name:
+        name, _, digest = name.partition("@")
+    first, sep, rest = name.partition("/")
+    if not sep or ("." not in first and ":" not in first and first != "localhost"):
+        name = f"{DEFAULT_REGISTRY}/{name}"
+    if name.startswith(f"{DEFAULT_REGISTRY}/") and name.count("/") == 1:
+        name = f"{DEFAULT_REGISTRY}/library/{name.split('/', 1)[1]}"
+    return f"{name}@{digest}" if digest else f"{name}:{tag}"
+
+
+def unique_refs(refs: Iterable[str]) -> List[str]:
+    """Uma referência por imagem canônica, na ordem em que apareceram"""
+    seen = {}
+    for ref in refs:
+        seen.setdefault(canonical_ref(ref), ref)
+    return list(seen.values())
+
+
+def registry_host(ref: str) -> str:
+    """Registry de uma referência (docker.io para imagens do Docker Hub)"""
+    return canonical_ref(ref).split("/", 1)[0]
+
+
+def _normalize_registry(address: str) -> str:
+    """Chave de ~/.docker/config.json -> host (https://index.docker.io/v1/ -> docker.io)"""
+    host = address.split("://", 1)[-1].split("/", 1)[0]
+    return DEFAULT_REGISTRY if host in ("index.docker.io", "registry-1.docker.io") else host
+
+
+def _credential_helper(helper: str, server: str) -> Optional[Dict]:
+    """Pergunta ao docker-credential-<helper> (pass, secretservice, ecr-login...)"""
+    try:
+        result = subprocess.run([f"docker-credential-{helper}", "get"], input=server.encode(),
+                                capture_output=True, timeout=10)
+        data = json.loads(result.stdout) if result.returncode == 0 else None
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+    if not data or not data.get("Secret"):
+        return None
+    if data.get("Username") == "<token>":
+        return {"identitytoken": data["Secret"], "serveraddress": server}
+    return {"username": data.get("Username"), "password": data["Secret"], "serveraddress": server}
+
+
+def registry_auth(host: str, config_path: str = None) -> Optional[Dict]:
+    """
+    Credenciais do `docker login` para o registry (None: download anônimo).
+    Mesma ordem do CLI: credHelpers do host, credsStore, auths do arquivo.
+    """
+    if config_path is None:
+        config_dir = os.environ.get("DOCKER_CONFIG") or os.path.expanduser("~/.docker")
+        config_path = os.path.join(config_dir, "config.json")
+    try:
+        with open(config_path) as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    server = INDEX_SERVER if host == DEFAULT_REGISTRY else host
+    helpers = {_normalize_registry(key): value for key, value in (config.get("credHelpers") or {}).items()}
+    for helper in (helpers.get(host), config.get("credsStore")):
+        if helper:
+            auth = _credential_helper(helper, server)
+            if auth:
+                return auth
+
+    for key, entry in (config.get("auths") or {}).items():
+        if _normalize_registry(key) != host or not isinstance(entry, dict):
+            continue
+        if entry.get("identitytoken"):
+            return {"identitytoken": entry["identitytoken"], "serveraddress": server}
+        if entry.get("auth"):
+            try:
+                username, _, password = base64.b64decode(entry["auth"]).decode().partition(":")
+            except ValueError:
+                return None
+            return {"username": username, "password": password, "serveraddress": server}
+    return None
+
+
+class PullResult:
+    """Resultado do download de uma imagem"""
+
+    __slots__ = ("ref", "ok", "seconds", "detail")
+
+    def __init__(self, ref: str, ok: bool, seconds: float, detail: str = ""):
+        self.ref = ref
+        self.ok = ok
+        self.seconds = seconds
+        self.detail = detail
+
+
+class _Puller:
+    """Base: fila limitada de downloads em segundo plano e espera com progresso"""
+
+    def __init__(self, workers: int = PULL_WORKERS):
+        self.workers = max(1, workers)
+        self.refs: List[str] = []
+        self.results: Dict[str, PullResult] = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self.started_at = 0.0
+        self.host = "local"
+
+    def start(self, refs: Iterable[str]):
+        """Dispara os downloads e volta na hora"""
+        self.refs = unique_refs(refs)
+        self.started_at = time.monotonic()
+        if not self.refs:
+            self._done.set()
+            return self
+        # Threads daemon: se a instalação parar antes, o processo não fica preso nos downloads
+        for ref in self.refs:
+            threading.Thread(target=self._run, args=(ref,), name="pull", daemon=True).start()
+        return self
+
+    def _run(self, ref: str):
+        with self._slots, span("pull", image=ref, host=self.host):
+            start = time.monotonic()
+            try:
+                if self._cancelled.is_set():
+                    raise RuntimeError("cancelado")
+                self._pull(ref)
+                result = PullResult(ref, True, time.monotonic() - start)
+            except Exception as e:  # qualquer falha vira aviso; o deploy tenta baixar de novo
+                result = PullResult(ref, False, time.monotonic() - start, str(e))
+        with self._lock:
+            self.results[ref] = result
+            if len(self.results) == len(self.refs):
+                self._done.set()
+
+    def _pull(self, ref: str):
+        raise NotImplementedError
+
+    def cancel(self):
+        """Desiste dos downloads: os da fila nem começam e os da API param no próximo evento"""
+        self._cancelled.set()
+
+    def progress(self):
+        """(atual, total, mensagem) para Logger.progress_bar"""
+        with self._lock:
+            done = len(self.results)
+        return done, len(self.refs), f"{done}/{len(self.refs)} imagens"
+
+    def wait(self, on_progress: Callable[[int, int, str], None] = None, interval: float = 0.2,
+             timeout: float = PULL_TIMEOUT) -> Dict[str, PullResult]:
+        """Bloqueia até todos os downloads terminarem, informando o progresso"""
+        deadline = time.monotonic() + timeout
+        while not self._done.wait(interval):
+            if on_progress:
+                on_progress(*self.progress())
+            if time.monotonic() >= deadline:
+                break
+        if on_progress and self.refs:
+            _, total, message = self.progress()
+            on_progress(total, total, message)  # fecha a linha da barra
+        with self._lock:
+            results = dict(self.results)
+        for ref in self.refs:
+            results.setdefault(ref, PullResult(ref, False, time.monotonic() - self.started_at, "tempo esgotado"))
+        return results
+
+
+class ImagePuller(_Puller):
+    """Downloads pela Docker API local, com progresso em bytes"""
+
+    def __init__(self, client, workers: int = PULL_WORKERS, docker_config: str = None):
+        """
+        Args:
+            docker_config: config.json do CLI com os logins (padrão: ~/.docker/config.json)
+        """
+        super().__init__(workers)
+        self.client = client
+        self.docker_config = docker_config
+        self._layers: Dict[str, List[int]] = {}  # camada -> [baixado, total]
+        self._auths: Dict[str, Optional[Dict]] = {}  # registry -> credenciais (lidas uma vez)
+        self._auth_lock = threading.Lock()  # helper pode demorar: não segura o lock do progresso
+
+    def _auth(self, ref: str) -> Optional[Dict]:
+        host = registry_host(ref)
+        with self._auth_lock:
+            if host not in self._auths:
+                self._auths[host] = registry_auth(host, self.docker_config)
+            return self._auths[host]
+
+    def _pull(self, ref: str):
+        for event in self.client.pull(ref, auth=self._auth(ref)):
+            if self._cancelled.is_set():
+                raise RuntimeError("cancelado")
+            if event.get("error"):
+                raise DockerError(event["error"])
+            status = event.get("status", "")
+            if status not in LAYER_STATUS or not event.get("id"):
+                continue
+            detail = event.get("progressDetail") or {}
+            with self._lock:
+                entry = self._layers.setdefault(event["id"], [0, 0])
+                if status == "Downloading":
+                    entry[0], entry[1] = detail.get("current", 0), detail.get("total", entry[1])
+                else:
+                    entry[0] = entry[1]  # camada pronta (ou já existia: 0 de 0)
+
+    def progress(self):
+        with self._lock:
+            done = len(self.results)
+            current = sum(layer[0] for layer in self._layers.values())
+            total = sum(layer[1] for layer in self._layers.values())
+        message = f"{done}/{len(self.refs)} imagens"
+        if total > 1024 * 1024:
+            message += f" · {format_mem(current)}/{format_mem(total)}"
+            # Camadas ainda sem tamanho conhecido seguram a barra abaixo de 100%
+            return min(current, total - 1) if done < len(self.refs) else total, total, message
+        return done, len(self.refs), message
+
+
+class RemotePuller(_Puller):
+    """Downloads no servidor, um `docker pull` por canal da conexão SSH do pool"""
+
+    def __init__(self, pool, server, workers: int = PULL_WORKERS):
+        super().__init__(workers)
+        self.pool = pool
+        self.server = server
+        self.host = server.name
+
+    def _pull(self, ref: str):
+        result = self.pool.run(self.server, f"docker pull -q {shlex.quote(ref)}", timeout=PULL_TIMEOUT)
+        if not result.ok:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip()
+                               else f"docker pull retornou {result.code}")
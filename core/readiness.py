@@ -0,0 +1,231 @@
+"""
+Prontidão - LivChat Setup v0.1
+Espera os serviços de um stack convergirem (réplicas + healthcheck) antes de
+liberar as aplicações que dependem dele
+
+- uma única assinatura de /events (service/container) acorda só os stacks
+  afetados por cada evento; a verificação é feita na hora
+- sem fluxo de eventos (daemon antigo, conexão caiu) cai para polling com
+  backoff exponencial
+- vários stacks podem ser esperados ao mesmo tempo, cada um com seu timeout
+- serviço em rolling update (UpdateStatus) não está pronto mesmo com as
+  réplicas rodando (podem ser as da versão antiga); update revertido falha
+  na hora, sem esperar o timeout
+"""
+
+import time
+import calendar
+import threading
+from typing import Dict, List, Optional
+
+from .docker_api import DockerClient, DockerError
+from .stats import STACK_LABEL
+
+SERVICE_LABEL = "com.docker.swarm.service.name"
+
+# Polling (sem eventos): começa rápido e desacelera até POLL_MAX
+POLL_MIN = 0.25
+POLL_MAX = 4.0
+# Com eventos, uma verificação de segurança a cada SAFETY_CHECK segundos
+SAFETY_CHECK = 10.0
+
+# Estado da verificação de um stack
+READY, PENDING, FAILED = "ready", "pending", "failed"
+# UpdateStatus.State: ainda convergindo / update revertido pelo swarm
+UPDATE_PENDING = ("updating", "paused", "rollback_started", "rollback_paused")
+UPDATE_FAILED = ("rollback_completed",)
+
+
+class ReadyResult:
+    """Resultado da espera de um stack"""
+
+    __slots__ = ("stack", "ready", "seconds", "detail", "checks", "failed")
+
+    def __init__(self, stack: str, ready: bool, seconds: float, detail: str, checks: int,
+                 failed: bool = False):
+        self.stack = stack
+        self.ready = ready
+        self.seconds = seconds
+        self.detail = detail
+        self.checks = checks
+        self.failed = failed  # o swarm reverteu o update (não adianta esperar)
+
+
+class _Waiter:
+    __slots__ = ("stack", "wake")
+
+    def __init__(self, stack: str):
+        self.stack = stack
+        self.wake = threading.Event()
+
+
+def _before(timestamp: Optional[str], since: Optional[float]) -> bool:
+    """O horário RFC 3339 do Docker (ex.: 2024-05-01T12:00:00.123456789Z) é anterior a since?"""
+    if not timestamp or since is None:
+        return False
+    try:
+        seconds = calendar.timegm(time.strptime(timestamp[:19], "%Y-%m-%dT%H:%M:%S"))
+    except ValueError:
+        return False
+    return seconds < int(since)
+
+
+class ReadinessMonitor:
+    """Espera stacks ficarem prontos, acordando por evento do Docker"""
+
+    def __init__(self, client: DockerClient = None):
+        self.client = client or DockerClient()
+        self._lock = threading.Lock()
+        self._waiters: List[_Waiter] = []
+        self._events_thread: Optional[threading.Thread] = None
+        self._events_conn = None
+        self._events_ok = False
+        self._closed = False
+        self.events_seen = 0
+
+    # ===== Espera =====
+
+    def wait_stack(self, stack: str, timeout: float = 300.0) -> ReadyResult:
+        """
+        Bloqueia até todos os serviços do stack terem as réplicas desejadas
+        rodando, nenhum rolling update em andamento e nenhum container em
+        "health: starting"/"unhealthy"
+        """
+        since = time.time()
+        start = time.monotonic()
+        deadline = start + timeout
+        waiter = _Waiter(stack)
+        with self._lock:
+            self._waiters.append(waiter)
+        self._ensure_events()
+
+        checks = 0
+        delay = POLL_MIN
+        try:
+            while True:
+                waiter.wake.clear()
+                checks += 1
+                state, detail = self.check_stack(stack, since)
+                if state == READY:
+                    return ReadyResult(stack, True, time.monotonic() - start, detail, checks)
+                if state == FAILED:
+                    return ReadyResult(stack, False, time.monotonic() - start, detail, checks, failed=True)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return ReadyResult(stack, False, time.monotonic() - start, f"timeout: {detail}", checks)
+
+                if self._events_ok:
+                    # Evento do stack acorda na hora; a verificação periódica cobre eventos perdidos
+                    waiter.wake.wait(min(remaining, SAFETY_CHECK))
+                    delay = POLL_MIN
+                else:
+                    waiter.wake.wait(min(remaining, delay))
+                    delay = min(POLL_MAX, delay * 2)
+        finally:
+            with self._lock:
+                self._waiters.remove(waiter)
+
+    def check_stack(self, stack: str, since: float = None):
+        """
+        (READY/PENDING/FAILED, detalhe) do estado atual do stack
+
+        Args:
+            since: início da espera (epoch); reversões concluídas antes disso
+                são de um deploy anterior e não contam como falha
+        """
+        try:
+            services = self.client.services({"label": [f"{STACK_LABEL}={stack}"]}) or []
+        except DockerError as e:
+            return PENDING, str(e)
+        if not services:
+            return PENDING, "nenhum serviço criado ainda"
+
+        pending = []
+        for service in services:
+            name = service["Spec"]["Name"]
+            update = service.get("UpdateStatus") or {}
+            update_state = update.get("State")
+            if update_state in UPDATE_FAILED and not _before(update.get("CompletedAt"), since):
+                message = update.get("Message") or "update revertido"
+                return FAILED, f"{name}: {message}"
+            if update_state in UPDATE_PENDING:
+                pending.append(f"{name} {update_state}")
+                continue
+            status = service.get("ServiceStatus") or {}
+            running = status.get("RunningTasks", 0)
+            desired = status.get("DesiredTasks", 0)
+            if running < desired:
+                pending.append(f"{name} {running}/{desired}")
+        if pending:
+            return PENDING, ", ".join(pending)
+
+        try:
+            containers = self.client.containers({"label": [f"{STACK_LABEL}={stack}"]}) or []
+        except DockerError as e:
+            return PENDING, str(e)
+        for container in containers:
+            state = container.get("Status", "")
+            if "health: starting" in state or "unhealthy" in state:
+                name = (container.get("Labels") or {}).get(SERVICE_LABEL, container.get("Id", "")[:12])
+                return PENDING, f"{name} {state.split('(')[-1].rstrip(')')}"
+
+        return READY, f"{len(services)} serviços prontos"
+
+    # ===== Eventos =====
+
+    def _ensure_events(self):
+        with self._lock:
+            if self._closed or (self._events_thread and self._events_thread.is_alive()):
+                return
+            self._events_thread = threading.Thread(target=self._watch_events, name="docker-events", daemon=True)
+            self._events_thread.start()
+
+    def _watch_events(self):
+        filters = {"type": ["service", "container"]}
+
+        def connected(conn):
+            self._events_conn = conn
+            self._events_ok = True
+            self._wake_all()  # algo pode ter mudado antes da assinatura
+
+        try:
+            for event in self.client.events(filters, on_connect=connected):
+                self.events_seen += 1
+                self._dispatch(event)
+                with self._lock:
+                    if not self._waiters or self._closed:
+                        break
+        except DockerError:
+            pass
+        finally:
+            # Sem eventos: quem estiver esperando passa para o polling com backoff
+            self._events_ok = False
+            self._events_conn = None
+            self._wake_all()
+
+    def _dispatch(self, event: Dict):
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        stack = attributes.get(STACK_LABEL)
+        service = attributes.get(SERVICE_LABEL) or (attributes.get("name") if event.get("Type") == "service" else None)
+        with self._lock:
+            waiters = list(self._waiters)
+        for waiter in waiters:
+            if stack == waiter.stack or (service and service.startswith(f"{waiter.stack}_")):
+                waiter.wake.set()
+
+    def _wake_all(self):
+        with self._lock:
+            waiters = list(self._waiters)
+        for waiter in waiters:
+            waiter.wake.set()
+
+    def close(self):
+        """Encerra a assinatura de eventos"""
+        self._closed = True
+        conn = self._events_conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(2)
+            except OSError:
+                pass
@@ -0,0 +1,284 @@
+"""
+Renderização de Stacks - LivChat Setup v0.1
+Gera os arquivos de stack do Swarm a partir dos templates Jinja2
+
+- Um Environment compartilhado por processo, com bytecode cache em disco
+- Resultado memorizado por hash de (template, variáveis resolvidas): reinstalar
+  uma instância sem mudanças não executa nenhum template (nem importa o jinja2)
+- Lotes de instâncias podem ser renderizados em paralelo (processos)
+- Os arquivos gerados levam senhas: são gravados 0600 em diretórios 0700, e
+  resultados sem uso há RENDERED_MAX_AGE são apagados
+"""
+
+import os
+import json
+import time
+import hashlib
+import secrets as token
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = BASE_DIR / "templates"
+CACHE_DIR = BASE_DIR / ".cache"
+BUNDLES_DIR = CACHE_DIR / "stacks"
+
+# Segredos gerados na primeira instalação quando não existem na configuração
+SECRET_KEYS = ("postgres_password", "encryption_key")
+
+# Resultados memorizados sem uso há mais que isso são apagados (cada mudança de
+# variável gera um novo, com as senhas da época)
+RENDERED_MAX_AGE = 30 * 24 * 3600
+
+
+def stack_name(app_id: str, instance: str = "default") -> str:
+    """Nome do stack no Swarm: n8n, n8n_dev, n8n_prod..."""
+    return app_id if instance in (None, "", "default") else f"{app_id}_{instance}"
+
+
+def ensure_secrets(config: Dict) -> Dict:
+    """Gera (uma vez) os segredos compartilhados que ainda não existem na configuração"""
+    app_secrets = config.setdefault("secrets", {})
+    for key in SECRET_KEYS:
+        if not app_secrets.get(key):
+            app_secrets[key] = token.token_hex(16)
+    return app_secrets
+
+
+def resolve_variables(definition: Dict, config: Dict, instance: str = "default") -> Dict:
+    """
+    Variáveis finais de um template: definição da app + configuração global
+    + dados da instância. O resultado é determinístico para a mesma entrada.
+    """
+    glob = config.get("global", {})
+    variables = dict(definition.get("variables") or {})
+    stack = stack_name(definition["id"], instance)
+
+    subdomain = variables.pop("subdomain", definition["id"])
+    if stack != definition["id"]:
+        subdomain = f"{subdomain}-{instance}"
+    domain = glob.get("domain", "")
+
+    resolved = {
+        "app": definition["id"],
+        "instance": instance,
+        "stack": stack,
+        "images": definition.get("images") or [],
+        "ports": definition.get("ports") or [],
+        "resources": definition.get("resources") or {},
+        "network": glob.get("docker_network", "livchat_network"),
+        "domain": domain,
+        "host": f"{subdomain}.{domain}" if domain else subdomain,
+        "admin_email": glob.get("admin_email", ""),
+        "smtp": dict({"host": "", "port": 587, "user": "", "password": ""}, **config.get("smtp", {})),
+        "secrets": dict(config.get("secrets", {})),
+        "redis_db": 0,
+    }
+    resolved.update(variables)
+    return resolved
+
+
+def output_name(template: str) -> str:
+    """traefik.yaml.j2 -> traefik.yaml"""
+    return template[:-3] if template.endswith(".j2") else template
+
+
+def _private_dir(path: Path):
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+
+
+def _write_private(path: Path, text: str, tmp: Path):
+    """Grava só para o dono (0600 desde a criação) e troca atomicamente"""
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(fd, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def write_bundle(stack: str, files: Dict[str, str], bundles_dir: Path = BUNDLES_DIR) -> Path:
+    """
+    Grava os arquivos renderizados de um stack em .cache/stacks/<stack>/.
+    Arquivos com conteúdo igual não são reescritos (mtime preservado).
+    """
+    bundle = Path(bundles_dir) / stack
+    _private_dir(bundle)
+    for name, text in files.items():
+        path = bundle / name
+        try:
+            if path.read_text() == text:
+                continue
+        except OSError:
+            pass
+        _write_private(path, text, path.with_name(f".{name}.tmp{os.getpid()}"))
+    return bundle
+
+
+def render_key(template: str, source_hash: str, variables: Dict) -> str:
+    """Hash de memorização: template (nome + conteúdo) + variáveis canônicas"""
+    payload = json.dumps(variables, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{template}\0{source_hash}\0{payload}".encode()).hexdigest()
+
+
+class StackRenderer:
+    """Pipeline de renderização com Environment compartilhado e memorização em disco"""
+
+    def __init__(self, templates_dir: Path = TEMPLATES_DIR, cache_dir: Path = CACHE_DIR):
+        self.templates_dir = Path(templates_dir)
+        self.bytecode_dir = Path(cache_dir) / "jinja"
+        self.output_dir = Path(cache_dir) / "rendered"
+        self._env = None
+        self._lock = threading.Lock()
+        self._sources: Dict[str, Tuple[int, int, str]] = {}  # template -> (mtime_ns, size, sha256)
+        self._memo: Dict[str, str] = {}
+        self._pruned = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def env(self):
+        """Environment Jinja2 criado só quando algum template precisa ser executado"""
+        if self._env is None:
+            with self._lock:
+                if self._env is None:
+                    import jinja2
+                    self.bytecode_dir.mkdir(parents=True, exist_ok=True)
+                    self._env = jinja2.Environment(
+                        loader=jinja2.FileSystemLoader(str(self.templates_dir)),
+                        bytecode_cache=jinja2.FileSystemBytecodeCache(str(self.bytecode_dir)),
+                        undefined=jinja2.StrictUndefined,
+                        trim_blocks=True,
+                        lstrip_blocks=True,
+                        keep_trailing_newline=True,
+                        auto_reload=True,
+                    )
+        return self._env
+
+    def source_hash(self, template: str) -> str:
+        """Hash do conteúdo do template (recalculado só se mtime/tamanho mudar)"""
+        st = (self.templates_dir / template).stat()
+        cached = self._sources.get(template)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        digest = hashlib.sha256((self.templates_dir / template).read_bytes()).hexdigest()
+        self._sources[template] = (st.st_mtime_ns, st.st_size, digest)
+        return digest
+
+    def key(self, template: str, variables: Dict) -> str:
+        return render_key(template, self.source_hash(template), variables)
+
+    def cached(self, key: str) -> Optional[str]:
+        """Resultado memorizado (memória, depois disco)"""
+        if key in self._memo:
+            return self._memo[key]
+        path = self.output_dir / key[:2] / key
+        try:
+            text = path.read_text()
+            os.utime(path)  # marca o uso (a limpeza apaga o que ficou sem uso)
+        except OSError:
+            return None
+        self._memo[key] = text
+        return text
+
+    def store(self, key: str, text: str):
+        """Memoriza em memória e grava em disco atomicamente (0600)"""
+        self._memo[key] = text
+        path = self.output_dir / key[:2] / key
+        try:
+            _private_dir(path.parent)
+            _write_private(path, text, path.with_name(f"{key}.tmp{os.getpid()}.{threading.get_ident()}"))
+        except OSError:
+            pass
+        if not self._pruned:
+            # Só quem renderizou algo novo limpa, uma vez por processo
+            self._pruned = True
+            self.prune()
+
+    def prune(self, max_age: float = RENDERED_MAX_AGE) -> int:
+        """Apaga resultados sem uso há mais de max_age segundos; devolve quantos"""
+        cutoff = time.time() - max_age
+        removed = 0
+        try:
+            shards = os.listdir(self.output_dir)
+        except OSError:
+            return 0
+        for shard in shards:
+            directory = self.output_dir / shard
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                path = directory / name
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def render(self, template: str, variables: Dict) -> str:
+        """Renderiza um template (ou devolve o resultado memorizado)"""
+        key = self.key(template, variables)
+        text = self.cached(key)
+        if text is not None:
+            self.hits += 1
+            return text
+        self.misses += 1
+        text = self.env.get_template(template).render(**variables)
+        self.store(key, text)
+        return text
+
+    def render_many(self, items: List[Tuple[str, Dict]], workers: int = None) -> List[str]:
+        """
+        Renderiza um lote de (template, variáveis). Hits saem do cache; os
+        misses são divididos entre processos (Jinja2 é CPU-bound, threads não escalam).
+        """
+        keys = [self.key(template, variables) for template, variables in items]
+        results: List[Optional[str]] = [self.cached(key) for key in keys]
+        missing = [i for i, text in enumerate(results) if text is None]
+        self.hits += len(items) - len(missing)
+        self.misses += len(missing)
+        if not missing:
+            return results
+
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(missing) < 2 * workers:
+            rendered = [self.env.get_template(items[i][0]).render(**items[i][1]) for i in missing]
+        else:
+            chunks = [missing[n::workers] for n in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    pool.submit(_render_chunk, str(self.templates_dir), str(self.bytecode_dir.parent),
+                                [items[i] for i in chunk])
+                    for chunk in chunks
+                ]
+                by_index = {}
+                for chunk, future in zip(chunks, futures):
+                    by_index.update(zip(chunk, future.result()))
+            rendered = [by_index[i] for i in missing]
+
+        for i, text in zip(missing, rendered):
+            results[i] = text
+            self.store(keys[i], text)
+        return results
+
+
+def _render_chunk(templates_dir: str, cache_dir: str, items: List[Tuple[str, Dict]]) -> List[str]:
+    """Executado no processo filho: um Environment por processo, bytecode cache compartilhado"""
+    renderer = StackRenderer(Path(templates_dir), Path(cache_dir))
+    return [renderer.env.get_template(template).render(**variables) for template, variables in items]
+
+
+_default_renderer: Optional[StackRenderer] = None
+
+
+def get_renderer() -> StackRenderer:
+    """Renderer padrão do processo (Environment e cache compartilhados)"""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = StackRenderer()
+    return _default_renderer
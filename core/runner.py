@@ -0,0 +1,200 @@
+"""
+Execução de Comandos - LivChat Setup v0.1
+Executa processos locais enviando a saída ao Logger linha a linha
+
+- stdout e stderr lidos juntos com selectors (sem deadlock de pipe cheio)
+- timeout e cancelamento por comando (o grupo de processos inteiro é encerrado)
+- só as últimas linhas ficam em memória; a saída completa vai para
+  .cache/logs/<data>-<comando>.log (ficam os MAX_TRANSCRIPTS mais recentes)
+- linha sem quebra (barra de progresso com \r) é emitida ao passar de
+  MAX_LINE bytes, para o buffer não crescer sem limite
+- vários comandos podem rodar ao mesmo tempo com a saída intercalada por linha
+"""
+
+import os
+import time
+import signal
+import selectors
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+LOGS_DIR = BASE_DIR / ".cache" / "logs"
+
+# Tempo entre SIGTERM e SIGKILL ao encerrar um comando
+KILL_GRACE = 3.0
+# Maior trecho sem quebra de linha guardado antes de ser emitido como linha
+MAX_LINE = 64 * 1024
+# Transcrições mantidas em .cache/logs (as mais antigas são apagadas)
+MAX_TRANSCRIPTS = 200
+
+
+class RunResult:
+    """Resultado de um comando executado pelo CommandRunner"""
+
+    __slots__ = ("command", "code", "tail", "transcript", "seconds", "timed_out", "cancelled")
+
+    def __init__(self, command: str, code: int, tail: List[str], transcript: Optional[Path],
+                 seconds: float, timed_out: bool = False, cancelled: bool = False):
+        self.command = command
+        self.code = code
+        self.tail = tail
+        self.transcript = transcript
+        self.seconds = seconds
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+
+    @property
+    def ok(self) -> bool:
+        return self.code == 0 and not self.timed_out and not self.cancelled
+
+    @property
+    def output(self) -> str:
+        return "\n".join(self.tail)
+
+
+class CommandRunner:
+    """Executa comandos com saída em fluxo para o logger"""
+
+    def __init__(self, logger, logs_dir: Path = LOGS_DIR, tail_lines: int = 200,
+                 max_transcripts: int = MAX_TRANSCRIPTS):
+        self.logger = logger
+        self.logs_dir = Path(logs_dir)
+        self.tail_lines = tail_lines
+        self.max_transcripts = max_transcripts
+        self._counter = 0
+        self._pruned = False
+        self._lock = threading.Lock()
+
+    def run(self, command: Union[str, Sequence[str]], timeout: float = None, cancel: threading.Event = None,
+            label: str = None, env: Dict[str, str] = None, cwd: str = None) -> RunResult:
+        """
+        Executa um comando (string = shell) e transmite cada linha ao logger
+
+        Args:
+            timeout: segundos até encerrar o comando
+            cancel: Event que, quando setado, encerra o comando
+            label: prefixo das linhas quando há comandos em paralelo
+        """
+        shell = isinstance(command, str)
+        text = command if shell else " ".join(command)
+        start = time.monotonic()
+
+        self.logger.command_start(text, source=label)
+        transcript = self._transcript_path(label or text)
+        tail: deque = deque(maxlen=self.tail_lines)
+        timed_out = cancelled = False
+
+        with open(transcript, "w", errors="replace") as spool:
+            spool.write(f"$ {text}\n")
+            process = subprocess.Popen(
+                command, shell=shell, cwd=cwd,
+                env=dict(os.environ, **env) if env else None,
+                stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                start_new_session=True,  # permite encerrar filhos do comando junto
+            )
+            selector = selectors.DefaultSelector()
+            selector.register(process.stdout, selectors.EVENT_READ, False)
+            selector.register(process.stderr, selectors.EVENT_READ, True)
+            partial = {False: b"", True: b""}
+
+            def emit(raw: bytes, is_stderr: bool):
+                line = raw.decode(errors="replace").rstrip("\r")
+                tail.append(line)
+                spool.write(f"{'! ' if is_stderr else ''}{line}\n")
+                self.logger.command_output(line, source=label, stderr=is_stderr)
+
+            while selector.get_map():
+                wait = 0.2
+                if timeout is not None:
+                    wait = min(wait, max(0.0, start + timeout - time.monotonic()))
+                for key, _ in selector.select(wait):
+                    is_stderr = key.data
+                    chunk = os.read(key.fileobj.fileno(), 65536)
+                    if not chunk:
+                        selector.unregister(key.fileobj)
+                        if partial[is_stderr]:
+                            emit(partial[is_stderr], is_stderr)
+                            partial[is_stderr] = b""
+                        continue
+                    *lines, partial[is_stderr] = (partial[is_stderr] + chunk).split(b"\n")
+                    for line in lines:
+                        emit(line, is_stderr)
+                    while len(partial[is_stderr]) > MAX_LINE:
+                        emit(partial[is_stderr][:MAX_LINE], is_stderr)
+                        partial[is_stderr] = partial[is_stderr][MAX_LINE:]
+
+                if timeout is not None and time.monotonic() - start >= timeout and not timed_out:
+                    timed_out = True
+                    self._terminate(process)
+                if cancel is not None and cancel.is_set() and not cancelled:
+                    cancelled = True
+                    self._terminate(process)
+                if (timed_out or cancelled) and process.poll() is not None:
+                    break  # algum filho em segundo plano ainda segura o pipe
+
+            selector.close()
+            code = process.wait()
+            seconds = time.monotonic() - start
+            if timed_out:
+                spool.write(f"# timeout após {timeout}s\n")
+            elif cancelled:
+                spool.write("# cancelado\n")
+            spool.write(f"# código {code} em {seconds:.2f}s\n")
+
+        self.logger.command_end(code, seconds, source=label)
+        return RunResult(text, code, list(tail), transcript, seconds, timed_out, cancelled)
+
+    def run_many(self, commands: Dict[str, Union[str, Sequence[str]]], jobs: int = 4,
+                 timeout: float = None, cancel: threading.Event = None) -> Dict[str, RunResult]:
+        """Executa vários comandos ao mesmo tempo; as linhas saem intercaladas com o rótulo"""
+        with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="cmd") as pool:
+            futures = {label: pool.submit(self.run, command, timeout, cancel, label)
+                       for label, command in commands.items()}
+            return {label: future.result() for label, future in futures.items()}
+
+    @staticmethod
+    def _terminate(process: subprocess.Popen):
+        """SIGTERM no grupo do processo; SIGKILL se não sair a tempo"""
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        try:
+            process.wait(KILL_GRACE)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def _transcript_path(self, name: str) -> Path:
+        with self._lock:
+            self._counter += 1
+            counter = self._counter
+            prune, self._pruned = not self._pruned, True
+        words = name.split() or ["cmd"]
+        slug = "".join(c if c.isalnum() else "-" for c in words[0])[:24]
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        if prune:
+            self.prune_transcripts()
+        return self.logs_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{counter:03d}-{slug}.log"
+
+    def prune_transcripts(self) -> int:
+        """Apaga as transcrições além das max_transcripts mais recentes (uma vez por runner)"""
+        try:
+            names = sorted(name for name in os.listdir(self.logs_dir) if name.endswith(".log"))
+        except OSError:
+            return 0
+        # O nome começa pela data: a ordem alfabética é a cronológica
+        stale = names[:max(0, len(names) - self.max_transcripts)]
+        for name in stale:
+            try:
+                os.unlink(self.logs_dir / name)
+            except OSError:
+                pass
+        return len(stale)
@@ -0,0 +1,116 @@
+"""
+Agendador de Instalação - LivChat Setup v0.1
+Instala aplicações em paralelo respeitando as dependências entre elas
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+
+
+class DependencyError(Exception):
+    """Grafo de dependências inválido (ciclo ou dependência desconhecida)"""
+
+
+class InstallScheduler:
+    """Executa instalações num pool limitado, liberando cada app quando suas dependências terminam"""
+
+    def __init__(self, dependencies: Dict[str, List[str]], jobs: int = 4):
+        """
+        Args:
+            dependencies: mapa app -> lista de apps que precisam terminar antes
+            jobs: número máximo de instalações simultâneas
+        """
+        self.dependencies = {app: list(deps) for app, deps in dependencies.items()}
+        self.jobs = max(1, int(jobs))
+        self._validate()
+
+    def _validate(self):
+        """Garante que todas as dependências existem e que não há ciclos"""
+        for app, deps in self.dependencies.items():
+            for dep in deps:
+                if dep not in self.dependencies:
+                    raise DependencyError(f"{app} depende de {dep}, que não está no plano")
+
+        # Kahn: se sobrar alguém sem ordem, existe ciclo
+        pending = {app: len(deps) for app, deps in self.dependencies.items()}
+        ready = [app for app, count in pending.items() if count == 0]
+        visited = 0
+        while ready:
+            app = ready.pop()
+            visited += 1
+            for dependant in self._dependants(app):
+                pending[dependant] -= 1
+                if pending[dependant] == 0:
+                    ready.append(dependant)
+        if visited != len(self.dependencies):
+            cycle = sorted(app for app, count in pending.items() if count > 0)
+            raise DependencyError(f"Dependência circular entre: {', '.join(cycle)}")
+
+    def _dependants(self, app: str) -> List[str]:
+        return [other for other, deps in self.dependencies.items() if app in deps]
+
+    def run(self, install: Callable[[str], None],
+            on_done: Optional[Callable[[str], None]] = None,
+            on_error: Optional[Callable[[str, Exception], None]] = None,
+            on_skip: Optional[Callable[[str, str], None]] = None,
+            cancel: Optional[threading.Event] = None) -> Dict[str, str]:
+        """
+        Executa o plano. Os callbacks rodam na thread chamadora, na ordem em
+        que as apps terminam (não na ordem de seleção).
+
+        Args:
+            install: função que instala uma app (roda em thread do pool)
+            on_done: chamada quando uma app termina com sucesso
+            on_error: chamada quando uma app falha
+            on_skip: chamada quando uma app é pulada porque uma dependência falhou
+            cancel: setado em Ctrl+C, para os comandos em andamento encerrarem
+
+        Returns:
+            Mapa app -> "done" | "failed" | "skipped"
+        """
+        pending = {app: set(deps) for app, deps in self.dependencies.items()}
+        results: Dict[str, str] = {}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.jobs, thread_name_prefix="install") as pool:
+            def submit_ready():
+                for app in [a for a, deps in pending.items() if not deps]:
+                    del pending[app]
+                    running[pool.submit(install, app)] = app
+
+            def skip_dependants(failed: str):
+                for app in list(pending):
+                    if app in pending and failed in pending[app]:
+                        del pending[app]
+                        results[app] = "skipped"
+                        if on_skip:
+                            on_skip(app, failed)
+                        skip_dependants(app)
+
+            submit_ready()
+            while running:
+                try:
+                    finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                except KeyboardInterrupt:
+                    # O pool espera as threads ao sair do with: avisa para não demorarem
+                    if cancel is not None:
+                        cancel.set()
+                    raise
+                for future in finished:
+                    app = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        results[app] = "done"
+                        if on_done:
+                            on_done(app)
+                        for deps in pending.values():
+                            deps.discard(app)
+                    else:
+                        results[app] = "failed"
+                        if on_error:
+                            on_error(app, error)
+                        skip_dependants(app)
+                submit_ready()
+
+        return results
@@ -0,0 +1,108 @@
+"""
+Buffer de Tela - LivChat Setup v0.1
+Renderização diferencial: guarda o frame anterior e repinta só as linhas que mudaram
+"""
+
+import sys
+import time
+from typing import List, Optional
+
+CSI = "\033["
+
+
+class FrameStats:
+    """Métricas de renderização (exibidas no modo --dev)"""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.rows_painted = 0
+        self.last_bytes = 0
+        self.last_ms = 0.0
+
+    def record(self, num_bytes: int, seconds: float, rows: int):
+        self.frames += 1
+        self.bytes += num_bytes
+        self.seconds += seconds
+        self.rows_painted += rows
+        self.last_bytes = num_bytes
+        self.last_ms = seconds * 1000
+
+    def summary(self) -> str:
+        if not self.frames:
+            return "nenhum frame desenhado"
+        return (f"{self.frames} frames · {self.seconds / self.frames * 1000:.3f} ms/frame · "
+                f"{self.bytes / self.frames:.0f} bytes/frame · {self.rows_painted} linhas repintadas · "
+                f"{self.bytes} bytes no total")
+
+
+class ScreenBuffer:
+    """
+    Região de tela desenhada a partir da posição atual do cursor.
+
+    Após cada frame o cursor fica na linha logo abaixo da região, como se ela
+    tivesse sido impressa com print(). Cada frame sai numa única escrita.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.previous: Optional[List[str]] = None
+        self.stats = FrameStats()
+
+    @staticmethod
+    def _move(from_row: int, to_row: int) -> str:
+        if to_row < from_row:
+            return f"{CSI}{from_row - to_row}A"
+        if to_row > from_row:
+            return f"{CSI}{to_row - from_row}B"
+        return ""
+
+    def render(self, lines: List[str]):
+        """Desenha o frame, repintando apenas as linhas diferentes do anterior"""
+        start = time.perf_counter()
+        out = []
+        painted = 0
+        previous = self.previous
+
+        if previous is None:
+            out.append("".join(f"{line}\n" for line in lines))
+            painted = len(lines)
+        else:
+            row = len(previous)  # cursor está logo abaixo do frame anterior
+            for i in range(min(len(previous), len(lines))):
+                if lines[i] != previous[i]:
+                    out.append(self._move(row, i))
+                    out.append(f"\r{lines[i]}{CSI}K")
+                    row = i
+                    painted += 1
+
+            if len(lines) > len(previous):
+                # Linhas novas: escreve a partir do fim do frame anterior (rola a tela se preciso)
+                out.append(self._move(row, len(previous)))
+                out.append("\r" + "".join(f"{line}{CSI}K\n" for line in lines[len(previous):]))
+                painted += len(lines) - len(previous)
+            else:
+                out.append(self._move(row, len(lines)))
+                if len(lines) < len(previous):
+                    out.append(f"\r{CSI}J")
+
+        self.previous = list(lines)
+        self._write("".join(out), start, painted)
+
+    def clear(self):
+        """Apaga a região desenhada e deixa o cursor no início dela"""
+        if self.previous:
+            start = time.perf_counter()
+            self._write(f"{self._move(len(self.previous), 0)}\r{CSI}J", start, 0)
+        self.previous = None
+
+    def reset(self):
+        """Esquece o frame anterior (o próximo render desenha tudo abaixo do cursor)"""
+        self.previous = None
+
+    def _write(self, data: str, start: float, painted: int):
+        if data:
+            self.stream.write(data)
+            self.stream.flush()
+        self.stats.record(len(data.encode()), time.perf_counter() - start, painted)
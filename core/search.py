@@ -0,0 +1,166 @@
+"""
+Pesquisa - LivChat Setup v0.1
+Pesquisa fuzzy incremental sobre o catálogo de aplicações do menu
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+SEARCH_FIELDS = ("id", "name", "instance")
+
+
+class SearchIndex:
+    """
+    Índice montado uma vez quando o catálogo carrega:
+
+    - chars: caractere -> entradas que o contêm (corta candidatos do fuzzy)
+    - trigrams: trigrama -> entradas que o contêm (candidatos a substring)
+    - bigrams: par de caracteres -> entradas (substring das queries de 2 letras,
+      as de resultado mais largo)
+    - prefixes: prefixo de palavra (até 4 letras) -> entradas
+
+    Cada tecla que estende a pesquisa filtra só o resultado anterior;
+    backspace volta para o resultado já calculado. Resultados de queries de
+    1 e 2 letras ficam memorizados: apagar e digitar de novo não recalcula.
+    """
+
+    PREFIX_MAX = 4
+    SHORT_QUERY = 2
+
+    def __init__(self, entries: List[Dict]):
+        self.entries = entries
+        self.haystacks: List[str] = []
+        self.word_texts: List[str] = []  # " palavra palavra" para achar prefixos longos
+        self.chars: Dict[str, set] = {}
+        self.trigrams: Dict[str, set] = {}
+        self.bigrams: Dict[str, set] = {}
+        self.prefixes: Dict[str, set] = {}
+
+        for idx, entry in enumerate(entries):
+            text = " ".join(str(entry[f]) for f in SEARCH_FIELDS if entry.get(f)).lower()
+            self.haystacks.append(text)
+            for ch in set(text):
+                self.chars.setdefault(ch, set()).add(idx)
+            for i in range(len(text) - 1):
+                self.bigrams.setdefault(text[i:i + 2], set()).add(idx)
+                if i < len(text) - 2:
+                    self.trigrams.setdefault(text[i:i + 3], set()).add(idx)
+            words = text.replace("_", " ").replace("-", " ").split()
+            self.word_texts.append(" " + " ".join(words))
+            for word in words:
+                for n in range(1, min(len(word), self.PREFIX_MAX) + 1):
+                    self.prefixes.setdefault(word[:n], set()).add(idx)
+
+        # Pilha de (query, resultado) para pesquisa incremental
+        self._history: List[Tuple[str, List[int]]] = []
+        # Resultados das queries curtas (o índice não muda depois de montado)
+        self._short: Dict[str, List[int]] = {}
+
+    def search(self, query: str) -> List[int]:
+        """Índices das entradas que casam com a query, ordenados por relevância"""
+        query = query.lower().strip()
+        if not query:
+            self._history = []
+            return list(range(len(self.entries)))
+
+        # Reaproveita o resultado mais longo que ainda é prefixo da query
+        while self._history and not query.startswith(self._history[-1][0]):
+            self._history.pop()
+
+        if self._history and self._history[-1][0] == query:
+            return self._history[-1][1]
+
+        result = self._short.get(query)
+        if result is None:
+            candidates = self._history[-1][1] if self._history else self._candidates(query)
+            result = self._rank(candidates, query)
+            if len(query) <= self.SHORT_QUERY:
+                self._short[query] = result
+        self._history.append((query, result))
+        return result
+
+    def _candidates(self, query: str) -> List[int]:
+        """Entradas que contêm todos os caracteres da query (superconjunto do fuzzy)"""
+        sets = []
+        for ch in set(query):
+            found = self.chars.get(ch)
+            if not found:
+                return []
+            sets.append(found)
+        sets.sort(key=len)
+        result = set(sets[0]).intersection(*sets[1:])
+        return sorted(result)
+
+    def _rank(self, candidates: List[int], query: str) -> List[int]:
+        """Ordena por faixas: prefixo de palavra > substring > subsequência com menos lacunas"""
+        haystacks = self.haystacks
+        if len(query) == 2:
+            # Faixas por operações de conjunto, sem percorrer o resultado largo
+            # de 1 letra; fora do par, com 2 letras a lacuna é sempre 1
+            head, tail = query
+            narrowed = self.chars.get(tail, set()).intersection(candidates)
+            pair_hits = self.bigrams.get(query, set())
+            first = narrowed & self.prefixes.get(query, set())
+            substring = (narrowed & pair_hits) - first
+            fuzzy = [idx for idx in narrowed - pair_hits
+                     if 0 <= haystacks[idx].find(head) < haystacks[idx].rfind(tail)]
+            return sorted(first) + sorted(substring) + sorted(fuzzy)
+
+        if len(query) <= self.PREFIX_MAX:
+            prefix_hits = self.prefixes.get(query, ())
+            word_prefix = [idx for idx in candidates if idx in prefix_hits]
+        else:
+            needle = " " + query
+            word_prefix = [idx for idx in candidates if needle in self.word_texts[idx]]
+        first = set(word_prefix)
+
+        if len(query) == 1:
+            # Todo candidato contém o caractere: o resto é substring
+            return word_prefix + [idx for idx in candidates if idx not in first]
+
+        trigram_hits = self.trigrams.get(query[:3], ()) if len(query) >= 3 else None
+        substring, fuzzy = [], []
+        for idx in candidates:
+            if idx in first:
+                continue
+            if (trigram_hits is None or idx in trigram_hits) and query in haystacks[idx]:
+                substring.append(idx)
+            else:
+                gaps = self._gaps(haystacks[idx], query)
+                if gaps is not None:
+                    fuzzy.append((gaps, idx))
+        fuzzy.sort()
+        return word_prefix + substring + [idx for _, idx in fuzzy]
+
+    @staticmethod
+    def _gaps(text: str, query: str) -> Optional[int]:
+        """Lacunas da subsequência query em text (None se não casar)"""
+        pos = -1
+        gaps = 0
+        for ch in query:
+            found = text.find(ch, pos + 1)
+            if found < 0:
+                return None
+            if pos >= 0 and found != pos + 1:
+                gaps += 1
+            pos = found
+        return gaps
+
+    @staticmethod
+    def match_positions(text: str, query: str) -> List[int]:
+        """Posições de `text` a destacar para a query (substring, senão subsequência)"""
+        query = query.lower().strip()
+        lower = text.lower()
+        if not query:
+            return []
+        pos = lower.find(query)
+        if pos >= 0:
+            return list(range(pos, pos + len(query)))
+
+        positions = []
+        pos = -1
+        for ch in query:
+            pos = lower.find(ch, pos + 1)
+            if pos < 0:
+                return []
+            positions.append(pos)
+        return positions
@@ -0,0 +1,470 @@
+"""
+Transporte SSH - LivChat Setup v0.1
+Pool de conexões para o modo remoto: um paramiko.Transport autenticado por
+servidor, comandos em canais multiplexados sobre ele
+
+- keepalive no transporte e despejo de conexões ociosas
+- reconexão automática quando o transporte cai
+- chave do host e método de autenticação que funcionou ficam em cache
+- a senha nunca é gravada: é pedida no terminal uma vez por processo
+- paramiko só é importado quando a primeira conexão é aberta
+"""
+
+import os
+import time
+import socket
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from .profiler import span
+
+
+class SSHError(Exception):
+    """Falha de conexão, autenticação ou verificação de host"""
+
+
+class HostKeyMismatch(SSHError):
+    """A chave apresentada pelo servidor difere da conhecida"""
+
+
+class CommandResult:
+    """Resultado de um comando remoto"""
+
+    __slots__ = ("command", "code", "stdout", "stderr", "seconds")
+
+    def __init__(self, command: str, code: int, stdout: str, stderr: str, seconds: float):
+        self.command = command
+        self.code = code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.code == 0
+
+
+class ServerInfo:
+    """Dados de acesso a um servidor (config.json -> servers.<nome>)"""
+
+    def __init__(self, name: str, host: str, port: int = 22, user: str = "root",
+                 key_filename: str = None, password: str = None, ask_password: bool = False):
+        """
+        Args:
+            password: senha já conhecida nesta sessão (nunca vai para o config.json)
+            ask_password: o servidor aceita senha; o pool pede no terminal quando precisar
+        """
+        self.name = name
+        self.host = host
+        self.port = int(port)
+        self.user = user
+        self.key_filename = key_filename
+        self.password = password
+        self.ask_password = ask_password or bool(password)
+
+    @classmethod
+    def from_config(cls, name: str, data: Dict) -> "ServerInfo":
+        # "password" de configs antigas não é usado: só indica que o servidor aceita senha
+        return cls(name, data["host"], data.get("port", 22), data.get("user", "root"),
+                   data.get("key_filename"), ask_password=bool(data.get("ask_password") or data.get("password")))
+
+    def to_config(self) -> Dict:
+        data = {"host": self.host, "port": self.port, "user": self.user}
+        if self.key_filename:
+            data["key_filename"] = self.key_filename
+        if self.ask_password:
+            data["ask_password"] = True
+        return data
+
+    @property
+    def key(self) -> Tuple[str, str, int, str]:
+        return self.name, self.host, self.port, self.user
+
+
+class _Connection:
+    """Transporte de um servidor + momento do último uso"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.last_used = time.monotonic()
+        self.channels = 0
+
+    def alive(self) -> bool:
+        return self.transport is not None and self.transport.is_active()
+
+
+class SSHPool:
+    """Pool de transportes SSH indexado por servidor (nome, host, porta, usuário)"""
+
+    def __init__(self, known_hosts: str = None, keepalive: int = 15, idle_timeout: float = 300.0,
+                 connect_timeout: float = 10.0, auto_add: bool = True,
+                 prompt: Optional[Callable[[ServerInfo], Optional[str]]] = None):
+        """
+        Args:
+            known_hosts: arquivo onde chaves de host novas são gravadas
+            keepalive: intervalo (s) de keepalive do transporte
+            idle_timeout: conexões sem uso por mais que isso são fechadas
+            connect_timeout: timeout de TCP + handshake
+            auto_add: aceita e grava a chave no primeiro contato (TOFU)
+            prompt: pede a senha de servidores com ask_password (padrão: getpass
+                se houver terminal); `pool.prompt = None` desliga, ex.: no agente
+        """
+        self.known_hosts = known_hosts or os.path.expanduser("~/.ssh/known_hosts")
+        self.keepalive = keepalive
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.auto_add = auto_add
+        self.prompt = prompt if prompt is not None else prompt_password
+
+        self._lock = threading.Lock()
+        self._server_locks: Dict[Tuple, threading.Lock] = {}
+        self._connections: Dict[Tuple, _Connection] = {}
+        self._host_keys = None                       # paramiko.HostKeys (carregado uma vez)
+        self._verified: Dict[Tuple, str] = {}        # (host, porta) -> fingerprint aceito
+        self._auth_method: Dict[Tuple, str] = {}     # servidor -> método que funcionou
+        self._pkeys: Dict[str, object] = {}          # arquivo -> PKey já carregada
+        self._passwords: Dict[Tuple, str] = {}       # servidor -> senha digitada (só em memória)
+        self._prompt_lock = threading.Lock()         # um pedido de senha por vez no terminal
+        self._reaper: Optional[threading.Thread] = None
+        self._closing = threading.Event()
+        self.handshakes = 0
+
+    # ===== Conexões =====
+
+    def _server_lock(self, key) -> threading.Lock:
+        with self._lock:
+            return self._server_locks.setdefault(key, threading.Lock())
+
+    def transport(self, server: ServerInfo):
+        """Transporte ativo do servidor (abre ou reconecta se necessário)"""
+        with self._server_lock(server.key):
+            conn = self._connections.get(server.key)
+            if conn is None or not conn.alive():
+                if conn is not None:
+                    self._close(conn)
+                if self._closing.is_set():
+                    raise SSHError(f"{server.name}: pool SSH sendo fechado")
+                conn = _Connection(self._connect(server))
+                self._connections[server.key] = conn
+                self._start_reaper()
+            conn.last_used = time.monotonic()
+            return conn.transport
+
+    def _connect(self, server: ServerInfo):
+        import paramiko
+
+        try:
+            sock = socket.create_connection((server.host, server.port), timeout=self.connect_timeout)
+        except OSError as e:
+            raise SSHError(f"{server.name}: não foi possível conectar em {server.host}:{server.port} ({e})")
+
+        transport = paramiko.Transport(sock)
+        try:
+            transport.start_client(timeout=self.connect_timeout)
+            self._verify_host_key(server, transport)
+            self._authenticate(server, transport)
+        except paramiko.SSHException as e:
+            transport.close()
+            raise SSHError(f"{server.name}: {e}")
+        except SSHError:
+            transport.close()
+            raise
+
+        transport.set_keepalive(self.keepalive)
+        self.handshakes += 1
+        return transport
+
+    def _verify_host_key(self, server: ServerInfo, transport):
+        """Confere a chave do host com known_hosts (resultado fica em cache)"""
+        import paramiko
+
+        key = transport.get_remote_server_key()
+        fingerprint = key.get_fingerprint().hex()
+        address = (server.host, server.port)
+        if self._verified.get(address) == fingerprint:
+            return
+
+        with self._lock:
+            if self._host_keys is None:
+                self._host_keys = paramiko.HostKeys()
+                if os.path.exists(self.known_hosts):
+                    self._host_keys.load(self.known_hosts)
+
+        hostname = server.host if server.port == 22 else f"[{server.host}]:{server.port}"
+        known = self._host_keys.lookup(hostname)
+        if known and key.get_name() in known:
+            if known[key.get_name()] != key:
+                raise HostKeyMismatch(f"{server.name}: chave do host {hostname} mudou! Possível ataque MITM")
+        elif self.auto_add:
+            with self._lock:
+                self._host_keys.add(hostname, key.get_name(), key)
+                try:
+                    os.makedirs(os.path.dirname(self.known_hosts), mode=0o700, exist_ok=True)
+                    self._host_keys.save(self.known_hosts)
+                except OSError:
+                    pass
+        else:
+            raise SSHError(f"{server.name}: chave do host {hostname} desconhecida")
+
+        self._verified[address] = fingerprint
+
+    def _authenticate(self, server: ServerInfo, transport):
+        """Tenta primeiro o método que funcionou da última vez"""
+        import paramiko
+
+        methods = ["key", "agent", "password"]
+        cached = self._auth_method.get(server.key)
+        if cached:
+            methods.remove(cached)
+            methods.insert(0, cached)
+
+        errors = []
+        for method in methods:
+            try:
+                if method == "key" and server.key_filename:
+                    transport.auth_publickey(server.user, self._load_key(server.key_filename))
+                elif method == "agent":
+                    for agent_key in paramiko.Agent().get_keys():
+                        try:
+                            transport.auth_publickey(server.user, agent_key)
+                            break
+                        except paramiko.AuthenticationException:
+                            continue
+                elif method == "password":
+                    password = self._password(server)
+                    if password:
+                        transport.auth_password(server.user, password)
+            except (paramiko.AuthenticationException, paramiko.SSHException) as e:
+                errors.append(f"{method}: {e}")
+                if method == "password":
+                    self._passwords.pop(server.key, None)  # senha errada: pede de novo
+            if transport.is_authenticated():
+                self._auth_method[server.key] = method
+                return
+
+        detail = "; ".join(errors) or "nenhuma credencial disponível"
+        raise SSHError(f"{server.name}: autenticação falhou para {server.user}@{server.host} ({detail})")
+
+    def _password(self, server: ServerInfo) -> Optional[str]:
+        """Senha da sessão: a do ServerInfo ou a digitada (uma vez por servidor)"""
+        if server.password:
+            return server.password
+        if not server.ask_password or self.prompt is None:
+            return None
+        with self._prompt_lock:
+            if server.key not in self._passwords:
+                password = self.prompt(server)
+                if not password:
+                    return None
+                self._passwords[server.key] = password
+            return self._passwords[server.key]
+
+    def _load_key(self, filename: str):
+        import paramiko
+
+        if filename not in self._pkeys:
+            path = os.path.expanduser(filename)
+            last_error = None
+            for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey):
+                try:
+                    self._pkeys[filename] = key_class.from_private_key_file(path)
+                    break
+                except (paramiko.SSHException, ValueError) as e:
+                    last_error = e
+            else:
+                raise SSHError(f"Chave {filename} inválida: {last_error}")
+        return self._pkeys[filename]
+
+    # ===== Comandos =====
+
+    def open_channel(self, server: ServerInfo):
+        """Abre um canal de sessão; reconecta uma vez se o transporte tiver caído"""
+        import paramiko
+
+        for attempt in range(2):
+            transport = self.transport(server)
+            try:
+                return transport.open_session(timeout=self.connect_timeout)
+            except (paramiko.SSHException, EOFError, OSError) as e:
+                self.evict(server)
+                if attempt == 1:
+                    raise SSHError(f"{server.name}: falha ao abrir canal ({e})")
+
+    def run(self, server: ServerInfo, command: str, timeout: float = None, stdin=None,
+            on_output: Callable[[bytes, bool], None] = None) -> CommandResult:
+        """
+        Executa um comando num canal novo sobre o transporte compartilhado
+
+        Args:
+            stdin: texto ou bytes enviados à entrada do comando
+            on_output: recebe (bloco, is_stderr) à medida que a saída chega
+        """
+        with span("ssh.run", host=server.name, command=command.splitlines()[0][:120] if command else ""):
+            start = time.monotonic()
+            channel = self.open_channel(server)
+            conn = self._connections.get(server.key)
+            if conn:
+                conn.channels += 1
+            try:
+                channel.exec_command(command)
+                if stdin is not None:
+                    channel.sendall(stdin.encode() if isinstance(stdin, str) else stdin)
+                    channel.shutdown_write()
+                stdout, stderr = self._collect(channel, start, timeout, command, server, on_output)
+                code = channel.recv_exit_status()
+            finally:
+                channel.close()
+                if conn:
+                    conn.channels -= 1
+                    conn.last_used = time.monotonic()
+        return CommandResult(command, code, stdout, stderr, time.monotonic() - start)
+
+    @staticmethod
+    def _collect(channel, start: float, timeout: Optional[float], command: str, server: ServerInfo,
+                 on_output: Callable[[bytes, bool], None] = None):
+        """Lê stdout e stderr juntos (evita deadlock com buffers cheios)"""
+        out, err = [], []
+        channel.settimeout(0.1)
+        while True:
+            got = False
+            if channel.recv_ready():
+                out.append(channel.recv(32768))
+                if on_output:
+                    on_output(out[-1], False)
+                got = True
+            if channel.recv_stderr_ready():
+                err.append(channel.recv_stderr(32768))
+                if on_output:
+                    on_output(err[-1], True)
+                got = True
+            if not got:
+                if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                if timeout is not None and time.monotonic() - start > timeout:
+                    raise SSHError(f"{server.name}: timeout de {timeout}s em: {command}")
+                channel.status_event.wait(0.05)
+        return b"".join(out).decode(errors="replace"), b"".join(err).decode(errors="replace")
+
+    # ===== Ciclo de vida =====
+
+    def evict(self, server: ServerInfo, blocking: bool = True):
+        """
+        Descarta a conexão de um servidor (a próxima chamada reconecta)
+
+        Args:
+            blocking: False não espera a thread que está usando o servidor
+                (host travado): fecha o transporte por fora e os canais dela falham
+        """
+        lock = self._server_lock(server.key)
+        if not lock.acquire(blocking):
+            conn = self._connections.get(server.key)
+            if conn:
+                self._close(conn)
+            return
+        try:
+            conn = self._connections.pop(server.key, None)
+            if conn:
+                self._close(conn)
+        finally:
+            lock.release()
+
+    def evict_idle(self) -> int:
+        """Fecha conexões ociosas há mais de idle_timeout; devolve quantas"""
+        now = time.monotonic()
+        closed = 0
+        for key, conn in list(self._connections.items()):
+            if conn.channels == 0 and now - conn.last_used > self.idle_timeout:
+                with self._server_lock(key):
+                    if self._connections.get(key) is conn:
+                        del self._connections[key]
+                        self._close(conn)
+                        closed += 1
+        return closed
+
+    def _start_reaper(self):
+        if self._reaper is None or not self._reaper.is_alive():
+            self._reaper = threading.Thread(target=self._reap, name="ssh-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self):
+        interval = max(1.0, min(30.0, self.idle_timeout / 2))
+        while not self._closing.wait(interval):
+            self.evict_idle()
+            if not self._connections:
+                break
+
+    @staticmethod
+    def _close(conn: _Connection):
+        try:
+            conn.transport.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """
+        Fecha todos os transportes; o pool volta a conectar sob demanda depois.
+        Enquanto fecha, nenhuma conexão nova é aberta: o reaper para e cada
+        servidor é fechado sob o seu lock (uma conexão em andamento termina
+        antes, até connect_timeout)
+        """
+        self._closing.set()
+        try:
+            reaper = self._reaper
+            if reaper is not None and reaper is not threading.current_thread():
+                reaper.join(self.connect_timeout)
+            with self._lock:
+                keys = list(self._server_locks)
+            for key in keys:
+                lock = self._server_lock(key)
+                # Host travado no handshake não segura a saída: fecha por fora
+                locked = lock.acquire(timeout=self.connect_timeout)
+                try:
+                    conn = self._connections.pop(key, None)
+                    if conn:
+                        self._close(conn)
+                finally:
+                    if locked:
+                        lock.release()
+        finally:
+            self._closing.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"connections": len(self._connections), "handshakes": self.handshakes}
+
+
+def configured_servers(config: Dict) -> Dict[str, ServerInfo]:
+    """Servidores cadastrados com add-server"""
+    return {name: ServerInfo.from_config(name, data)
+            for name, data in (config.get("servers") or {}).items()}
+
+
+def current_server(config: Dict) -> Optional[ServerInfo]:
+    """Servidor selecionado com `use` (None = modo local)"""
+    name = config.get("current_server")
+    if not name:
+        return None
+    data = (config.get("servers") or {}).get(name)
+    if data is None:
+        raise SSHError(f"Servidor selecionado não existe: {name}")
+    return ServerInfo.from_config(name, data)
+
+
+_default_pool: Optional[SSHPool] = None
+
+
+def prompt_password(server: ServerInfo) -> Optional[str]:
+    """Pede a senha no terminal (None sem terminal: fleet em segundo plano, cron)"""
+    import sys
+    from getpass import getpass
+
+    if not sys.stdin.isatty():
+        return None
+    return getpass(f"Senha SSH de {server.user}@{server.host} ({server.name}): ")
+
+
+def get_pool() -> SSHPool:
+    """Pool padrão do processo"""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = SSHPool()
+    return _default_pool
@@ -0,0 +1,162 @@
+"""
+Monitor Docker - LivChat Setup v0.1
+Coleta réplicas, CPU e memória de todos os stacks com poucas requisições em lote
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from .docker_api import DockerClient, DockerError
+
+STACK_LABEL = "com.docker.stack.namespace"
+
+
+def format_mem(num_bytes: float) -> str:
+    """Formata bytes no estilo da tabela do menu (45MB, 1.2GB)"""
+    mb = num_bytes / (1024 * 1024)
+    if mb >= 1024:
+        return f"{mb / 1024:.1f}GB"
+    return f"{mb:.0f}MB"
+
+
+class StackStats:
+    """Uso agregado de um stack (app ou instância)"""
+
+    __slots__ = ("running", "desired", "cpu", "mem")
+
+    def __init__(self):
+        self.running = 0
+        self.desired = 0
+        self.cpu = None   # % somado dos containers (None = ainda sem amostra anterior)
+        self.mem = 0      # bytes
+
+    def columns(self) -> Dict[str, str]:
+        """Colunas STATUS/CPU/MEM prontas para o menu"""
+        return {
+            "status": f"{self.running}/{self.desired}",
+            "cpu": "-" if self.cpu is None else f"{self.cpu:.1f}%",
+            "mem": format_mem(self.mem) if self.mem else "-",
+        }
+
+
+class StatsCollector:
+    """
+    Coletor com cache TTL. snapshot() nunca bloqueia: devolve a última coleta
+    e, se ela estiver vencida, dispara uma atualização em segundo plano.
+    """
+
+    def __init__(self, client: DockerClient = None, ttl: float = 2.0, workers: int = 8):
+        self.client = client or DockerClient()
+        self.ttl = ttl
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._stacks: Dict[str, StackStats] = {}
+        self._updated_at = 0.0
+        self.version = 0  # incrementa a cada coleta concluída
+        self._previous_cpu: Dict[str, tuple] = {}  # container -> (total_usage, system_usage)
+        self.last_error: Optional[str] = None
+
+    def snapshot(self) -> Dict[str, StackStats]:
+        """Último resultado conhecido (pode estar vazio na primeira chamada)"""
+        if time.monotonic() - self._updated_at >= self.ttl:
+            self.refresh_async()
+        return self._stacks
+
+    def refresh_async(self):
+        """Agenda uma coleta em segundo plano, se nenhuma estiver em andamento"""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_worker, name="docker-stats", daemon=True).start()
+
+    def _refresh_worker(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def refresh(self) -> Dict[str, StackStats]:
+        """Coleta síncrona: 2 requisições de listagem + stats dos containers em paralelo"""
+        if not self.client.available():
+            self.last_error = f"Socket do Docker não encontrado: {self.client.socket_path}"
+            self._updated_at = time.monotonic()
+            return self._stacks
+
+        try:
+            services = self.client.services() or []
+            containers = self.client.containers({"label": [STACK_LABEL]}) or []
+        except DockerError as e:
+            self.last_error = str(e)
+            self._updated_at = time.monotonic()
+            return self._stacks
+
+        stacks: Dict[str, StackStats] = {}
+        for service in services:
+            stack = (service.get("Spec", {}).get("Labels") or {}).get(STACK_LABEL)
+            if not stack:
+                continue
+            status = service.get("ServiceStatus") or {}
+            entry = stacks.setdefault(stack, StackStats())
+            entry.running += status.get("RunningTasks", 0)
+            entry.desired += status.get("DesiredTasks", 0)
+
+        by_id = {c["Id"]: (c.get("Labels") or {}).get(STACK_LABEL) for c in containers}
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            samples = list(pool.map(self._container_sample, by_id))
+
+        seen = set()
+        for container_id, sample in zip(by_id, samples):
+            if sample is None:
+                continue
+            seen.add(container_id)
+            entry = stacks.setdefault(by_id[container_id], StackStats())
+            cpu, mem = sample
+            entry.mem += mem
+            if cpu is not None:
+                entry.cpu = (entry.cpu or 0.0) + cpu
+
+        # Esquece containers que não existem mais
+        self._previous_cpu = {cid: v for cid, v in self._previous_cpu.items() if cid in seen}
+
+        self._stacks = stacks
+        self._updated_at = time.monotonic()
+        self.version += 1
+        self.last_error = None
+        return stacks
+
+    def _container_sample(self, container_id: str):
+        """(cpu %, memória em bytes) de um container; CPU vem do delta entre coletas"""
+        try:
+            stats = self.client.container_stats(container_id)
+        except DockerError:
+            return None
+        if not stats:
+            return None
+
+        memory = stats.get("memory_stats") or {}
+        usage = memory.get("usage", 0)
+        detail = memory.get("stats") or {}
+        # cgroup v2 usa inactive_file, v1 usa cache (mesmo cálculo do docker stats)
+        mem = usage - detail.get("inactive_file", detail.get("cache", 0))
+
+        cpu_stats = stats.get("cpu_stats") or {}
+        total = (cpu_stats.get("cpu_usage") or {}).get("total_usage", 0)
+        system = cpu_stats.get("system_cpu_usage", 0)
+        online = cpu_stats.get("online_cpus") or len((cpu_stats.get("cpu_usage") or {}).get("percpu_usage") or []) or 1
+
+        cpu = None
+        previous = self._previous_cpu.get(container_id)
+        if previous:
+            cpu_delta = total - previous[0]
+            system_delta = system - previous[1]
+            if cpu_delta >= 0 and system_delta > 0:
+                cpu = cpu_delta / system_delta * online * 100.0
+        self._previous_cpu[container_id] = (total, system)
+
+        return cpu, max(mem, 0)
@@ -0,0 +1,149 @@
+"""
+Passos de Instalação - LivChat Setup v0.1
+Plano de comandos shell de cada aplicação (verificações, rede, deploy)
+
+Os passos são só descrições: no modo remoto quem executa é o lote
+(core/batch.py), que junta todos os passos de uma aplicação em um único
+script; no modo local cada passo roda pelo CommandRunner (core/runner.py).
+Os arquivos do stack não são passos: no remoto vão antes, pela
+sincronização (core/sync.py); no local já estão em .cache/stacks/.
+"""
+
+import shlex
+from typing import Dict, List
+
+# Onde os arquivos de stack ficam no servidor
+REMOTE_STACKS_DIR = "/opt/livchat/stacks"
+
+
+class Step:
+    """Um passo do plano: rótulo para o log + comando shell idempotente"""
+
+    __slots__ = ("key", "label", "command")
+
+    def __init__(self, key: str, label: str, command: str):
+        self.key = key
+        self.label = label
+        self.command = command
+
+    def __repr__(self) -> str:
+        return f"Step({self.key!r})"
+
+
+def remote_dir(stack: str) -> str:
+    return f"{REMOTE_STACKS_DIR}/{stack}"
+
+
+def preflight_plan(installs_docker: bool = False) -> List[Step]:
+    """
+    Verificações do servidor antes de qualquer aplicação
+
+    Args:
+        installs_docker: a seleção inclui a app docker, que instala o Docker
+            Engine; num host novo ele ainda não existe e não é verificado
+    """
+    steps = [
+        Step("os", "Verificando sistema operacional",
+             "uname -sr && test -r /etc/os-release && . /etc/os-release && echo \"$PRETTY_NAME\""),
+    ]
+    if not installs_docker:
+        steps.append(Step("docker", "Verificando Docker",
+                          "docker info --format '{{.ServerVersion}}'"))
+    return steps
+
+
+def network_step(network: str) -> Step:
+    net = shlex.quote(network)
+    return Step("network", f"Criando rede {network}",
+                f"docker network inspect {net} >/dev/null 2>&1 || "
+                f"docker network create --driver overlay --attachable {net}")
+
+
+def volumes_step(stack: str, volumes: List[str]) -> Step:
+    """
+    Volumes externos dos templates (apps/<id>.json: "volumes", com {stack});
+    o `docker stack deploy` falha se algum não existir
+    """
+    names = [shlex.quote(volume.format(stack=stack)) for volume in volumes]
+    return Step("volumes", f"Criando volumes de {stack}",
+                "; ".join(f"{{ docker volume inspect {name} >/dev/null 2>&1 || docker volume create {name}; }}"
+                          for name in names))
+
+
+def database_step(stack: str, postgres_service: str = "postgres_postgres") -> Step:
+    """
+    Banco {{ stack }} no PostgreSQL compartilhado (apps/<id>.json: "database": true),
+    criado pelo container do serviço antes do deploy da aplicação
+    """
+    literal = stack.replace("'", "''")
+    identifier = stack.replace('"', '""')
+    check = shlex.quote(f"SELECT 1 FROM pg_database WHERE datname = '{literal}'")
+    create = shlex.quote(f'CREATE DATABASE "{identifier}"')
+    label = shlex.quote(f"label=com.docker.swarm.service.name={postgres_service}")
+    return Step("database", f"Criando banco {stack}",
+                f"""c=$(docker ps -q --filter {label} | head -n 1)
+[ -n "$c" ] || {{ echo "container de {postgres_service} não encontrado"; exit 1; }}
+docker exec "$c" psql -U postgres -tAc {check} | grep -q 1 || docker exec "$c" psql -U postgres -c {create}""")
+
+
+def deploy_step(stack: str, files: Dict[str, str], directory: str = None) -> Step:
+    directory = str(directory or remote_dir(stack))
+    compose = " ".join(f"-c {shlex.quote(directory + '/' + name)}"
+                       for name in sorted(files) if name.endswith((".yaml", ".yml")))
+    return Step("deploy", f"Publicando stack {stack}",
+                f"docker stack deploy --with-registry-auth {compose} {shlex.quote(stack)}")
+
+
+def wait_step(stack: str, timeout: int = 300) -> Step:
+    """
+    Espera no servidor até o stack convergir (réplicas + healthcheck), com
+    backoff de 1s a 8s; roda dentro do mesmo lote, sem round-trips extras
+    """
+    label = shlex.quote(f"com.docker.stack.namespace={stack}")
+    script = rf"""deadline=$(( $(date +%s) + {int(timeout)} )); delay=1
+while :; do
+  replicas=$(docker service ls --filter label={label} --format '{{{{.Replicas}}}}')
+  if [ -n "$replicas" ] && echo "$replicas" | awk '{{ split($1, r, "/"); if (r[1] != r[2]) exit 1 }}' \
+     && ! docker ps --filter label={label} --format '{{{{.Status}}}}' | grep -qE 'health: starting|unhealthy'; then
+    echo "$replicas" | tr '\n' ' '; exit 0
+  fi
+  [ "$(date +%s)" -ge "$deadline" ] && {{ echo "timeout: $replicas" | tr '\n' ' '; exit 1; }}
+  sleep "$delay"; [ "$delay" -lt 8 ] && delay=$((delay * 2))
+done"""
+    return Step("ready", f"Aguardando serviços de {stack}", script)
+
+
+def app_plan(definition: Dict, stack: str, files: Dict[str, str], network: str, directory=None) -> List[Step]:
+    """
+    Passos de uma aplicação, na ordem de execução
+
+    Args:
+        directory: onde estão os arquivos do stack (padrão: diretório remoto)
+    """
+    if not definition.get("templates"):
+        # Aplicação de infraestrutura (Docker + Swarm): prepara o host
+        return [
+            Step("engine", "Instalando Docker Engine",
+                 "command -v docker >/dev/null || curl -fsSL https://get.docker.com | sh"),
+            Step("swarm", "Inicializando Swarm",
+                 "[ \"$(docker info --format '{{.Swarm.LocalNodeState}}')\" = active ] || "
+                 "docker swarm init --advertise-addr \"$(hostname -i | awk '{print $1}')\""),
+            network_step(network),
+        ]
+    steps = [network_step(network)]
+    if definition.get("volumes"):
+        steps.append(volumes_step(stack, definition["volumes"]))
+    if definition.get("database"):
+        # A dependência de postgres garante que ele já está pronto a esta altura
+        steps.append(database_step(stack))
+    # No modo remoto os arquivos chegam antes pelo estágio de sincronização (core/sync.py)
+    steps.append(deploy_step(stack, files, directory))
+    return steps
+
+
+def count_steps(definition: Dict, upload: bool = True) -> int:
+    """Quantidade de passos do plano + sincronização + espera + imagens (para o contador de progresso)"""
+    extra = 0
+    if definition.get("templates"):
+        extra = 3 if upload else 1
+    return len(app_plan(definition, definition["id"], {}, "")) + extra
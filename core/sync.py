@@ -0,0 +1,223 @@
+"""
+Sincronização de Bundles - LivChat Setup v0.1
+Envia os arquivos renderizados (.cache/stacks/<stack>/) para o servidor remoto
+
+- um manifesto no servidor (<dir>/.manifest.json) guarda sha256 e tamanho
+  de cada arquivo enviado; só o que mudou é transferido
+- arquivos pequenos alterados vão juntos em um único tar (um round-trip)
+- arquivos grandes vão por SFTP em blocos, em <nome>.part; se a conexão
+  cair, o próximo envio confere o trecho já enviado e continua de onde parou
+- arquivos que saíram do bundle são removidos do servidor
+- os stacks levam segredos: diretórios criados 0700 e arquivos 0600, como
+  os bundles locais (core/render.py)
+"""
+
+import io
+import json
+import shlex
+import tarfile
+import hashlib
+from pathlib import Path
+from typing import Dict, List
+
+from .ssh import SSHError
+
+MANIFEST_NAME = ".manifest.json"
+MANIFEST_VERSION = 1
+
+# Acima disso o arquivo vai sozinho, em blocos e com retomada
+LARGE_FILE = 256 * 1024
+CHUNK_SIZE = 1024 * 1024
+# Modos no servidor (o umask remoto não decide quem lê os segredos)
+DIR_MODE = 0o700
+FILE_MODE = 0o600
+
+
+class SyncReport:
+    """O que a sincronização de um bundle fez"""
+
+    __slots__ = ("uploaded", "unchanged", "removed", "resumed", "bytes_sent")
+
+    def __init__(self):
+        self.uploaded: List[str] = []
+        self.unchanged: List[str] = []
+        self.removed: List[str] = []
+        self.resumed: List[str] = []
+        self.bytes_sent = 0
+
+    def summary(self) -> str:
+        parts = [f"{len(self.uploaded)} enviados", f"{len(self.unchanged)} inalterados"]
+        if self.removed:
+            parts.append(f"{len(self.removed)} removidos")
+        if self.resumed:
+            parts.append(f"{len(self.resumed)} retomados")
+        return ", ".join(parts)
+
+
+def file_digest(path: Path, limit: int = None) -> str:
+    """sha256 do arquivo (ou só dos primeiros `limit` bytes)"""
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            block = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest()
+
+
+def local_manifest(bundle: Path) -> Dict[str, Dict]:
+    """Arquivos do bundle local com hash e tamanho (ignora temporários e ocultos)"""
+    files = {}
+    for path in sorted(Path(bundle).rglob("*")):
+        name = path.relative_to(bundle).as_posix()
+        if not path.is_file() or any(part.startswith(".") for part in Path(name).parts):
+            continue
+        files[name] = {"sha256": file_digest(path), "size": path.stat().st_size}
+    return files
+
+
+class BundleSync:
+    """Sincroniza bundles com um servidor usando o transporte SSH do pool"""
+
+    def __init__(self, pool, server):
+        self.pool = pool
+        self.server = server
+
+    def sync(self, bundle: Path, remote_dir: str) -> SyncReport:
+        """Envia para remote_dir só os arquivos cujo conteúdo difere do manifesto remoto"""
+        import paramiko
+
+        bundle = Path(bundle)
+        report = SyncReport()
+        local = local_manifest(bundle)
+
+        sftp = paramiko.SFTPClient.from_transport(self.pool.transport(self.server))
+        try:
+            self._makedirs(sftp, remote_dir)
+            remote = self._read_manifest(sftp, remote_dir)
+
+            changed = [name for name, info in local.items() if remote.get(name) != info]
+            report.unchanged = [name for name in local if name not in changed]
+            small = [name for name in changed if local[name]["size"] <= LARGE_FILE]
+            large = [name for name in changed if local[name]["size"] > LARGE_FILE]
+
+            if small:
+                report.bytes_sent += self._upload_batch(bundle, remote_dir, small)
+                report.uploaded.extend(small)
+            for name in large:
+                sent, resumed = self._upload_large(sftp, bundle / name, f"{remote_dir}/{name}", local[name])
+                report.bytes_sent += sent
+                report.uploaded.append(name)
+                if resumed:
+                    report.resumed.append(name)
+
+            for name in sorted(set(remote) - set(local)):
+                try:
+                    sftp.remove(f"{remote_dir}/{name}")
+                except IOError:
+                    pass
+                report.removed.append(name)
+
+            if changed or report.removed or not remote:
+                self._write_manifest(sftp, remote_dir, local)
+        finally:
+            sftp.close()
+        return report
+
+    # ===== Manifesto =====
+
+    @staticmethod
+    def _read_manifest(sftp, remote_dir: str) -> Dict[str, Dict]:
+        try:
+            with sftp.open(f"{remote_dir}/{MANIFEST_NAME}", "r") as f:
+                data = json.loads(f.read())
+        except (IOError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("files", {})
+
+    @staticmethod
+    def _write_manifest(sftp, remote_dir: str, files: Dict[str, Dict]):
+        path = f"{remote_dir}/{MANIFEST_NAME}"
+        with sftp.open(f"{path}.tmp", "w") as f:
+            f.chmod(FILE_MODE)
+            f.write(json.dumps({"version": MANIFEST_VERSION, "files": files}, separators=(",", ":")))
+        sftp.posix_rename(f"{path}.tmp", path)
+
+    @staticmethod
+    def _makedirs(sftp, remote_dir: str):
+        current = ""
+        for part in remote_dir.strip("/").split("/"):
+            current += f"/{part}"
+            try:
+                sftp.stat(current)
+            except IOError:
+                sftp.mkdir(current, DIR_MODE)
+
+    # ===== Envio =====
+
+    def _upload_batch(self, bundle: Path, remote_dir: str, names: List[str]) -> int:
+        """Arquivos pequenos em um tar, extraído no servidor em um único comando"""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+            for name in names:
+                info = tar.gettarinfo(str(bundle / name), arcname=name)
+                info.uid = info.gid = 0
+                info.mode = FILE_MODE
+                info.uname = info.gname = "root"
+                with open(bundle / name, "rb") as f:
+                    tar.addfile(info, f)
+        data = buffer.getvalue()
+
+        result = self.pool.run(self.server, f"tar -xzf - -C {shlex.quote(remote_dir)}", stdin=data, timeout=300)
+        if not result.ok:
+            raise SSHError(f"{self.server.name}: falha ao extrair arquivos em {remote_dir}: {result.stderr.strip()}")
+        return len(data)
+
+    def _upload_large(self, sftp, local_path: Path, remote_path: str, info: Dict):
+        """
+        Envio em blocos para <arquivo>.part com retomada: se já existe um .part
+        cujo conteúdo confere com o início do arquivo local, continua dali
+
+        Returns:
+            (bytes enviados, se houve retomada)
+        """
+        part = f"{remote_path}.part"
+        offset = 0
+        try:
+            offset = sftp.stat(part).st_size
+        except IOError:
+            pass
+        if offset and (offset > info["size"] or not self._same_prefix(local_path, part, offset)):
+            offset = 0
+        resumed = offset > 0
+
+        sent = 0
+        with open(local_path, "rb") as source, sftp.open(part, "r+b" if resumed else "wb") as target:
+            if not resumed:
+                target.chmod(FILE_MODE)
+            target.set_pipelined(True)
+            source.seek(offset)
+            target.seek(offset)
+            while True:
+                block = source.read(CHUNK_SIZE)
+                if not block:
+                    break
+                target.write(block)
+                sent += len(block)
+
+        if sftp.stat(part).st_size != info["size"]:
+            raise SSHError(f"{self.server.name}: envio incompleto de {local_path.name}")
+        sftp.posix_rename(part, remote_path)
+        return sent, resumed
+
+    def _same_prefix(self, local_path: Path, remote_part: str, size: int) -> bool:
+        """Compara o hash do trecho já enviado com o início do arquivo local"""
+        command = f"head -c {size} {shlex.quote(remote_part)} | sha256sum"
+        result = self.pool.run(self.server, command, timeout=120)
+        return result.ok and result.stdout.split()[:1] == [file_digest(local_path, size)]
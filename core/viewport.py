@@ -0,0 +1,66 @@
+"""
+Viewport - LivChat Setup v0.1
+Janela de rolagem do menu: só as linhas visíveis são montadas a cada frame
+"""
+
+import shutil
+
+
+class Viewport:
+    """Controla cursor e janela visível sobre uma lista de tamanho arbitrário"""
+
+    def __init__(self, total: int = 0, height: int = 10):
+        self.total = total
+        self.height = max(1, height)
+        self.cursor = 0
+        self.offset = 0
+
+    @staticmethod
+    def terminal_rows(reserved: int, minimum: int = 3) -> int:
+        """Linhas disponíveis para itens, descontando as linhas fixas do frame"""
+        rows = shutil.get_terminal_size((100, 24)).lines
+        return max(minimum, rows - reserved)
+
+    def resize(self, total: int = None, height: int = None):
+        """Atualiza tamanho da lista e/ou altura da janela mantendo o cursor visível"""
+        if total is not None:
+            self.total = total
+        if height is not None:
+            self.height = max(1, height)
+        self.move_to(self.cursor)
+
+    def move_to(self, index: int):
+        """Posiciona o cursor (limitado à lista) e rola o mínimo necessário"""
+        if self.total <= 0:
+            self.cursor = self.offset = 0
+            return
+        self.cursor = min(max(index, 0), self.total - 1)
+        if self.cursor < self.offset:
+            self.offset = self.cursor
+        elif self.cursor >= self.offset + self.height:
+            self.offset = self.cursor - self.height + 1
+        self.offset = min(self.offset, max(0, self.total - self.height))
+
+    def up(self):
+        self.move_to(self.cursor - 1)
+
+    def down(self):
+        self.move_to(self.cursor + 1)
+
+    def page_up(self):
+        self.offset = max(0, self.offset - self.height)
+        self.move_to(self.cursor - self.height)
+
+    def page_down(self):
+        self.offset = min(max(0, self.total - self.height), self.offset + self.height)
+        self.move_to(self.cursor + self.height)
+
+    def home(self):
+        self.move_to(0)
+
+    def end(self):
+        self.move_to(self.total - 1)
+
+    def visible(self) -> range:
+        """Índices visíveis na janela atual"""
+        return range(self.offset, min(self.total, self.offset + self.height))
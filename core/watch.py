@@ -0,0 +1,338 @@
+"""
+Status ao Vivo - LivChat Setup v0.1
+Tabela de stacks (réplicas, CPU, memória, último evento) para `status` e `status --watch`
+
+- réplicas vêm de uma assinatura de /events: cada evento marca só o stack
+  afetado, que é consultado de novo com um único /services filtrado
+- CPU/memória são amostrados a cada `interval` segundos (StatsCollector),
+  independente dos eventos; 0 desativa a amostragem
+- o frame é redesenhado pelo ScreenBuffer, que repinta só as linhas alteradas
+- sem fluxo de eventos, as réplicas passam a ser lidas a cada `interval`
+"""
+
+import time
+import shutil
+import threading
+from typing import Dict, List, Optional
+
+from .docker_api import DockerClient, DockerError
+from .logger import BoxDrawer
+from .screen import ScreenBuffer
+from .stats import STACK_LABEL, StatsCollector, format_mem
+from .readiness import SERVICE_LABEL
+
+# Eventos que mudam réplicas ou saúde (ignora exec_* dos healthchecks)
+WATCH_EVENTS = ["create", "update", "remove", "start", "die", "oom", "health_status"]
+# Limite de frames por segundo quando chegam rajadas de eventos
+MIN_FRAME = 0.1
+# Janela entre as duas amostras do status avulso (CPU é um delta)
+CPU_WINDOW = 1.0
+# Linhas fixas do frame: 4 de cabeçalho, 3 de rodapé e 1 de folga
+RESERVED_ROWS = 8
+
+
+class StackRow:
+    """Uma linha da tabela: estado de um stack"""
+
+    __slots__ = ("stack", "services", "running", "desired", "cpu", "mem", "event", "failed")
+
+    def __init__(self, stack: str):
+        self.stack = stack
+        self.services = 0
+        self.running = 0
+        self.desired = 0
+        self.cpu: Optional[float] = None
+        self.mem = 0
+        self.event = ""
+        self.failed = False
+
+
+def describe_event(event: Dict):
+    """(texto curto, se é falha) de um evento do Docker"""
+    action = event.get("Action") or event.get("status") or ""
+    attributes = (event.get("Actor") or {}).get("Attributes") or {}
+    service = attributes.get(SERVICE_LABEL) or attributes.get("name") or ""
+    clock = time.strftime("%H:%M:%S", time.localtime(event.get("time") or time.time()))
+
+    if event.get("Type") == "service":
+        text = {"create": "criado", "update": "atualizado", "remove": "removido"}.get(action, action)
+        return f"{clock} {service} {text}", False
+    if action == "die":
+        code = attributes.get("exitCode", "?")
+        return f"{clock} {service} parou (código {code})", code != "0"
+    if action == "oom":
+        return f"{clock} {service} sem memória", True
+    if action.startswith("health_status"):
+        health = action.partition(":")[2].strip()
+        return f"{clock} {service} {health}", health == "unhealthy"
+    if action == "start":
+        return f"{clock} {service} iniciou", False
+    return f"{clock} {service} {action}", False
+
+
+class StatusWatch:
+    """Mantém a tabela de stacks atualizada a partir de eventos e amostras"""
+
+    def __init__(self, logger, client: DockerClient = None, app: str = None, interval: float = 5.0):
+        self.logger = logger
+        self.colors = logger.colors
+        self.client = client or DockerClient()
+        self.app = app
+        self.interval = interval
+        self.collector = StatsCollector(self.client, ttl=interval or 1.0)
+        self.screen = ScreenBuffer()
+        self.box = BoxDrawer(103)
+
+        self.rows: Dict[str, StackRow] = {}
+        self._service_stack: Dict[str, str] = {}  # serviço -> stack (eventos de serviço não trazem o stack)
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._full_refresh = False
+        self._wake = threading.Event()
+        self._events_ok = False
+        self._events_conn = None
+        self._closed = False
+        self._live = False
+        self._next_poll = 0.0
+        self.events_seen = 0
+        self.refreshes = 0
+
+    # ===== Coleta =====
+
+    def _wanted(self, stack: Optional[str]) -> bool:
+        return bool(stack) and (not self.app or stack == self.app or stack.startswith(f"{self.app}_"))
+
+    def _apply_services(self, services: List[Dict], only: str = None):
+        """Recalcula réplicas a partir de /services (todos os stacks, ou só `only`)"""
+        found: Dict[str, StackRow] = {}
+        for service in services:
+            stack = (service.get("Spec", {}).get("Labels") or {}).get(STACK_LABEL)
+            if not self._wanted(stack):
+                continue
+            self._service_stack[service["Spec"]["Name"]] = stack
+            row = found.get(stack)
+            if row is None:
+                row = found[stack] = StackRow(stack)
+            status = service.get("ServiceStatus") or {}
+            row.services += 1
+            row.running += status.get("RunningTasks", 0)
+            row.desired += status.get("DesiredTasks", 0)
+
+        with self._lock:
+            stacks = [only] if only else list(set(self.rows) | set(found))
+            for stack in stacks:
+                fresh = found.get(stack)
+                if fresh is None:
+                    self.rows.pop(stack, None)
+                    continue
+                row = self.rows.setdefault(stack, StackRow(stack))
+                row.services, row.running, row.desired = fresh.services, fresh.running, fresh.desired
+
+    def refresh_all(self):
+        """Réplicas de todos os stacks em uma requisição"""
+        self.refreshes += 1
+        self._apply_services(self.client.services() or [])
+
+    def refresh_stack(self, stack: str):
+        """Réplicas de um stack só (chamado a cada evento que o afeta)"""
+        self.refreshes += 1
+        self._apply_services(self.client.services({"label": [f"{STACK_LABEL}={stack}"]}) or [], only=stack)
+
+    def sample(self):
+        """Amostra de CPU/memória de todos os containers dos stacks"""
+        stacks = self.collector.refresh()
+        with self._lock:
+            for name, row in self.rows.items():
+                stats = stacks.get(name)
+                row.cpu = stats.cpu if stats else None
+                row.mem = stats.mem if stats else 0
+
+    # ===== Eventos =====
+
+    def _stack_of(self, event: Dict) -> Optional[str]:
+        attributes = (event.get("Actor") or {}).get("Attributes") or {}
+        stack = attributes.get(STACK_LABEL)
+        if stack:
+            return stack
+        service = attributes.get(SERVICE_LABEL) or attributes.get("name") or ""
+        if service in self._service_stack:
+            return self._service_stack[service]
+        # Serviço novo: o stack é o prefixo do nome (<stack>_<serviço>)
+        return service.rpartition("_")[0] or None
+
+    def _watch_events(self):
+        filters = {"type": ["service", "container"], "event": WATCH_EVENTS}
+
+        def connected(conn):
+            if self._closed:
+                raise DockerError("tabela fechada")  # close() chegou antes da conexão
+            self._events_conn = conn
+            self._events_ok = True
+
+        try:
+            for event in self.client.events(filters, on_connect=connected):
+                self.events_seen += 1
+                stack = self._stack_of(event)
+                if not self._wanted(stack):
+                    continue
+                text, failed = describe_event(event)
+                with self._lock:
+                    row = self.rows.setdefault(stack, StackRow(stack))
+                    row.event = text
+                    row.failed = failed  # o último evento decide (start/healthy limpa a falha)
+                    self._dirty.add(stack)
+                self._wake.set()
+                if self._closed:
+                    break
+        except DockerError:
+            pass
+        finally:
+            self._events_ok = False
+            self._events_conn = None
+            with self._lock:
+                self._full_refresh = True  # pode ter perdido eventos
+            self._wake.set()
+
+    # ===== Desenho =====
+
+    def _row_line(self, row: StackRow) -> str:
+        colors = self.colors
+        replicas = f"{row.running}/{row.desired}"
+        if row.failed:
+            state = f"{colors.VERMELHO}✗ {replicas:<8}{colors.RESET}"
+        elif row.desired and row.running >= row.desired:
+            state = f"{colors.VERDE}✓ {replicas:<8}{colors.RESET}"
+        elif row.desired:
+            state = f"{colors.AMARELO}◌ {replicas:<8}{colors.RESET}"
+        else:
+            state = f"{colors.CINZA}- {replicas:<8}{colors.RESET}"
+        cpu = "-" if row.cpu is None else f"{row.cpu:.1f}%"
+        mem = format_mem(row.mem) if row.mem else "-"
+        event = row.event if len(row.event) <= 34 else row.event[:33] + "…"
+        event_color = colors.VERMELHO if row.failed else colors.CINZA
+        return self.box.line_left(
+            f"{colors.BRANCO}{row.stack[:27]:<28}{colors.RESET}{row.services:>4}   {state}"
+            f"{cpu:>8}{mem:>9}  {event_color}{event}{colors.RESET}"
+        )
+
+    def frame(self, max_rows: int = None) -> List[str]:
+        """Linhas da tabela na ordem alfabética dos stacks (a posição de cada stack é estável)"""
+        colors = self.colors
+        box = self.box
+        with self._lock:
+            rows = [self.rows[name] for name in sorted(self.rows)]
+            lines = [self._row_line(row) for row in rows[:max_rows]]
+
+        hidden = len(rows) - len(lines)
+        ok = sum(1 for row in rows if row.desired and row.running >= row.desired and not row.failed)
+        title = f"STATUS DOS SERVIÇOS{f' · {self.app}' if self.app else ''} ({len(rows)} stacks)"
+
+        header = [
+            f"{colors.CINZA}{box.top()}{colors.RESET}",
+            box.line_centered(f"{colors.BRANCO}{title}{colors.RESET}"),
+            f"{colors.CINZA}{box.separator()}{colors.RESET}",
+            box.line_left(f"{colors.CINZA}{'STACK':<28}SERV   {'RÉPLICAS':<10}{'CPU':>8}{'MEM':>9}  ÚLTIMO EVENTO{colors.RESET}"),
+        ]
+        if not rows:
+            lines = [box.line_left(f"{colors.CINZA}nenhum stack em execução{colors.RESET}")]
+        if hidden > 0:
+            lines.append(box.line_left(f"{colors.CINZA}… mais {hidden} stacks (aumente o terminal ou use --app){colors.RESET}"))
+
+        if not self._live:
+            source = "consulta única"
+        elif self._events_ok:
+            source = f"eventos ao vivo ({self.events_seen} recebidos)"
+        else:
+            source = f"réplicas lidas a cada {self.interval or 1.0:g}s"
+        if not self.interval:
+            sampling = "CPU/MEM desativados"
+        elif self._live:
+            sampling = f"CPU/MEM a cada {self.interval:g}s"
+        else:
+            sampling = f"CPU em {CPU_WINDOW:g}s"
+        footer = (f"{colors.VERDE}{ok} ok{colors.RESET} {colors.CINZA}· "
+                  f"{len(rows) - ok} com pendência · {source} · {sampling}{colors.RESET}")
+        return header + lines + [
+            f"{colors.CINZA}{box.separator()}{colors.RESET}",
+            box.line_centered(footer),
+            f"{colors.CINZA}{box.bottom()}{colors.RESET}",
+        ]
+
+    # ===== Execução =====
+
+    def snapshot(self) -> List[str]:
+        """Frame avulso (status sem --watch): réplicas e duas amostras para ter CPU"""
+        self.refresh_all()
+        if self.interval:
+            self.collector.refresh()
+            if self.rows:
+                time.sleep(CPU_WINDOW)
+            self.sample()
+        return self.frame()
+
+    def start(self):
+        """Liga a assinatura de eventos e a amostragem em segundo plano (sem desenhar)"""
+        self._live = True
+        self.refresh_all()
+        self._next_poll = time.monotonic() + (self.interval or 1.0)
+        threading.Thread(target=self._watch_events, name="docker-events", daemon=True).start()
+        if self.interval:
+            threading.Thread(target=self._sample_loop, name="docker-stats", daemon=True).start()
+
+    def update(self):
+        """Consulta de novo só os stacks marcados pelos eventos (tudo, se o fluxo caiu)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            full, self._full_refresh = self._full_refresh, False
+        if full or (not self._events_ok and time.monotonic() >= self._next_poll):
+            self.refresh_all()
+            self._next_poll = time.monotonic() + (self.interval or 1.0)
+        else:
+            for stack in dirty:
+                self.refresh_stack(stack)
+
+    def run(self):
+        """Atualiza a tabela até Ctrl+C"""
+        self.start()
+        print()
+        print("\033[?25l", end="")  # esconde o cursor
+        try:
+            while True:
+                self._wake.clear()
+                try:
+                    self.update()
+                except DockerError as e:
+                    self.logger.debug(f"status: {e}")
+
+                self.screen.render(self.frame(max_rows=self._max_rows()))
+                time.sleep(MIN_FRAME)  # junta rajadas de eventos em um frame
+                self._wake.wait(None if self._events_ok else max(0.0, self._next_poll - time.monotonic()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            print("\033[?25h", end="", flush=True)
+            self.close()
+            self.logger.debug(f"status: {self.events_seen} eventos, {self.refreshes} consultas de réplicas, "
+                              f"{self.screen.stats.summary()}")
+
+    def _sample_loop(self):
+        """CPU/memória no ritmo de --interval, fora da thread que desenha"""
+        while not self._closed:
+            started = time.monotonic()
+            self.sample()
+            self._wake.set()
+            time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    @staticmethod
+    def _max_rows() -> int:
+        return max(3, shutil.get_terminal_size((100, 24)).lines - RESERVED_ROWS)
+
+    def close(self):
+        """Encerra a assinatura de eventos"""
+        self._closed = True
+        conn = self._events_conn
+        if conn is not None and conn.sock is not None:
+            try:
+                conn.sock.shutdown(2)
+            except OSError:
+                pass
@@ -6,8 +6,6 @@ Sistema modular para deploy automatizado de aplicações Docker
 
 import os
 import sys
-import json
-from pathlib import Path
 
 # Adiciona diretório core ao path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -19,81 +17,349 @@ def check_root():
         print("\033[90mUse: sudo python3 setup.py\033[0m")
         sys.exit(1)
 
-def detect_mode():
-    """Detecta se está rodando local ou remoto"""
-    # Por enquanto sempre local, remoto será implementado depois
-    return "local"
+def detect_mode(config=None):
+    """Detecta se está rodando local ou remoto (servidor escolhido com `use`)"""
+    if config is None:
+        config = load_config()
+    return "remote" if config.get("current_server") else "local"
 
 def load_config():
-    """Carrega ou cria configuração inicial"""
-    config_path = Path("config.json")
+    """Carrega ou cria configuração inicial (aplicações ficam em config.d/)"""
+    from core.config_store import get_store
+    from core.profiler import span
+    with span("config.load"):
+        return get_store().load()
+
+def list_applications(logger, config, installed_only: bool = False):
+    """Lista aplicações do catálogo (lê apenas o índice)"""
+    from core.catalog import get_catalog
+    from core.logger import BoxDrawer
+    
+    entries = get_catalog().entries()
+    if installed_only:
+        from core.config_store import get_store
+        installed = {app_id for app_id, _ in get_store().list_instances()}
+        entries = [e for e in entries if e["id"] in installed]
+    
+    colors = logger.colors
+    box = BoxDrawer(103)
+    print(f"\n{colors.CINZA}{box.top()}{colors.RESET}")
+    title = f"{colors.BRANCO}APLICAÇÕES DISPONÍVEIS ({len(entries)}){colors.RESET}"
+    print(box.line_centered(title))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+    
+    category = None
+    for entry in entries:
+        if entry.get("category") != category:
+            category = entry.get("category")
+            print(box.line_left(f"{colors.BEGE}{category or 'Outros'}{colors.RESET}"))
+        depends = ", ".join(entry.get("depends") or []) or "-"
+        line = f"  {colors.VERDE}●{colors.RESET} {entry['id']:<16}{colors.BRANCO}{entry['name']:<32}{colors.RESET}{colors.CINZA}depende de: {depends}{colors.RESET}"
+        print(box.line_left(line))
+    
+    print(f"{colors.CINZA}{box.bottom()}{colors.RESET}")
+
+def cmd_menu(args, logger):
+    """Menu interativo (único caminho que carrega termios/TUI e o monitor Docker)"""
+    from core.menu import InteractiveMenu
+    config = load_config()
+    logger.clear()
+    menu = InteractiveMenu(logger, config, detect_mode(config))
+    menu.run()
+
+def run_fleet(args, logger, config, title, operation_name, make_operation):
+    """Executa uma operação em --servers/--all-servers e mostra o resultado agregado"""
+    import time
+    from core.fleet import FleetRunner, FleetError, resolve_targets, print_summary, print_json
+    from core.ssh import get_pool
+    
+    try:
+        targets = resolve_targets(config, args.servers, args.all_servers)
+    except FleetError as e:
+        logger.error(str(e))
+        sys.exit(1)
     
-    if config_path.exists():
-        with open(config_path, 'r') as f:
-            return json.load(f)
+    # No agente as conexões SSH continuam abertas para o próximo comando
+    agent = getattr(args, "agent", None)
+    pool = agent.ssh_pool() if agent else get_pool()
+    runner = FleetRunner(logger, parallel=args.parallel, timeout=args.timeout, pool=pool, quiet=args.json)
+    if not args.json:
+        logger.info(f"{title} em {len(targets)} servidores ({runner.parallel} por vez)")
+    start = time.monotonic()
+    try:
+        results = runner.run(targets, make_operation(pool))
+    finally:
+        if not agent:
+            pool.close_all()
+    seconds = time.monotonic() - start
+    
+    if args.json:
+        print_json(operation_name, results, seconds)
     else:
-        # Config inicial
-        config = {
-            "version": "0.1",
-            "global": {
-                "domain": "",
-                "admin_email": "",
-                "docker_network": "livchat_network"
-            },
-            "applications": {}
-        }
-        
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-        
-        return config
+        print_summary(logger, title.upper(), results, seconds)
+    if not all(result.ok for result in results):
+        sys.exit(1)
+
+def print_plan(logger, entries, title: str = "PLANO DE INSTALAÇÃO"):
+    """Tabela do diff entre o que seria publicado e o último deploy"""
+    from core.logger import BoxDrawer
+    
+    colors = logger.colors
+    box = BoxDrawer(103)
+    labels = {
+        "novo": f"{colors.AZUL}+ novo{colors.RESET}      ",
+        "alterado": f"{colors.AMARELO}~ alterado{colors.RESET}  ",
+        "ausente": f"{colors.VERMELHO}! ausente{colors.RESET}   ",
+        "inalterado": f"{colors.CINZA}= inalterado{colors.RESET}",
+    }
+    names = {"stack": "arquivos", "env": "deploy", "images": "imagens"}
+    
+    print(f"\n{colors.CINZA}{box.top()}{colors.RESET}")
+    print(box.line_centered(f"{colors.BRANCO}{title} ({len(entries)} instâncias){colors.RESET}"))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+    print(box.line_left(f"{colors.CINZA}{'STACK':<28}{'MUDANÇA':<14}DETALHE{colors.RESET}"))
+    for entry in entries:
+        detail = ", ".join(names[c] for c in entry.changes) if entry.status != "novo" else "primeiro deploy"
+        if entry.images and "images" in entry.changes:
+            detail += f" ({', '.join(entry.images)})"
+        if len(detail) > 55:
+            detail = detail[:54] + "…"
+        print(box.line_left(f"{colors.BRANCO}{entry.stack[:27]:<28}{colors.RESET}"
+                            f"{labels[entry.status]}  {colors.CINZA}{detail}{colors.RESET}"))
+    if not entries:
+        print(box.line_left(f"{colors.CINZA}nenhuma instância com stack registrada{colors.RESET}"))
+    print(f"{colors.CINZA}{box.separator()}{colors.RESET}")
+    pending = sum(1 for entry in entries if entry.pending)
+    footer = (f"{colors.AMARELO}{pending} para publicar{colors.RESET} {colors.CINZA}· "
+              f"{len(entries) - pending} inalteradas{colors.RESET}")
+    print(box.line_centered(footer))
+    print(f"{colors.CINZA}{box.bottom()}{colors.RESET}")
+
+def cmd_install(args, logger):
+    """Instalação direta pela linha de comando"""
+    from core.installer import Installer
+    config = load_config()
+    fleet = args.servers or args.all_servers
+    if not args.app and not (args.plan or args.changed or args.resume):
+        logger.error("Informe as aplicações", hint="Ex: setup.py install n8n (ou --plan / --changed / --resume)")
+        sys.exit(2)
+    if args.resume and not args.app and not fleet:
+        from core.journal import pending_run
+        from core.ssh import current_server
+        run = pending_run(current_server(config))
+        if run is None:
+            logger.info("Nenhuma instalação interrompida para continuar")
+            return
+        args.app, args.instance = run["apps"], run["instance"]
+    if fleet:
+        from core.fleet import remote_install, remote_plan
+        if args.plan or args.changed:
+            run_fleet(args, logger, config, "Plano de instalação", "plan",
+                      lambda pool: remote_plan(config, args.app, args.instance, args.jobs, apply=args.changed))
+        else:
+            title = f"Instalando {', '.join(args.app)}" if args.app else "Retomando instalações"
+            run_fleet(args, logger, config, title, "install",
+                      lambda pool: remote_install(config, args.app, args.instance, args.jobs,
+                                                  force=args.force, resume=args.resume))
+        return
+    installer = Installer(logger, config, detect_mode(config), jobs=args.jobs, force=args.force,
+                          resume=args.resume, prepull=args.prepull)
+    if args.plan or args.changed:
+        entries = installer.plan([(app_id, args.instance) for app_id in args.app] if args.app else None)
+        print_plan(logger, entries)
+        if args.plan or not any(entry.pending for entry in entries):
+            return
+        if not installer.apply(entries):
+            sys.exit(1)
+        return
+    logger.info(f"{'Retomando' if args.resume else 'Instalando'} {', '.join(args.app)}")
+    if not installer.install(args.app, instance=args.instance):
+        sys.exit(1)
+
+def cmd_list(args, logger):
+    """Listagem do catálogo (só lê o índice; config não é carregada)"""
+    list_applications(logger, None, installed_only=args.installed)
+
+def cmd_status(args, logger):
+    """Status dos serviços"""
+    config = load_config()
+    if not (args.servers or args.all_servers) and detect_mode(config) == "remote" and not args.watch:
+        args.servers = config["current_server"]
+    if args.servers or args.all_servers:
+        if args.watch:
+            logger.error("--watch acompanha o Docker local", hint="Rode status --watch no próprio servidor")
+            sys.exit(1)
+        from core.fleet import remote_status
+        run_fleet(args, logger, config, "Status dos serviços", "status",
+                  lambda pool: remote_status(pool, args.app))
+        return
+    
+    from core.docker_api import DockerClient, DockerError
+    from core.watch import StatusWatch
+    
+    agent = getattr(args, "agent", None)
+    client = agent.docker() if agent else DockerClient()
+    if not client.available():
+        logger.error(f"Socket do Docker não encontrado: {client.socket_path}",
+                     hint="Verifique se o Docker está instalado e em execução")
+        sys.exit(1)
+    
+    interval = max(0.0, args.interval)
+    try:
+        if agent:
+            # Tabela mantida pelos eventos desde a primeira consulta: só monta o frame
+            for line in ["", *agent.watch(args.app, interval).frame()]:
+                print(line)
+            return
+        watch = StatusWatch(logger, client, app=args.app, interval=interval)
+        if args.watch:
+            watch.run()
+        else:
+            for line in ["", *watch.snapshot()]:
+                print(line)
+    except DockerError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+def cmd_add_server(args, logger):
+    """Cadastra um servidor remoto depois de testar a conexão SSH"""
+    from getpass import getpass
+    from core.config_store import get_store
+    from core.ssh import ServerInfo, SSHError, get_pool
+    
+    password = getpass(f"Senha SSH de {args.user}@{args.host}: ") if args.password else None
+    # A senha só serve para testar agora; o config.json guarda apenas ask_password
+    server = ServerInfo(args.name, args.host, args.port, args.user, args.key_filename,
+                        password, ask_password=args.password)
+    
+    logger.info(f"Conectando em {args.user}@{args.host}:{args.port}")
+    pool = get_pool()
+    try:
+        result = pool.run(server, "uname -sr", timeout=15)
+    except SSHError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    finally:
+        pool.close_all()
+    logger.success(f"Conectado: {result.stdout.strip() or args.host}")
+    
+    def add(data):
+        data.setdefault("servers", {})[args.name] = server.to_config()
+    get_store().update(add)
+    logger.success(f"Servidor {args.name} adicionado (use: setup.py use {args.name})")
+
+def cmd_use(args, logger):
+    """Seleciona o servidor dos próximos comandos ("local" volta ao modo local)"""
+    from core.config_store import get_store
+    
+    config = load_config()
+    name = None if args.server == "local" else args.server
+    if name and name not in (config.get("servers") or {}):
+        logger.error(f"Servidor desconhecido: {name}")
+        sys.exit(1)
+    
+    def select(data):
+        data["current_server"] = name
+    get_store().update(select)
+    logger.success(f"Usando {name}" if name else "Usando modo local")
+
+def cmd_agent(args, logger):
+    """Agente residente (list/status passam a ser atendidos por ele) e seu controle"""
+    from core.agent_client import AGENT_SOCKET, AgentError, control
+    
+    try:
+        if args.action == "stop":
+            control("stop")
+            logger.success("Agente encerrado")
+        elif args.action == "info":
+            info = control("info")
+            ssh = info["ssh"]
+            logger.info(f"Agente pid {info['pid']} · no ar há {info['uptime']:.0f}s · "
+                        f"{info['served']} comandos atendidos")
+            logger.info(f"Status em cache: {', '.join(info['watches']) or 'nenhum'} · "
+                        f"conexões SSH: {ssh.get('connections', 0)}")
+        else:
+            from core.agent import Agent
+            logger.info(f"Agente atendendo em {AGENT_SOCKET} (Ctrl+C encerra)")
+            Agent(logger, COMMANDS).serve()
+            logger.success("Agente encerrado")
+    except AgentError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+# Subcomando -> handler; cada handler importa só os módulos de que precisa
+COMMANDS = {
+    None: cmd_menu,
+    "install": cmd_install,
+    "list": cmd_list,
+    "status": cmd_status,
+    "add-server": cmd_add_server,
+    "use": cmd_use,
+    "agent": cmd_agent,
+}
+
+def run_profiled(handler, args, logger):
+    """Executa o comando com spans ligados; no fim mostra as fases e grava o trace"""
+    import time
+    from core import profiler
+    
+    label = f"setup.py {args.command or 'menu'}"
+    profiler.enable(label)
+    start = time.perf_counter()
+    try:
+        with profiler.span(label):
+            handler(args, logger)
+    finally:
+        wall = time.perf_counter() - start
+        collected = profiler.disable()
+        path = os.path.relpath(collected.write(args.profile_out))
+        profiler.print_summary(logger, collected, wall, path)
 
 def main():
     """Função principal"""
     try:
-        # Importa módulos após verificações
+        # list/status vão para o agente residente, se estiver no ar (senão rodam aqui);
+        # o cliente não carrega nem o parser
+        from core.agent_client import AgentError, forward, wants_agent
+        if wants_agent(sys.argv[1:]):
+            try:
+                code = forward(sys.argv[1:])
+            except AgentError as e:
+                # Agente caiu no meio: list/status só leem, então roda de novo aqui
+                print(f"\033[90m{e}; executando sem o agente\033[0m", file=sys.stderr)
+                code = None
+            if code is not None:
+                sys.exit(code)
+        
+        # Só o parser é importado antes de saber o comando (--version/--help saem aqui)
         from core.cli import CLIParser
-        from core.logger import Logger
-        from core.menu import InteractiveMenu
         
         # Parse argumentos
         parser = CLIParser()
         args = parser.parse_args()
         
-        # Configura logger
-        logger = Logger(dev_mode=args.dev)
+        # Configura logger (eventos estruturados vão para config.d/logs/events.jsonl)
+        from core.logger import Logger
+        from core.events import EventSink
+        logger = Logger(dev_mode=args.dev, events=EventSink())
         
         # Verifica root
         check_root()
         
-        # Carrega config
-        config = load_config()
-        
-        # Detecta modo
-        mode = detect_mode()
-        
-        # Se não passou comando específico, mostra menu
-        if args.command is None:
-            logger.clear()
-            menu = InteractiveMenu(logger, config, mode)
-            menu.run()
+        handler = COMMANDS.get(args.command)
+        if handler is None:
+            logger.error(f"Comando desconhecido: {args.command}")
+            sys.exit(1)
+        if args.profile or args.profile_out:
+            run_profiled(handler, args, logger)
         else:
-            # Executa comando específico (implementar depois)
-            if args.command == "install":
-                logger.info(f"Instalando {args.app}")
-                # TODO: Implementar instalação direta
-            elif args.command == "list":
-                logger.info("Listando aplicações disponíveis")
-                # TODO: Implementar listagem
-            elif args.command == "status":
-                logger.info("Verificando status dos serviços")
-                # TODO: Implementar status
-            else:
-                logger.error(f"Comando desconhecido: {args.command}")
-                sys.exit(1)
+            handler(args, logger)
         
     except KeyboardInterrupt:
         print("\n\033[90m\nInstalação cancelada pelo usuário\033[0m")
+        if "core.journal" in sys.modules:
+            # Uma instalação chegou a começar: o diário guarda o que já foi feito
+            print("\033[90mPara continuar de onde parou: setup.py install --resume\033[0m")
         sys.exit(0)
     except ImportError as e:
         print(f"\033[91m✗ Erro ao importar módulo: {e}\033[0m")
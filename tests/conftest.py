@@ -0,0 +1,22 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.fakes.engine import FakeEngine  # noqa: E402
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Diretório de trabalho vazio (config.json, config.d/ e .cache/ são relativos ao cwd)"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Engine API falsa num unix socket temporário"""
+    with FakeEngine(str(tmp_path / "docker.sock")) as fake:
+        yield fake
@@ -0,0 +1,8 @@
+"""
+Dublês dos serviços externos usados nos testes
+
+- engine: Docker Engine API num unix socket (serviços, containers, eventos,
+  imagens e /images/create)
+- registry: registry com imagens, camadas e login, consultado pelo engine
+- ssh_server: servidor SSH (paramiko) que executa os comandos localmente
+"""
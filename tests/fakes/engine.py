@@ -0,0 +1,239 @@
+"""
+Engine API falsa - servidor HTTP num unix socket com o subconjunto da
+Docker Engine API que o setup usa
+"""
+
+import os
+import json
+import queue
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+STACK_LABEL = "com.docker.stack.namespace"
+SERVICE_LABEL = "com.docker.swarm.service.name"
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class FakeEngine:
+    """
+    Estado do "daemon" manipulado pelo teste:
+
+    - services: nome -> {stack, running, desired, update} (update: State ou o
+      UpdateStatus inteiro)
+    - health: serviço -> "healthy" | "starting" | "unhealthy"
+    - images: referência -> id das imagens locais
+    - registry: FakeRegistry consultado por /images/create (None = tudo 404)
+    - calls: (método, caminho) de cada requisição recebida
+    """
+
+    def __init__(self, path: str, registry=None):
+        self.path = path
+        self.registry = registry
+        self.services: Dict[str, Dict] = {}
+        self.health: Dict[str, str] = {}
+        self.images: Dict[str, str] = {}
+        self.calls: List[tuple] = []
+        self.pull_headers: List[Dict[str, str]] = []
+        self.events_enabled = True
+        self._subscribers: List[queue.Queue] = []
+        self._server: Optional[_Server] = None
+
+    # ===== Estado =====
+
+    def set_service(self, name: str, stack: str, running: int, desired: int,
+                    health: str = None, update: str = None):
+        """Cria/atualiza um serviço e publica o evento correspondente"""
+        self.services[name] = {"stack": stack, "running": running, "desired": desired, "update": update}
+        if health:
+            self.health[name] = health
+        self.publish({"Type": "service", "Action": "update", "Actor": {"Attributes": {"name": name}}})
+
+    def set_health(self, name: str, health: str):
+        self.health[name] = health
+        stack = self.services[name]["stack"]
+        self.publish({"Type": "container", "Action": f"health_status: {health}",
+                      "Actor": {"Attributes": {STACK_LABEL: stack, SERVICE_LABEL: name}}})
+
+    def publish(self, event: Dict):
+        for subscriber in list(self._subscribers):
+            subscriber.put(event)
+
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    # ===== Ciclo de vida =====
+
+    def start(self) -> "FakeEngine":
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        engine = self
+
+        class Handler(_Handler):
+            pass
+        Handler.engine = engine
+        self._server = _Server(self.path, Handler)
+        threading.Thread(target=self._server.serve_forever, args=(0.05,), name="fake-engine", daemon=True).start()
+        return self
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for subscriber in list(self._subscribers):
+            subscriber.put(None)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    engine: FakeEngine = None
+
+    def log_message(self, *args):
+        pass
+
+    def address_string(self):
+        return "unix"
+
+    # ===== Respostas =====
+
+    def _json(self, obj, status: int = 200):
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _chunk(self, obj):
+        data = (json.dumps(obj) + "\n").encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def _stack_filter(self, query) -> Optional[str]:
+        if "filters" not in query:
+            return None
+        for label in json.loads(query["filters"][0]).get("label", []):
+            key, _, value = label.partition("=")
+            if key == STACK_LABEL and value:
+                return value
+        return None
+
+    # ===== Endpoints =====
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        path = url.path
+        engine = self.engine
+        engine.calls.append(("GET", path))
+
+        if path == "/services":
+            stack = self._stack_filter(query)
+            self._json([self._service(name, spec) for name, spec in list(engine.services.items())
+                        if stack is None or spec["stack"] == stack])
+        elif path == "/containers/json":
+            stack = self._stack_filter(query)
+            self._json([container for name, spec in list(engine.services.items())
+                        if stack is None or spec["stack"] == stack
+                        for container in self._containers(name, spec)])
+        elif path.startswith("/containers/") and path.endswith("/stats"):
+            self._json({"memory_stats": {"usage": 64 * 1024 * 1024, "stats": {"inactive_file": 0}},
+                        "cpu_stats": {"cpu_usage": {"total_usage": 1000}, "system_cpu_usage": 100000,
+                                      "online_cpus": 1}})
+        elif path.startswith("/images/") and path.endswith("/json"):
+            ref = unquote(path[len("/images/"):-len("/json")])
+            if ref in engine.images:
+                self._json({"Id": engine.images[ref]})
+            else:
+                self._json({"message": f"No such image: {ref}"}, 404)
+        elif path == "/events" and engine.events_enabled:
+            self._events()
+        else:
+            self._json({"message": "page not found"}, 404)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        engine = self.engine
+        engine.calls.append(("POST", url.path))
+        if url.path != "/images/create":
+            return self._json({"message": "page not found"}, 404)
+        query = parse_qs(url.query)
+        ref = query["fromImage"][0] + (f":{query['tag'][0]}" if "tag" in query else "")
+        engine.pull_headers.append(dict(self.headers))
+        registry = engine.registry
+        if registry is None:
+            return self._json({"message": f"pull access denied for {ref}"}, 404)
+        layers, error = registry.resolve(ref, self.headers.get("X-Registry-Auth"))
+        if error:
+            return self._json({"message": error}, 404 if "not found" in error else 401)
+
+        self._start_stream()
+        self._chunk({"status": f"Pulling from {ref}", "id": ref.rsplit(":", 1)[-1]})
+        for layer, size in layers:
+            for part in (1, 2, 4):
+                self._chunk({"status": "Downloading", "id": layer,
+                             "progressDetail": {"current": size * part // 4, "total": size}})
+            self._chunk({"status": "Pull complete", "id": layer, "progressDetail": {}})
+        engine.images[ref] = f"sha256:{layers[-1][0] if layers else 'empty'}"
+        self._chunk({"status": f"Status: Downloaded newer image for {ref}"})
+        self._end_stream()
+
+    def _service(self, name: str, spec: Dict) -> Dict:
+        service = {
+            "ID": f"id-{name}",
+            "Spec": {"Name": name, "Labels": {STACK_LABEL: spec["stack"]}},
+            "ServiceStatus": {"RunningTasks": spec["running"], "DesiredTasks": spec["desired"]},
+        }
+        if spec.get("update"):
+            update = spec["update"]
+            service["UpdateStatus"] = dict(update) if isinstance(update, dict) else {"State": update}
+        return service
+
+    def _containers(self, name: str, spec: Dict) -> List[Dict]:
+        health = self.engine.health.get(name)
+        status = "Up 1 second"
+        if health == "starting":
+            status += " (health: starting)"
+        elif health:
+            status += f" ({health})"
+        return [{"Id": f"{name}.{i}", "Status": status,
+                 "Labels": {STACK_LABEL: spec["stack"], SERVICE_LABEL: name}}
+                for i in range(spec["running"])]
+
+    def _events(self):
+        subscriber: queue.Queue = queue.Queue()
+        self.engine._subscribers.append(subscriber)
+        try:
+            self._start_stream()
+            while True:
+                event = subscriber.get()
+                if event is None:
+                    break
+                self._chunk(event)
+        except OSError:
+            pass
+        finally:
+            self.engine._subscribers.remove(subscriber)
+            self.close_connection = True
@@ -0,0 +1,48 @@
+"""
+Registry falso - imagens com camadas e, opcionalmente, login obrigatório.
+O engine falso consulta o registry em /images/create, verificando o
+cabeçalho X-Registry-Auth como o daemon faz com um registry privado.
+"""
+
+import json
+import base64
+from typing import Dict, List, Optional, Tuple
+
+
+class FakeRegistry:
+    """Imagens disponíveis para download e credenciais exigidas (por host)"""
+
+    def __init__(self):
+        self.images: Dict[str, List[Tuple[str, int]]] = {}
+        self.credentials: Dict[str, Tuple[str, str]] = {}  # host -> (usuário, senha)
+
+    def add(self, ref: str, layers: List[Tuple[str, int]]):
+        """ref sem docker.io/library (ex.: nginx:1.25, registry.example.com/app:1)"""
+        self.images[ref] = list(layers)
+
+    def require_login(self, host: str, username: str, password: str):
+        self.credentials[host] = (username, password)
+
+    @staticmethod
+    def _short(ref: str) -> str:
+        for prefix in ("docker.io/library/", "docker.io/"):
+            if ref.startswith(prefix):
+                return ref[len(prefix):]
+        return ref
+
+    def resolve(self, ref: str, auth_header: Optional[str]):
+        """(camadas, erro) para um pedido de download"""
+        ref = self._short(ref)
+        host = ref.split("/", 1)[0] if "/" in ref and "." in ref.split("/", 1)[0] else "docker.io"
+        if host in self.credentials:
+            if not auth_header:
+                return None, f"pull access denied for {ref}: no basic auth credentials"
+            try:
+                auth = json.loads(base64.urlsafe_b64decode(auth_header + "=" * (-len(auth_header) % 4)))
+            except ValueError:
+                return None, "invalid X-Registry-Auth header"
+            if (auth.get("username"), auth.get("password")) != self.credentials[host]:
+                return None, f"pull access denied for {ref}: unauthorized"
+        if ref not in self.images:
+            return None, f"manifest for {ref} not found"
+        return self.images[ref], None
@@ -0,0 +1,163 @@
+"""
+Servidor SSH falso (paramiko) - aceita senha, executa cada comando com
+`sh -c` na máquina local e fala SFTP no diretório real. Só é importado por
+testes que já fizeram pytest.importorskip("paramiko").
+"""
+
+import os
+import socket
+import threading
+import subprocess
+from typing import List
+
+import paramiko
+
+
+class _Interface(paramiko.ServerInterface):
+    def __init__(self, server: "FakeSSHServer"):
+        self.server = server
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (self.server.username, self.server.password):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        return paramiko.OPEN_SUCCEEDED
+
+    def check_channel_exec_request(self, channel, command):
+        self.server.commands.append(command.decode())
+        threading.Thread(target=self._execute, args=(channel, command), daemon=True).start()
+        return True
+
+    def _execute(self, channel, command: bytes):
+        stdin = b""
+        # Comandos que leem o script/arquivo pela entrada padrão
+        if command == b"sh -s" or command.startswith(b"tar -x"):
+            while True:
+                data = channel.recv(65536)
+                if not data:
+                    break
+                stdin += data
+        result = subprocess.run(["sh", "-c", command.decode()], capture_output=True, input=stdin,
+                                env=dict(os.environ, **self.server.env))
+        channel.sendall(result.stdout)
+        channel.sendall_stderr(result.stderr)
+        channel.send_exit_status(result.returncode)
+        channel.close()
+
+
+class _Handle(paramiko.SFTPHandle):
+    def stat(self):
+        return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+    def chattr(self, attr):
+        if attr.st_mode is not None:
+            os.fchmod(self.readfile.fileno(), attr.st_mode & 0o7777)
+        return paramiko.SFTP_OK
+
+
+class _SFTP(paramiko.SFTPServerInterface):
+    def open(self, path, flags, attr):
+        fd = os.open(path, flags, 0o644)
+        if flags & os.O_APPEND:
+            mode = "ab"
+        elif flags & os.O_RDWR:
+            mode = "r+b"
+        else:
+            mode = "wb" if flags & os.O_WRONLY else "rb"
+        handle = _Handle(flags)
+        handle.filename = path
+        handle.readfile = handle.writefile = os.fdopen(fd, mode)
+        return handle
+
+    def stat(self, path):
+        try:
+            return paramiko.SFTPAttributes.from_stat(os.stat(path))
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    lstat = stat
+
+    def mkdir(self, path, attr):
+        # Como o sftp-server: o modo pedido passa pelo umask
+        os.mkdir(path, attr.st_mode & 0o7777 if attr.st_mode is not None else 0o777)
+        return paramiko.SFTP_OK
+
+    def chattr(self, path, attr):
+        if attr.st_mode is not None:
+            os.chmod(path, attr.st_mode & 0o7777)
+        return paramiko.SFTP_OK
+
+    def remove(self, path):
+        try:
+            os.remove(path)
+            return paramiko.SFTP_OK
+        except OSError as e:
+            return paramiko.SFTPServer.convert_errno(e.errno)
+
+    def posix_rename(self, oldpath, newpath):
+        os.replace(oldpath, newpath)
+        return paramiko.SFTP_OK
+
+    rename = posix_rename
+
+
+class FakeSSHServer:
+    """Escuta em 127.0.0.1 numa porta livre; `handshakes` conta as conexões aceitas"""
+
+    host_key = None
+
+    def __init__(self, username: str = "root", password: str = "secret", env: dict = None):
+        self.username = username
+        self.password = password
+        self.env = env or {}
+        self.commands: List[str] = []
+        self.handshakes = 0
+        self.port = 0
+        self._socket = None
+        self._transports: List[paramiko.Transport] = []
+        if FakeSSHServer.host_key is None:
+            FakeSSHServer.host_key = paramiko.RSAKey.generate(2048)
+
+    def start(self) -> "FakeSSHServer":
+        self._socket = socket.socket()
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(50)
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._accept, name="fake-ssh", daemon=True).start()
+        return self
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._socket.accept()
+            except OSError:
+                return
+            self.handshakes += 1
+            transport = paramiko.Transport(conn)
+            transport.add_server_key(self.host_key)
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer, _SFTP)
+            transport.start_server(server=_Interface(self))
+            self._transports.append(transport)
+
+    def drop_connections(self):
+        """Derruba as conexões abertas (queda de rede); continua aceitando novas"""
+        for transport in self._transports:
+            transport.close()
+
+    def close(self):
+        if self._socket is not None:
+            self._socket.close()
+        for transport in self._transports:
+            transport.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,118 @@
+import io
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from core import watch as watch_module
+from core.agent import Agent
+from core.agent_client import AgentError, forward
+from core.logger import Logger
+
+SETUP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "setup.py")
+
+
+class FakeWatch:
+    def __init__(self, logger, client, app=None, interval=5.0):
+        self.app = app
+        self.closed = False
+
+    def snapshot(self):
+        return []
+
+    def start(self):
+        pass
+
+    def update(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def agent(workdir, monkeypatch):
+    monkeypatch.setattr(watch_module, "StatusWatch", FakeWatch)
+    agent = Agent(Logger(stream=io.StringIO()), {}, socket_path=str(workdir / "agent.sock"), max_watches=2)
+    agent._client = object()
+    return agent
+
+
+def test_least_recently_used_watch_is_closed(agent):
+    first = agent.watch("n8n", 5.0)
+    second = agent.watch("postgres", 5.0)
+    assert agent.watch("n8n", 5.0) is first  # reaproveitada: vira a mais usada
+    third = agent.watch(None, 5.0)
+
+    assert second.closed and not first.closed and not third.closed
+    assert list(agent._watches) == [("n8n", 5.0), (None, 5.0)]
+
+
+def test_idle_watches_are_closed(agent):
+    idle = agent.watch("n8n", 5.0)
+    agent._watch_used[("n8n", 5.0)] -= agent.watch_idle + 1
+    agent.evict_watches()
+    assert idle.closed and not agent._watches
+
+
+def serve_once(path, reply: bytes):
+    """Agente falso: lê o pedido, manda `reply` e derruba a conexão"""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+
+    def run():
+        conn, _ = server.accept()
+        conn.makefile("rb").readline()
+        conn.sendall(reply)
+        conn.close()
+        server.close()
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+@pytest.mark.parametrize("reply", [b'{"out": "parcial\\n"}\n', b"{corrompido\n"])
+def test_dropped_connection_raises_agent_error(workdir, capsys, reply):
+    path = str(workdir / "agent.sock")
+    serve_once(path, reply)
+    with pytest.raises(AgentError):
+        forward(["list"], socket_path=path)
+
+
+def test_fallback_reply_runs_in_process(workdir):
+    path = str(workdir / "agent.sock")
+    serve_once(path, json.dumps({"fallback": True}).encode() + b"\n")
+    assert forward(["list"], socket_path=path) is None
+
+
+@pytest.mark.skipif(os.geteuid() != 0, reason="setup.py exige root")
+def test_agent_serves_list_like_the_cli(tmp_path):
+    def setup(*argv):
+        return subprocess.run([sys.executable, SETUP, *argv], cwd=tmp_path, capture_output=True,
+                              text=True, timeout=30)
+
+    agent = subprocess.Popen([sys.executable, SETUP, "agent"], cwd=tmp_path,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        socket_path = tmp_path / "config.d" / "agent.sock"
+        deadline = time.monotonic() + 15
+        while not socket_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert socket_path.exists()
+
+        served = setup("list")
+        local = setup("--no-agent", "list")
+        assert served.returncode == local.returncode == 0
+        assert served.stdout == local.stdout
+        assert "1 comandos atendidos" in setup("agent", "info").stdout
+    finally:
+        setup("agent", "stop")
+        try:
+            agent.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            agent.kill()
@@ -0,0 +1,67 @@
+import subprocess
+
+from core.batch import MARK, MarkerParser, compile_script
+from core.steps import Step
+
+NONCE = "abc123"
+
+
+def run(steps, chunk_size=7):
+    """Executa o script num sh de verdade e alimenta o parser em pedaços pequenos"""
+    reported = []
+    parser = MarkerParser(steps, NONCE, reported.append)
+    result = subprocess.run(["sh", "-s"], input=compile_script(steps, NONCE).encode(),
+                            capture_output=True)
+    for i in range(0, len(result.stdout), chunk_size):
+        parser.feed(result.stdout[i:i + chunk_size])
+    parser.close(result.returncode)
+    return parser.results, reported, result.returncode
+
+
+def test_each_step_gets_its_own_output_and_code():
+    steps = [Step("one", "Um", "echo primeiro; echo erro >&2"),
+             Step("two", "Dois", "printf 'sem quebra'"),
+             Step("three", "Três", "true")]
+    results, reported, code = run(steps)
+
+    assert code == 0
+    assert [r.code for r in results] == [0, 0, 0]
+    assert results[0].output == "primeiro\nerro"
+    assert results[1].output == "sem quebra"
+    assert results[2].output == ""
+    assert [r.step.key for r in reported] == ["one", "two", "three"]
+
+
+def test_script_stops_at_the_first_failure():
+    steps = [Step("ok", "Ok", "echo ok"),
+             Step("fail", "Falha", "echo quebrou; exit 3"),
+             Step("never", "Nunca", "echo nunca")]
+    results, reported, code = run(steps)
+
+    assert code == 3
+    assert [r.code for r in results] == [0, 3, None]
+    assert results[1].output == "quebrou"
+    assert not results[2].ok
+    assert len(reported) == 2
+
+
+def test_steps_do_not_read_the_script_from_stdin():
+    steps = [Step("cat", "Lê stdin", "cat"), Step("after", "Depois", "echo depois")]
+    results, _, _ = run(steps)
+    assert results[0].output == ""
+    assert results[1].output == "depois"
+
+
+def test_missing_end_marker_takes_the_exit_code():
+    steps = [Step("killed", "Morto", "sleep 10")]
+    parser = MarkerParser(steps, NONCE)
+    parser.feed(f"{MARK}{NONCE} begin 0\nparcial".encode())
+    parser.close(137)
+    assert parser.results[0].code == 137
+    assert parser.results[0].output == "parcial"
+
+
+def test_output_resembling_another_nonce_is_kept():
+    parser = MarkerParser([Step("a", "A", "x")], NONCE)
+    parser.feed(f"{MARK}{NONCE} begin 0\n{MARK}other end 0 0\n{MARK}{NONCE} end 0 0\n".encode())
+    assert parser.results[0].output == f"{MARK}other end 0 0"
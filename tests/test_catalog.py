@@ -0,0 +1,83 @@
+import json
+import os
+
+import pytest
+
+from core.catalog import Catalog, CatalogError
+
+
+def write_app(apps, app_id, **fields):
+    definition = dict({"id": app_id, "name": app_id.title(), "order": 1, "depends": []}, **fields)
+    (apps / f"{app_id}.json").write_text(json.dumps(definition))
+
+
+@pytest.fixture
+def apps(tmp_path):
+    apps = tmp_path / "apps"
+    apps.mkdir()
+    write_app(apps, "redis", order=2)
+    write_app(apps, "postgres", order=1)
+    return apps
+
+
+def catalog(tmp_path):
+    return Catalog(apps_dir=tmp_path / "apps", index_path=tmp_path / "cache" / "index.json")
+
+
+def test_entries_follow_menu_order_and_load_is_lazy(tmp_path, apps):
+    cat = catalog(tmp_path)
+    assert [e["id"] for e in cat.entries()] == ["postgres", "redis"]
+    assert cat.load("redis")["name"] == "Redis"
+    with pytest.raises(CatalogError):
+        cat.load("nada")
+
+
+def test_unchanged_files_are_not_read_again(tmp_path, apps, monkeypatch):
+    catalog(tmp_path).entries()
+
+    def no_read(self, name):
+        raise AssertionError(f"{name} lido com o índice válido")
+
+    monkeypatch.setattr(Catalog, "_read", no_read)
+    assert [e["id"] for e in catalog(tmp_path).entries()] == ["postgres", "redis"]
+
+
+def test_added_and_removed_files_are_seen(tmp_path, apps):
+    catalog(tmp_path).entries()
+    write_app(apps, "n8n", order=3, depends=["postgres"])
+    cat = catalog(tmp_path)
+    assert cat.entry("n8n")["depends"] == ["postgres"]
+
+    (apps / "redis.json").unlink()
+    assert [e["id"] for e in catalog(tmp_path).entries()] == ["postgres", "n8n"]
+
+
+def test_atomic_replace_is_seen(tmp_path, apps):
+    catalog(tmp_path).entries()
+    tmp = apps / "redis.json.tmp"
+    tmp.write_text(json.dumps({"id": "redis", "name": "Redis 7", "order": 2}))
+    os.replace(tmp, apps / "redis.json")
+    assert catalog(tmp_path).entry("redis")["name"] == "Redis 7"
+
+
+def test_in_place_edit_is_seen(tmp_path, apps):
+    catalog(tmp_path).entries()
+    directory = os.stat(apps)
+    before = os.stat(apps / "redis.json")
+    with open(apps / "redis.json", "r+") as f:  # mesmo inode e mesmo tamanho: só o mtime muda
+        text = f.read().replace('"Redis"', '"Rediz"')
+        f.seek(0)
+        f.write(text)
+    os.utime(apps / "redis.json", ns=(before.st_atime_ns, before.st_mtime_ns + 1_000_000_000))
+    os.utime(apps, ns=(directory.st_atime_ns, directory.st_mtime_ns))
+
+    assert catalog(tmp_path).entry("redis")["name"] == "Rediz"
+
+
+def test_touched_file_with_same_content_keeps_its_entry(tmp_path, apps):
+    catalog(tmp_path).entries()
+    os.utime(apps / "redis.json", ns=(0, 10**18))
+    cat = catalog(tmp_path)
+    assert cat.entry("redis")["name"] == "Redis"
+    index = json.loads((tmp_path / "cache" / "index.json").read_text())
+    assert index["files"]["redis.json"]["mtime_ns"] == 10**18
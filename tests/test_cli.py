@@ -0,0 +1,40 @@
+from core.agent_client import eligible, wants_agent
+from core.cli import CLIParser
+
+
+def parse(argv):
+    return CLIParser().parse_args(argv)
+
+
+def test_profile_does_not_swallow_the_subcommand():
+    args = parse(["--profile", "install", "n8n"])
+    assert args.profile is True
+    assert args.profile_out is None
+    assert args.command == "install"
+    assert args.app == ["n8n"]
+
+    args = parse(["--profile", "list"])
+    assert args.profile is True
+    assert args.command == "list"
+
+
+def test_profile_out_takes_the_trace_path():
+    args = parse(["--profile-out", "n8n.json", "install", "n8n"])
+    assert args.profile_out == "n8n.json"
+    assert args.command == "install"
+
+
+def test_without_profile():
+    args = parse(["status"])
+    assert args.profile is False
+    assert args.profile_out is None
+
+
+def test_profiled_commands_stay_in_process():
+    assert wants_agent(["status"])
+    assert not wants_agent(["--profile", "status"])
+    assert not wants_agent(["--profile-out=x.json", "list"])
+    assert not wants_agent(["--profile-out", "x.json", "list"])
+    assert eligible(parse(["list"]))
+    assert not eligible(parse(["--profile", "list"]))
+    assert not eligible(parse(["--profile-out", "x.json", "list"]))
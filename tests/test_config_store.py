@@ -0,0 +1,109 @@
+import json
+import threading
+
+import pytest
+
+from core.config_store import ConfigError, ConfigStore
+
+
+def store(tmp_path):
+    return ConfigStore(tmp_path / "config.json")
+
+
+def test_load_creates_default_config(tmp_path):
+    data = store(tmp_path).load()
+    assert data["global"]["docker_network"] == "livchat_network"
+    assert (tmp_path / "config.json").exists()
+
+
+def test_instances_live_in_shards(tmp_path):
+    config = store(tmp_path)
+    config.put_instance("n8n", "default", {"stack": "n8n"})
+    config.put_instance("n8n", "dev", {"stack": "n8n_dev"})
+    config.put_instance("postgres", "default", {"stack": "postgres"})
+
+    assert (tmp_path / "config.d" / "applications" / "n8n" / "dev.json").exists()
+    assert config.get_instance("n8n", "dev") == {"stack": "n8n_dev"}
+    assert config.get_instance("n8n", "missing") is None
+    assert config.list_instances() == [("n8n", "default"), ("n8n", "dev"), ("postgres", "default")]
+    assert config.list_instances("postgres") == [("postgres", "default")]
+    assert config.delete_instance("n8n", "dev")
+    assert not config.delete_instance("n8n", "dev")
+    assert config.export()["applications"]["n8n"]["instances"] == {"default": {"stack": "n8n"}}
+
+
+def test_invalid_names_are_rejected(tmp_path):
+    with pytest.raises(ConfigError):
+        store(tmp_path).put_instance("../etc", "default", {})
+    with pytest.raises(ConfigError):
+        store(tmp_path).get_instance("n8n", ".hidden")
+
+
+def test_concurrent_updates_do_not_lose_writes(tmp_path):
+    config = store(tmp_path)
+    config.put_instance("n8n", "default", {"count": 0})
+
+    def bump():
+        for _ in range(20):
+            config.update_instance("n8n", "default", lambda record: record.update(count=record["count"] + 1))
+
+    def bump_global():
+        for _ in range(20):
+            config.update(lambda data: data.update(counter=data.get("counter", 0) + 1))
+
+    threads = [threading.Thread(target=bump) for _ in range(4)] + \
+              [threading.Thread(target=bump_global) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert config.get_instance("n8n", "default")["count"] == 80
+    assert config.load()["counter"] == 80
+
+
+def test_legacy_applications_are_imported_once(tmp_path):
+    (tmp_path / "config.json").write_text(json.dumps({
+        "global": {"domain": "example.com"},
+        "applications": {
+            "postgres": {"password": "x"},
+            "n8n": {"instances": {"dev": {"stack": "n8n_dev"}}},
+        },
+    }))
+    config = store(tmp_path)
+    config.put_instance("postgres", "default", {"password": "already-sharded"})
+
+    data = config.load()
+
+    assert data["applications"] == {}
+    assert data["global"]["domain"] == "example.com"
+    assert config.get_instance("n8n", "dev") == {"stack": "n8n_dev"}
+    # Registro que já existia nos shards não é sobrescrito
+    assert config.get_instance("postgres", "default") == {"password": "already-sharded"}
+    assert json.loads((tmp_path / "config.json").read_text())["applications"] == {}
+
+
+def test_invalid_json_raises_config_error(tmp_path):
+    (tmp_path / "config.json").write_text("{")
+    with pytest.raises(ConfigError):
+        store(tmp_path).load()
+
+
+def test_files_are_written_owner_only(tmp_path):
+    config = store(tmp_path)
+    config.load()
+    config.put_instance("postgres", "default", {"password": "x"})
+    assert (tmp_path / "config.json").stat().st_mode & 0o777 == 0o600
+    shard = tmp_path / "config.d" / "applications" / "postgres" / "default.json"
+    assert shard.stat().st_mode & 0o777 == 0o600
+
+
+def test_stored_ssh_passwords_are_dropped(tmp_path):
+    (tmp_path / "config.json").write_text(json.dumps({
+        "servers": {"vps1": {"host": "203.0.113.10", "password": "hunter2"},
+                    "vps2": {"host": "203.0.113.11"}},
+    }))
+    data = store(tmp_path).load()
+    assert data["servers"]["vps1"] == {"host": "203.0.113.10", "ask_password": True}
+    assert "hunter2" not in (tmp_path / "config.json").read_text()
+    assert data["servers"]["vps2"] == {"host": "203.0.113.11"}
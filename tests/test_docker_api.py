@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from core.docker_api import DockerClient, DockerError, split_ref
+from core.stats import StatsCollector
+
+
+def test_split_ref():
+    assert split_ref("nginx") == ("nginx", "latest")
+    assert split_ref("nginx:1.25") == ("nginx", "1.25")
+    assert split_ref("localhost:5000/app") == ("localhost:5000/app", "latest")
+    assert split_ref("nginx@sha256:abc") == ("nginx@sha256:abc", None)
+
+
+def test_services_filter_and_image_lookup(engine):
+    engine.set_service("n8n_web", "n8n", 1, 1)
+    engine.set_service("postgres_db", "postgres", 0, 1)
+    engine.images["nginx:1.25"] = "sha256:aaa"
+    client = DockerClient(engine.path)
+
+    names = [s["Spec"]["Name"] for s in client.services({"label": ["com.docker.stack.namespace=n8n"]})]
+    assert names == ["n8n_web"]
+    assert client.image_id("nginx:1.25") == "sha256:aaa"
+    assert client.image_id("nginx:missing") is None
+
+
+def test_keep_alive_connection_is_reused(engine):
+    client = DockerClient(engine.path)
+    client.services()
+    first = client._connection()
+    client.services()
+    assert client._connection() is first
+
+
+def test_unavailable_socket(tmp_path):
+    client = DockerClient(str(tmp_path / "missing.sock"))
+    assert not client.available()
+    with pytest.raises(DockerError):
+        client.services()
+
+
+def test_events_stream(engine):
+    client = DockerClient(engine.path)
+    received = []
+    connected = threading.Event()
+
+    def consume():
+        for event in client.events(on_connect=lambda conn: connected.set()):
+            received.append(event)
+            break
+
+    thread = threading.Thread(target=consume)
+    thread.start()
+    assert connected.wait(5)
+    engine.set_service("n8n_web", "n8n", 1, 1)
+    thread.join(5)
+    assert received[0]["Actor"]["Attributes"]["name"] == "n8n_web"
+
+
+def test_stats_collector_aggregates_per_stack(engine):
+    engine.set_service("n8n_web", "n8n", 2, 2)
+    engine.set_service("n8n_worker", "n8n", 1, 2)
+    engine.set_service("postgres_db", "postgres", 1, 1)
+    collector = StatsCollector(DockerClient(engine.path))
+
+    stacks = collector.refresh()
+
+    assert (stacks["n8n"].running, stacks["n8n"].desired) == (3, 4)
+    assert stacks["n8n"].columns()["mem"] == "192MB"
+    assert stacks["n8n"].cpu is None  # CPU precisa de duas amostras
+    assert collector.version == 1 and collector.last_error is None
+
+
+def test_stats_collector_without_docker(tmp_path):
+    collector = StatsCollector(DockerClient(str(tmp_path / "missing.sock")))
+    assert collector.refresh() == {}
+    assert "não encontrado" in collector.last_error
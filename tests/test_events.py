@@ -0,0 +1,110 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from core.events import EVENTS_DIR, EVENTS_FILE, EventSink
+from core.logger import Logger
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def wait_written(sink, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while sink.written < count:
+        if time.monotonic() > deadline:
+            raise AssertionError(f"{sink.written} de {count} eventos gravados")
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def sink(tmp_path):
+    sink = EventSink(tmp_path / "events.jsonl")
+    yield sink
+    sink.close()
+
+
+def test_rotates_by_size_and_keeps_the_last_backups(tmp_path):
+    path = tmp_path / "events.jsonl"
+    sink = EventSink(path, backups=2)
+    # Um evento por escrita, todos do mesmo tamanho: o arquivo roda a cada 3
+    for i in range(10):
+        sink.emit({"level": "info", "message": f"evento {i:02d}"})
+        wait_written(sink, i + 1)
+        if i == 0:
+            record = os.path.getsize(path)
+            sink.max_bytes = 3 * record - 1
+    sink.close()
+
+    assert [e["message"] for e in read(f"{path}.2")] == ["evento 03", "evento 04", "evento 05"]
+    assert [e["message"] for e in read(f"{path}.1")] == ["evento 06", "evento 07", "evento 08"]
+    assert [e["message"] for e in read(path)] == ["evento 09"]
+    assert not os.path.exists(f"{path}.3")
+    assert os.path.getsize(f"{path}.1") == 3 * record
+
+
+def test_close_flushes_the_queue(sink):
+    for i in range(500):
+        sink.emit({"level": "step", "message": f"passo {i}"})
+    sink.close()
+    events = read(sink.path)
+    assert [e["message"] for e in events] == [f"passo {i}" for i in range(500)]
+    assert sink.dropped == 0
+    sink.emit({"level": "info", "message": "depois do close"})
+    assert len(read(sink.path)) == 500
+
+
+def test_queue_is_flushed_at_process_exit(tmp_path):
+    script = (
+        "import sys; sys.path.insert(0, sys.argv[1])\n"
+        "from core.events import EventSink\n"
+        "from core.logger import Logger\n"
+        "logger = Logger(stream=open('/dev/null', 'w'), events=EventSink())\n"
+        "for i in range(1000):\n"
+        "    logger.info(f'linha {i}')\n"
+    )
+    subprocess.run([sys.executable, "-c", script, ROOT], cwd=tmp_path, check=True, timeout=30)
+    events = read(tmp_path / EVENTS_DIR / EVENTS_FILE)
+    assert len(events) == 1000 and events[-1]["message"] == "linha 999"
+
+
+def test_each_logger_call_writes_one_record(sink):
+    logger = Logger(stream=io.StringIO(), events=sink)
+    calls = [
+        ("section", lambda: logger.section("INSTALANDO")),
+        ("step", lambda: logger.step("Baixando \x1b[93mimagem\x1b[0m")),
+        ("success", lambda: logger.success("Imagem baixada")),
+        ("error", lambda: logger.error("Falhou", hint="Veja os logs")),
+        ("info", lambda: logger.info("Informação")),
+        ("warning", lambda: logger.warning("Aviso")),
+        ("debug", lambda: logger.debug("Depuração")),
+        ("command", lambda: logger.command("docker ps", output="ok", code=0, seconds=0.5)),
+    ]
+    with logger.context(app="n8n", instance="default", host="local"):
+        for level, call in calls:
+            call()
+    logger.command_output("saída sem evento")
+    sink.close()
+
+    with open(sink.path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    events = [json.loads(line) for line in lines]
+    assert [e["level"] for e in events] == [level for level, _ in calls]
+    for event in events:
+        assert {"ts", "mono", "level", "message", "run"} <= set(event)
+        assert (event["app"], event["instance"], event["host"]) == ("n8n", "default", "local")
+        assert event["run"] == sink.run
+    by_level = {e["level"]: e for e in events}
+    assert by_level["step"]["message"] == "Baixando imagem"
+    assert by_level["success"]["duration"] >= 0
+    assert by_level["error"]["hint"] == "Veja os logs"
+    assert (by_level["command"]["code"], by_level["command"]["duration"]) == (0, 0.5)
@@ -0,0 +1,100 @@
+import io
+
+import pytest
+
+from core.docker_api import DockerClient
+from core.fingerprint import Fingerprint, images_of, parse_probe, probe_command
+from core.installer import Installer
+from core.logger import Logger
+from core.steps import Step
+
+FILES = {"n8n.yaml": "services:\n  web:\n    image: n8nio/n8n:1.0\n", "n8n.env": "A=1\n"}
+STEPS = [Step("deploy", "Publicando", "docker stack deploy -c n8n.yaml n8n")]
+IMAGES = {"n8nio/n8n:1.0": "sha256:aaa"}
+
+
+def test_unchanged_fingerprint_has_no_diff():
+    current = Fingerprint.build(FILES, STEPS, IMAGES)
+    recorded = Fingerprint.from_dict(current.to_dict())
+    assert current.diff(recorded) == [] and current == recorded
+    assert current.changed_images(recorded) == []
+
+
+def test_each_component_is_reported():
+    recorded = Fingerprint.build(FILES, STEPS, IMAGES)
+    env = Fingerprint.build(FILES, [Step("deploy", "Publicando", "docker stack deploy -c x.yaml n8n")], IMAGES)
+    assert env.diff(recorded) == ["env"]
+    image = Fingerprint.build(FILES, STEPS, {"n8nio/n8n:1.0": "sha256:bbb"})
+    assert image.diff(recorded) == ["images"]
+    assert image.changed_images(recorded) == ["n8nio/n8n:1.0"]
+    stack = Fingerprint.build(dict(FILES, **{"n8n.env": "A=2\n"}), STEPS, IMAGES)
+    assert stack.diff(recorded) == ["stack"]
+    assert recorded.diff(None) == ["stack", "env", "images"]
+    assert Fingerprint.from_dict({"stack": "x"}) is None
+
+
+def test_images_and_probe_output():
+    assert images_of(FILES) == ["n8nio/n8n:1.0"]
+    assert images_of({}, {"images": ["redis:7"]}) == ["redis:7"]
+    refs = ["n8nio/n8n:1.0", "redis@sha256:ccc"]
+    assert "redis@sha256" not in probe_command(["n8n"], refs)
+    probe = parse_probe("image\tn8nio/n8n:1.0\tsha256:aaa\nstack\tn8n\t2\nstack\tvelho\t0\n", refs)
+    assert probe.image_ids(refs) == {"n8nio/n8n:1.0": "sha256:aaa", "redis@sha256:ccc": "sha256:ccc"}
+    assert probe.deployed == {"n8n"}
+
+
+@pytest.fixture
+def installer(workdir, engine, monkeypatch):
+    engine.images.update(IMAGES)
+    engine.set_service("n8n_web", "n8n", 1, 1)
+    installer = Installer(Logger(stream=io.StringIO()), {"global": {"docker_network": "livchat_network"}})
+    installer.docker = DockerClient(engine.path)
+    bundle = workdir / "stacks" / "n8n"
+    bundle.mkdir(parents=True)
+    monkeypatch.setattr(installer, "_render_stack", lambda definition, instance: (bundle, dict(FILES)))
+    monkeypatch.setattr(installer, "_wait_ready", lambda stack, timeout: None)
+    installer.deploys = []
+
+    def run_steps(steps, label=None, journal=None, **kwargs):
+        installer.deploys.append([step.key for step in steps])
+        return True
+
+    monkeypatch.setattr(installer, "_run_steps", run_steps)
+    return installer
+
+
+def install(installer):
+    before = len(installer.deploys)
+    installer._install_app("n8n", "default", "run-1")
+    return len(installer.deploys) > before
+
+
+def test_unchanged_stack_is_not_deployed_again(installer):
+    assert install(installer)  # primeiro deploy grava a fingerprint
+    assert not install(installer)
+    assert "sem mudanças" in installer.logger.stream.getvalue()
+    assert [entry.status for entry in installer.plan([("n8n", "default")])] == ["inalterado"]
+
+
+def test_changed_env_is_deployed(installer):
+    install(installer)
+    installer.config["global"]["docker_network"] = "outra_rede"
+    assert installer.plan([("n8n", "default")])[0].changes == ["env"]
+    assert install(installer)
+    assert not install(installer)
+
+
+def test_changed_image_is_deployed(installer, engine):
+    install(installer)
+    engine.images["n8nio/n8n:1.0"] = "sha256:nova"
+    entry = installer.plan([("n8n", "default")])[0]
+    assert (entry.status, entry.changes, entry.images) == ("alterado", ["images"], ["n8nio/n8n:1.0"])
+    assert install(installer)
+    assert not install(installer)
+
+
+def test_force_deploys_an_unchanged_stack(installer):
+    install(installer)
+    installer.force = True
+    assert install(installer)
+    assert install(installer)
@@ -0,0 +1,77 @@
+import io
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from core.fleet import FleetRunner
+from core.logger import Logger
+from core.ssh import ServerInfo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class FakePool:
+    def __init__(self):
+        self.evicted = []
+
+    def evict(self, server, blocking=True):
+        self.evicted.append((server.name, blocking))
+
+
+def servers(*names):
+    return [ServerInfo(name, f"{name}.example.com") for name in names]
+
+
+def test_results_keep_target_order_and_isolate_failures():
+    def operation(server, host_logger):
+        if server.name == "b":
+            raise RuntimeError("disco cheio")
+        time.sleep(0.05 if server.name == "a" else 0)
+        return {"detail": f"ok {server.name}"}
+
+    runner = FleetRunner(Logger(stream=io.StringIO()), parallel=2, pool=FakePool(), quiet=True)
+    results = runner.run(servers("a", "b", "c"), operation)
+    assert [(r.server.name, r.status) for r in results] == [("a", "ok"), ("b", "failed"), ("c", "ok")]
+    assert results[1].detail == "RuntimeError: disco cheio"
+
+
+def test_hung_host_times_out_without_blocking_the_others():
+    release = threading.Event()
+    pool = FakePool()
+
+    def operation(server, host_logger):
+        if server.name == "stuck":
+            release.wait()
+        return {"detail": "ok"}
+
+    runner = FleetRunner(Logger(stream=io.StringIO()), parallel=2, timeout=0.3, pool=pool, quiet=True)
+    start = time.monotonic()
+    results = runner.run(servers("stuck", "a", "b"), operation)
+    release.set()
+
+    assert time.monotonic() - start < 5
+    assert [r.status for r in results] == ["timeout", "ok", "ok"]
+    assert pool.evicted == [("stuck", False)]
+
+
+def test_hung_host_does_not_block_interpreter_exit():
+    script = """
+import io, threading
+from core.fleet import FleetRunner
+from core.logger import Logger
+from core.ssh import ServerInfo
+
+class Pool:
+    def evict(self, server, blocking=True):
+        pass
+
+runner = FleetRunner(Logger(stream=io.StringIO()), timeout=0.2, pool=Pool(), quiet=True)
+result = runner.run([ServerInfo("stuck", "h")], lambda server, log: threading.Event().wait())
+print(result[0].status)
+"""
+    start = time.monotonic()
+    done = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=30)
+    assert done.stdout.strip() == "timeout"
+    assert time.monotonic() - start < 10
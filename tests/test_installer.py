@@ -0,0 +1,147 @@
+import io
+import json
+import os
+import shutil
+
+import pytest
+
+from core.installer import Installer
+from core.journal import run_path
+from core.logger import Logger
+
+
+class FakePulls:
+    cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeReadiness:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def installer(workdir, monkeypatch):
+    installer = Installer(Logger(stream=io.StringIO()), {}, jobs=2)
+    pulls = FakePulls()
+    monkeypatch.setattr(installer, "_start_pulls", lambda app_ids: pulls)
+    monkeypatch.setattr(installer, "_wait_pulls", lambda pulls: None)
+    monkeypatch.setattr(installer, "_render_stack", lambda definition, instance: None)
+    installer.pulls = pulls
+    return installer
+
+
+def run_state():
+    with open(run_path()) as f:
+        return json.load(f)
+
+
+def test_preflight_failure_closes_the_run_and_cancels_pulls(installer, monkeypatch):
+    monkeypatch.setattr(installer, "_run_steps", lambda steps, **kwargs: False)
+    assert installer.install(["postgres"]) is False
+    assert installer.pulls.cancelled
+    state = run_state()
+    assert state["finished"] is False and "finished_at" in state
+
+
+def test_interrupted_install_releases_everything(installer, monkeypatch):
+    readiness = FakeReadiness()
+    monkeypatch.setattr(installer, "_run_steps", lambda steps, **kwargs: True)
+    monkeypatch.setattr(installer.store, "update", lambda change: {"secrets": {}})
+
+    def interrupted(app_ids, instance, run_id):
+        installer.readiness = readiness
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(installer, "_install_all", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        installer.install(["postgres"])
+    assert readiness.closed and installer.readiness is None
+    assert installer.pulls.cancelled
+    assert "finished_at" in run_state()
+
+
+def test_successful_install_finishes_the_run(installer, monkeypatch):
+    monkeypatch.setattr(installer, "_run_steps", lambda steps, **kwargs: True)
+    monkeypatch.setattr(installer.store, "update", lambda change: {"secrets": {}})
+    monkeypatch.setattr(installer, "_install_all", lambda app_ids, instance, run_id: True)
+    assert installer.install(["postgres"]) is True
+    assert run_state()["finished"] is True
+
+
+def test_resume_continues_the_pending_run_of_the_instance(installer, monkeypatch):
+    from core.journal import Journal, start_run
+
+    pending = start_run(["postgres", "redis"], "default")
+    started = Journal("postgres", "default", run_id=pending)
+    started.begin()
+    started.done()
+    # redis ainda tem o "done" de um lote antigo: não pode contar ao retomar
+    stale = Journal("redis", "default", run_id="antigo")
+    stale.begin()
+    stale.done()
+
+    seen = {}
+    monkeypatch.setattr(installer, "_run_steps", lambda steps, **kwargs: True)
+    monkeypatch.setattr(installer.store, "update", lambda change: {"secrets": {}})
+    monkeypatch.setattr(installer, "_install_all",
+                        lambda app_ids, instance, run_id: seen.update(run_id=run_id) or True)
+    installer.resume = True
+    assert installer.install(["postgres", "redis"])
+
+    assert seen["run_id"] == pending
+    assert Journal("postgres", "default", run_id=pending).is_done()
+    assert not Journal("redis", "default", run_id=pending).is_done()
+    assert run_state()["finished"] is True
+
+
+# Host novo: não há docker; o "get.docker.com" falso instala um docker que só registra as chamadas
+FAKE_CURL = """#!/bin/sh
+cat <<'SCRIPT'
+cat > "$FAKE_BIN/docker" <<'DOCKER'
+#!/bin/sh
+echo "$*" >> "$DOCKER_LOG"
+case "$1" in info) echo active;; esac
+exit 0
+DOCKER
+chmod +x "$FAKE_BIN/docker"
+SCRIPT
+"""
+
+
+def test_docker_app_installs_on_a_host_without_docker(installer, workdir, monkeypatch):
+    system_path = "/usr/bin:/bin"
+    if shutil.which("docker", path=system_path):
+        pytest.skip("docker instalado no sistema")
+    fake_bin = workdir / "bin"
+    fake_bin.mkdir()
+    (fake_bin / "curl").write_text(FAKE_CURL)
+    (fake_bin / "curl").chmod(0o755)
+    log = workdir / "docker.log"
+    monkeypatch.setenv("PATH", f"{fake_bin}:{system_path}")
+    monkeypatch.setenv("FAKE_BIN", str(fake_bin))
+    monkeypatch.setenv("DOCKER_LOG", str(log))
+    monkeypatch.setattr(installer, "_render_stack", lambda definition, instance: (None, {}))
+
+    assert installer.install(["docker"]) is True
+    calls = log.read_text().splitlines()
+    assert calls[0].startswith("info --format {{.Swarm.LocalNodeState}}")
+    assert any(call.startswith("network inspect") for call in calls)
+    assert run_state()["finished"] is True
+
+
+def test_results_name_failed_and_skipped_apps(installer, monkeypatch):
+    monkeypatch.setattr(installer, "_run_steps", lambda steps, **kwargs: True)
+    monkeypatch.setattr(installer.store, "update", lambda change: {"secrets": {}})
+
+    def install_app(app_id, instance, run_id):
+        if app_id == "postgres":
+            raise RuntimeError("passo falhou")
+
+    monkeypatch.setattr(installer, "_install_app", install_app)
+    assert installer.install(["redis", "postgres", "n8n"]) is False
+    assert installer.results == {"redis": "done", "postgres": "failed", "n8n": "skipped"}
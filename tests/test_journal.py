@@ -0,0 +1,105 @@
+from core.journal import Journal, finish_run, pending_run, start_run
+from core.steps import Step
+
+STEPS = [Step("network", "Rede", "docker network create x"),
+         Step("deploy", "Deploy", "docker stack deploy -c a.yaml a")]
+
+
+def journal(tmp_path, app="n8n", instance="default"):
+    return Journal(app, instance, base_dir=tmp_path)
+
+
+def test_steps_of_the_last_run_count_as_completed(tmp_path):
+    first = journal(tmp_path)
+    first.begin()
+    first.step(STEPS[0], seconds=0.5)
+
+    resumed = journal(tmp_path).load()
+    assert resumed.completed(STEPS[0])
+    assert not resumed.completed(STEPS[1])
+    assert not resumed.is_done()
+
+
+def test_changed_command_is_not_completed(tmp_path):
+    first = journal(tmp_path)
+    first.begin()
+    first.step(STEPS[0])
+    changed = Step("network", "Rede", "docker network create --attachable x")
+    assert not journal(tmp_path).completed(changed)
+
+
+def test_begin_starts_a_new_run(tmp_path):
+    first = journal(tmp_path)
+    first.begin()
+    first.step(STEPS[0])
+    first.done()
+    assert journal(tmp_path).is_done()
+
+    second = journal(tmp_path)
+    second.begin()
+    assert not journal(tmp_path).is_done()
+    assert not journal(tmp_path).completed(STEPS[0])
+
+
+def test_failure_is_recorded(tmp_path):
+    entry = journal(tmp_path)
+    entry.begin()
+    entry.step(STEPS[0])
+    entry.failed(STEPS[1], "x" * 1000)
+    failure = journal(tmp_path).last_failure()
+    assert failure["key"] == "deploy"
+    assert len(failure["detail"]) == 500
+
+
+def test_torn_last_line_is_ignored(tmp_path):
+    entry = journal(tmp_path)
+    entry.begin()
+    entry.step(STEPS[0])
+    with open(entry.path, "ab") as f:
+        f.write(b'{"event":"step","key":"dep')  # queda no meio da escrita
+    resumed = journal(tmp_path).load()
+    assert resumed.completed(STEPS[0])
+    assert not resumed.completed(STEPS[1])
+
+
+def test_journals_are_per_instance(tmp_path):
+    dev = journal(tmp_path, instance="dev")
+    dev.begin()
+    dev.step(STEPS[0])
+    assert not journal(tmp_path, instance="prod").completed(STEPS[0])
+
+
+def test_pending_run_until_finished_ok(tmp_path):
+    assert pending_run(base_dir=tmp_path) is None
+    start_run(["postgres", "n8n"], "default", base_dir=tmp_path)
+    assert pending_run(base_dir=tmp_path)["apps"] == ["postgres", "n8n"]
+    finish_run(False, base_dir=tmp_path)
+    assert pending_run(base_dir=tmp_path) is not None
+    finish_run(True, base_dir=tmp_path)
+    assert pending_run(base_dir=tmp_path) is None
+
+
+def test_runs_are_kept_per_instance(tmp_path):
+    dev = start_run(["n8n"], "dev", base_dir=tmp_path)
+    prod = start_run(["postgres"], "prod", base_dir=tmp_path)
+    assert dev != prod
+    assert pending_run(instance="dev", base_dir=tmp_path)["id"] == dev
+    assert pending_run(base_dir=tmp_path)["id"] == prod  # o mais recente
+    finish_run(True, instance="prod", base_dir=tmp_path)
+    assert pending_run(base_dir=tmp_path)["apps"] == ["n8n"]
+
+
+def test_resume_only_honours_the_resumed_run(tmp_path):
+    old = Journal("n8n", "default", base_dir=tmp_path, run_id="old")
+    old.begin()
+    old.step(STEPS[0])
+    old.done()
+
+    # Outro lote não vê o "done" nem os passos da execução antiga
+    other = Journal("n8n", "default", base_dir=tmp_path, run_id="new").load()
+    assert other.entries() == []
+    assert not other.is_done()
+    assert not other.completed(STEPS[0])
+
+    same = Journal("n8n", "default", base_dir=tmp_path, run_id="old").load()
+    assert same.is_done() and same.completed(STEPS[0])
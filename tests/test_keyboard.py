@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from core.keyboard import KeyReader
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    for fd in (read_fd, write_fd):
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def test_keys_are_parsed_in_batches(pipe):
+    read_fd, write_fd = pipe
+    with KeyReader(read_fd) as reader:
+        os.write(write_fd, b"\x1b[A\x1b[Bx \r\x1b[5~")
+        assert reader.read_keys(timeout=1) == ["UP", "DOWN", "x", "SPACE", "ENTER", "PGUP"]
+        assert reader.read_keys(timeout=0) == []
+
+
+def test_lone_escape_does_not_hang(pipe):
+    read_fd, write_fd = pipe
+    with KeyReader(read_fd, esc_timeout=0.01) as reader:
+        os.write(write_fd, b"\x1b")
+        assert reader.read_keys(timeout=1) == ["ESC"]
+
+
+def test_eof(pipe):
+    read_fd, write_fd = pipe
+    os.close(write_fd)
+    with KeyReader(read_fd) as reader:
+        assert reader.read_keys(timeout=1) == ["EOF"]
+
+
+def test_context_manager_closes_the_selector(pipe):
+    with KeyReader(pipe[0]) as reader:
+        pass
+    assert reader.selector.get_map() is None
@@ -0,0 +1,65 @@
+import io
+
+from core.logger import ANSI_PATTERN, BoxDrawer, Colors, Logger, visible_len
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.flushes = 0
+
+    def write(self, data):
+        self.writes += 1
+        return super().write(data)
+
+    def flush(self):
+        self.flushes += 1
+
+
+def test_each_box_is_a_single_write():
+    stream = CountingStream()
+    logger = Logger(stream=stream)
+
+    logger.section("INSTALANDO APLICAÇÕES")
+    assert (stream.writes, stream.flushes) == (1, 1)
+    logger.error("Falha ao publicar stack", hint="Verifique os logs do serviço")
+    assert (stream.writes, stream.flushes) == (2, 2)
+    logger._draw_box("Concluído")
+    assert (stream.writes, stream.flushes) == (3, 3)
+    assert stream.getvalue().count("╭") == 3 and stream.getvalue().count("╯") == 3
+
+
+def test_visible_len_ignores_ansi_and_counts_wide_characters():
+    assert visible_len(f"{Colors.VERMELHO}✗ erro{Colors.RESET}") == 6
+    assert visible_len("instalação") == 10
+    assert visible_len("日本語") == 6
+    assert visible_len(f"{Colors.BRANCO}🚀 deploy{Colors.RESET}") == 9
+    assert visible_len("e\u0301") == 1  # acento combinante
+    assert visible_len("█╗║") == 3  # arte do logo: uma coluna cada
+
+
+def test_box_lines_have_the_box_width():
+    box = BoxDrawer(40)
+    contents = [
+        "texto simples",
+        f"{Colors.VERDE}✓{Colors.RESET} {Colors.BRANCO}colorido{Colors.RESET}",
+        "日本語のテキスト",
+        f"{Colors.BEGE}🚀 emoji{Colors.RESET}",
+    ]
+    for content in contents:
+        for line in (box.line_centered(content), box.line_left(content)):
+            assert visible_len(line) == 40
+            plain = ANSI_PATTERN.sub("", line)
+            assert plain.startswith("│") and plain.endswith("│")
+    assert ANSI_PATTERN.sub("", box.line_centered("日本")) == "│" + " " * 17 + "日本" + " " * 17 + "│"
+    assert len(box.top()) == len(box.bottom()) == len(box.separator()) == visible_len(box.empty()) == 40
+
+
+def test_logger_boxes_are_aligned():
+    stream = io.StringIO()
+    logger = Logger(stream=stream)
+    logger.section("Instalação de 日本語")
+    logger.error("✗ falhou 🚀", hint="dica")
+    lines = [line for line in stream.getvalue().splitlines() if line]
+    assert lines and {visible_len(line) for line in lines} == {103}
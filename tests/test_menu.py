@@ -0,0 +1,71 @@
+import io
+
+import pytest
+
+import core.installer
+from core.logger import Logger
+from core.menu import InteractiveMenu
+
+
+@pytest.fixture
+def menu(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda *args: "")
+    return InteractiveMenu(Logger(stream=io.StringIO()), {})
+
+
+def fake_installer(monkeypatch, ok, results):
+    class FakeInstaller:
+        def __init__(self, *args, **kwargs):
+            self.results = {}
+
+        def install(self, app_ids):
+            self.results = dict(results)
+            return ok
+
+    monkeypatch.setattr(core.installer, "Installer", FakeInstaller)
+
+
+def test_successful_install_shows_the_success_box(menu, monkeypatch, capsys):
+    fake_installer(monkeypatch, True, {"postgres": "done"})
+    menu._confirm_and_install(["postgres"])
+    out = capsys.readouterr().out
+    assert "INSTALAÇÃO CONCLUÍDA" in out and "NÃO CONCLUÍDA" not in out
+
+
+def test_failed_install_names_failed_and_skipped_apps(menu, monkeypatch, capsys):
+    fake_installer(monkeypatch, False, {"redis": "done", "postgres": "failed", "n8n": "skipped"})
+    menu._confirm_and_install(["redis", "postgres", "n8n"])
+    out = capsys.readouterr().out
+    assert "INSTALAÇÃO NÃO CONCLUÍDA" in out and "✓ INSTALAÇÃO CONCLUÍDA" not in out
+    assert "PostgreSQL \x1b[90m- falhou" in out
+    assert "N8N \x1b[90m- pulada: uma dependência falhou" in out
+    assert "Redis \x1b[90m-" not in out
+
+
+def test_install_stopped_before_the_scheduler_is_a_failure(menu, monkeypatch, capsys):
+    fake_installer(monkeypatch, False, {})
+    menu._confirm_and_install(["postgres"])
+    out = capsys.readouterr().out
+    assert "INSTALAÇÃO NÃO CONCLUÍDA" in out
+    assert "PostgreSQL \x1b[90m- não instalada" in out
+
+
+def type_keys(menu, keys):
+    for key in keys:
+        assert menu._handle_key(key) is None
+
+
+def test_digits_and_q_are_typed_while_searching(menu):
+    type_keys(menu, "n8n")
+    assert menu.search_term == "n8n"
+    assert menu._current_app()["id"] == "n8n"
+    type_keys(menu, ["BACKSPACE"] * 3 + list("equ"))
+    assert menu.search_term == "equ"
+
+
+def test_digits_jump_and_q_quits_outside_search(menu):
+    menu._handle_key("3")
+    assert menu.selected_index == 2 and not menu.search_mode
+    assert menu._handle_key("q") == []
+    type_keys(menu, ["x", "ESC"])
+    assert menu._handle_key("Q") == []
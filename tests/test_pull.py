@@ -0,0 +1,91 @@
+import base64
+import json
+
+import pytest
+
+from core.docker_api import DockerClient
+from core.pull import ImagePuller, canonical_ref, registry_auth, registry_host, unique_refs
+from tests.fakes.engine import FakeEngine
+from tests.fakes.registry import FakeRegistry
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def registry():
+    registry = FakeRegistry()
+    registry.add("nginx:1.25", [("layer-a", 2 * MB), ("layer-b", 3 * MB)])
+    registry.add("registry.example.com/team/app:1", [("layer-c", 4 * MB)])
+    registry.require_login("registry.example.com", "deploy", "s3cret")
+    return registry
+
+
+@pytest.fixture
+def engine(tmp_path, registry):
+    with FakeEngine(str(tmp_path / "docker.sock"), registry=registry) as engine:
+        yield engine
+
+
+def docker_config(tmp_path, auths=None, **extra):
+    path = tmp_path / "docker-config.json"
+    path.write_text(json.dumps(dict({"auths": auths or {}}, **extra)))
+    return str(path)
+
+
+def basic(user, password):
+    return base64.b64encode(f"{user}:{password}".encode()).decode()
+
+
+def test_equivalent_refs_are_pulled_once():
+    assert canonical_ref("nginx") == "docker.io/library/nginx:latest"
+    assert unique_refs(["nginx", "nginx:latest", "docker.io/library/nginx", "redis:7"]) == ["nginx", "redis:7"]
+    assert registry_host("nginx") == "docker.io"
+    assert registry_host("registry.example.com/team/app:1") == "registry.example.com"
+
+
+def test_registry_auth_from_docker_config(tmp_path):
+    path = docker_config(tmp_path, {
+        "https://index.docker.io/v1/": {"auth": basic("hubuser", "hubpass")},
+        "registry.example.com": {"auth": basic("deploy", "s3:cret")},
+        "ghcr.io": {"identitytoken": "tok"},
+    })
+    assert registry_auth("docker.io", path)["username"] == "hubuser"
+    assert registry_auth("registry.example.com", path) == {
+        "username": "deploy", "password": "s3:cret", "serveraddress": "registry.example.com"}
+    assert registry_auth("ghcr.io", path)["identitytoken"] == "tok"
+    assert registry_auth("quay.io", path) is None
+    assert registry_auth("docker.io", str(tmp_path / "missing.json")) is None
+
+
+def test_public_and_private_images_are_pulled_with_progress(tmp_path, engine):
+    path = docker_config(tmp_path, {"registry.example.com": {"auth": basic("deploy", "s3cret")}})
+    puller = ImagePuller(DockerClient(engine.path), docker_config=path)
+    progress = []
+
+    results = puller.start(["nginx:1.25", "docker.io/library/nginx:1.25",
+                            "registry.example.com/team/app:1"]).wait(on_progress=lambda *p: progress.append(p))
+
+    assert {ref: result.ok for ref, result in results.items()} == {
+        "nginx:1.25": True, "registry.example.com/team/app:1": True}
+    assert set(engine.images) == {"nginx:1.25", "registry.example.com/team/app:1"}
+    # Só o registry privado recebe credenciais
+    sent = {h.get("X-Registry-Auth") is not None for h in engine.pull_headers}
+    assert sent == {True, False}
+    current, total, message = progress[-1]
+    assert current == total and message.startswith("2/2 imagens")
+
+
+def test_private_image_without_login_fails_softly(tmp_path, engine):
+    puller = ImagePuller(DockerClient(engine.path), docker_config=docker_config(tmp_path))
+    results = puller.start(["registry.example.com/team/app:1"]).wait()
+    result = results["registry.example.com/team/app:1"]
+    assert not result.ok
+    assert "no basic auth credentials" in result.detail
+
+
+def test_cancelled_pulls_do_not_start(tmp_path, engine):
+    puller = ImagePuller(DockerClient(engine.path), workers=1, docker_config=docker_config(tmp_path))
+    puller.cancel()
+    results = puller.start(["nginx:1.25"]).wait()
+    assert results["nginx:1.25"].detail == "cancelado"
+    assert engine.pull_headers == []
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from core.docker_api import DockerClient
+from core.readiness import FAILED, PENDING, READY, ReadinessMonitor
+
+
+def monitor(engine):
+    return ReadinessMonitor(DockerClient(engine.path))
+
+
+def test_replicas_and_health(engine):
+    readiness = monitor(engine)
+    assert readiness.check_stack("n8n") == (PENDING, "nenhum serviço criado ainda")
+    engine.set_service("n8n_web", "n8n", 0, 1)
+    assert readiness.check_stack("n8n") == (PENDING, "n8n_web 0/1")
+    engine.set_service("n8n_web", "n8n", 1, 1, health="starting")
+    assert readiness.check_stack("n8n")[0] == PENDING
+    engine.set_health("n8n_web", "healthy")
+    assert readiness.check_stack("n8n")[0] == READY
+
+
+def test_rolling_update_is_not_ready_even_with_replicas_running(engine):
+    readiness = monitor(engine)
+    for state in ("updating", "paused", "rollback_started"):
+        engine.set_service("n8n_web", "n8n", 1, 1, update=state)
+        assert readiness.check_stack("n8n") == (PENDING, f"n8n_web {state}")
+    engine.set_service("n8n_web", "n8n", 1, 1, update="completed")
+    assert readiness.check_stack("n8n")[0] == READY
+
+
+def test_rollback_fails_without_waiting_for_the_timeout(engine):
+    engine.set_service("n8n_web", "n8n", 1, 1, update={
+        "State": "rollback_completed", "Message": "update rolled back due to failure",
+        "CompletedAt": time.strftime("%Y-%m-%dT%H:%M:%S.123456789Z", time.gmtime(time.time() + 5))})
+    result = monitor(engine).wait_stack("n8n", timeout=30)
+    assert result.failed and not result.ready
+    assert result.seconds < 5
+    assert "rolled back" in result.detail
+
+
+def test_rollback_from_an_earlier_deploy_is_ignored(engine):
+    engine.set_service("n8n_web", "n8n", 1, 1, update={
+        "State": "rollback_completed", "CompletedAt": "2020-01-01T00:00:00Z"})
+    readiness = monitor(engine)
+    assert readiness.check_stack("n8n", since=time.time())[0] == READY
+    assert readiness.check_stack("n8n")[0] == FAILED
+
+
+def test_wait_wakes_on_event(engine):
+    engine.set_service("n8n_web", "n8n", 1, 1, update="updating")
+    readiness = monitor(engine)
+    threading.Timer(0.3, lambda: engine.set_service("n8n_web", "n8n", 1, 1, update="completed")).start()
+    try:
+        result = readiness.wait_stack("n8n", timeout=10)
+    finally:
+        readiness.close()
+    assert result.ready
+    assert result.seconds < 5
@@ -0,0 +1,66 @@
+import os
+import time
+
+import pytest
+
+from core.render import RENDERED_MAX_AGE, StackRenderer, render_key, stack_name, write_bundle
+
+
+def renderer(tmp_path):
+    return StackRenderer(templates_dir=tmp_path / "templates", cache_dir=tmp_path / "cache")
+
+
+def mode(path):
+    return path.stat().st_mode & 0o777
+
+
+def test_stack_name():
+    assert stack_name("n8n") == stack_name("n8n", "default") == "n8n"
+    assert stack_name("n8n", "dev") == "n8n_dev"
+
+
+def test_render_key_depends_on_variables_not_their_order():
+    assert render_key("a.j2", "h", {"x": 1, "y": 2}) == render_key("a.j2", "h", {"y": 2, "x": 1})
+    assert render_key("a.j2", "h", {"x": 1}) != render_key("a.j2", "h", {"x": 2})
+
+
+def test_rendered_results_are_owner_only(tmp_path):
+    cache = renderer(tmp_path)
+    key = "ab" + "0" * 62
+    cache.store(key, "POSTGRES_PASSWORD=segredo\n")
+    path = tmp_path / "cache" / "rendered" / "ab" / key
+    assert mode(path) == 0o600
+    assert mode(path.parent) == 0o700
+    assert renderer(tmp_path).cached(key) == "POSTGRES_PASSWORD=segredo\n"
+
+
+def test_bundles_are_owner_only(tmp_path):
+    bundle = write_bundle("n8n", {"n8n.yaml": "senha\n"}, bundles_dir=tmp_path / "stacks")
+    assert mode(bundle) == 0o700
+    assert mode(bundle / "n8n.yaml") == 0o600
+
+
+def test_unused_results_are_pruned(tmp_path):
+    cache = renderer(tmp_path)
+    old, used, fresh = ("aa" + c * 62 for c in "123")
+    for key in (old, used, fresh):
+        cache.store(key, key)
+    stale = time.time() - RENDERED_MAX_AGE - 60
+    for key in (old, used):
+        os.utime(tmp_path / "cache" / "rendered" / "aa" / key, (stale, stale))
+
+    assert renderer(tmp_path).cached(used) == used  # leitura conta como uso
+    assert renderer(tmp_path).prune() == 1
+    assert renderer(tmp_path).cached(old) is None
+    assert renderer(tmp_path).cached(fresh) == fresh
+
+
+def test_templates_render_once(tmp_path):
+    pytest.importorskip("jinja2")
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "app.yaml.j2").write_text("image: {{ image }}\n")
+    first = renderer(tmp_path)
+    assert first.render("app.yaml.j2", {"image": "nginx"}) == "image: nginx\n"
+    second = renderer(tmp_path)
+    assert second.render("app.yaml.j2", {"image": "nginx"}) == "image: nginx\n"
+    assert (first.misses, second.hits, second.misses) == (1, 1, 0)
@@ -0,0 +1,50 @@
+import io
+import sys
+
+from core.logger import Logger
+from core.runner import MAX_LINE, CommandRunner
+
+
+def runner(tmp_path, **kwargs):
+    return CommandRunner(Logger(stream=io.StringIO()), logs_dir=tmp_path / "logs", **kwargs)
+
+
+def test_stdout_and_stderr_are_streamed_by_line(tmp_path):
+    result = runner(tmp_path).run("echo um; echo dois >&2; printf tres")
+    assert result.ok
+    assert sorted(result.tail) == ["dois", "tres", "um"]
+    transcript = result.transcript.read_text()
+    assert "! dois\n" in transcript and "# código 0" in transcript
+
+
+def test_output_without_newlines_is_flushed_in_bounded_pieces(tmp_path):
+    size = 3 * MAX_LINE + 10
+    script = f"import sys; sys.stdout.write('x' * {size}); sys.stdout.flush()"
+    result = runner(tmp_path).run([sys.executable, "-c", script])
+    assert result.ok
+    assert [len(line) for line in result.tail] == [MAX_LINE, MAX_LINE, MAX_LINE, 10]
+
+
+def test_timeout_kills_the_command(tmp_path):
+    result = runner(tmp_path).run("sleep 30", timeout=0.3)
+    assert result.timed_out and not result.ok
+    assert result.seconds < 10
+
+
+def test_old_transcripts_are_pruned(tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    for day in range(1, 8):
+        (logs / f"2024010{day}-000000-1-001-old.log").write_text("")
+    (logs / "notes.txt").write_text("")
+
+    first = runner(tmp_path, max_transcripts=3)
+    first.run("true")
+    first.run("true")  # a limpeza roda uma vez por runner
+
+    names = sorted(path.name for path in logs.iterdir())
+    assert "notes.txt" in names
+    logs_left = [name for name in names if name.endswith(".log")]
+    assert len(logs_left) == 5  # 3 mantidos + os 2 desta execução
+    assert "20240105-000000-1-001-old.log" in logs_left
+    assert "20240104-000000-1-001-old.log" not in logs_left
@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from core.scheduler import DependencyError, InstallScheduler
+
+
+def test_cycle_is_rejected_with_the_apps_involved():
+    with pytest.raises(DependencyError) as error:
+        InstallScheduler({"a": ["c"], "b": ["a"], "c": ["b"], "redis": []})
+    assert "a, b, c" in str(error.value)
+    assert "redis" not in str(error.value)
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(DependencyError, match="postgres"):
+        InstallScheduler({"n8n": ["postgres"]})
+
+
+def test_dependencies_finish_before_dependants_start():
+    deps = {"traefik": [], "postgres": ["traefik"], "redis": ["traefik"],
+            "n8n": ["postgres", "redis"], "chatwoot": ["postgres", "redis"]}
+    lock = threading.Lock()
+    started, finished = {}, {}
+
+    def install(app):
+        with lock:
+            started[app] = time.monotonic()
+        time.sleep(0.02)
+        with lock:
+            finished[app] = time.monotonic()
+
+    results = InstallScheduler(deps, jobs=4).run(install)
+
+    assert results == {app: "done" for app in deps}
+    for app, app_deps in deps.items():
+        for dep in app_deps:
+            assert finished[dep] <= started[app], f"{app} começou antes de {dep} terminar"
+
+
+def test_jobs_bound_concurrency():
+    lock = threading.Lock()
+    active = [0, 0]
+
+    def install(app):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+
+    InstallScheduler({f"app{i}": [] for i in range(8)}, jobs=3).run(install)
+    assert active[1] == 3
+
+
+def test_failure_skips_dependants_transitively_but_not_siblings():
+    deps = {"postgres": [], "n8n": ["postgres"], "worker": ["n8n"], "redis": []}
+    done, errors, skipped = [], [], []
+
+    def install(app):
+        if app == "postgres":
+            raise RuntimeError("falhou")
+
+    results = InstallScheduler(deps, jobs=2).run(
+        install, on_done=done.append, on_error=lambda app, e: errors.append(app),
+        on_skip=lambda app, failed: skipped.append((app, failed)))
+
+    assert results == {"postgres": "failed", "n8n": "skipped", "worker": "skipped", "redis": "done"}
+    assert errors == ["postgres"]
+    assert done == ["redis"]
+    assert skipped == [("n8n", "postgres"), ("worker", "n8n")]
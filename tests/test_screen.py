@@ -0,0 +1,52 @@
+import io
+
+from core.screen import CSI, ScreenBuffer
+
+
+def render(screen, lines):
+    stream = screen.stream
+    before = stream.tell()
+    screen.render(lines)
+    return stream.getvalue()[before:]
+
+
+def test_first_frame_is_printed_whole():
+    screen = ScreenBuffer(stream=io.StringIO())
+    assert render(screen, ["a", "b", "c"]) == "a\nb\nc\n"
+    assert screen.stats.rows_painted == 3
+
+
+def test_only_changed_lines_are_repainted():
+    screen = ScreenBuffer(stream=io.StringIO())
+    render(screen, ["a", "b", "c"])
+    out = render(screen, ["a", "B", "c"])
+    # sobe 2 linhas (do fim do frame até a linha 1), repinta, desce 2
+    assert out == f"{CSI}2A\rB{CSI}K{CSI}2B"
+    assert screen.stats.last_bytes == len(out.encode())
+    assert screen.stats.rows_painted == 4
+
+
+def test_identical_frame_writes_nothing():
+    screen = ScreenBuffer(stream=io.StringIO())
+    render(screen, ["a", "b"])
+    assert render(screen, ["a", "b"]) == ""
+
+
+def test_growing_frame_appends_new_lines():
+    screen = ScreenBuffer(stream=io.StringIO())
+    render(screen, ["a"])
+    assert render(screen, ["a", "b", "c"]) == f"\rb{CSI}K\nc{CSI}K\n"
+
+
+def test_shrinking_frame_clears_below():
+    screen = ScreenBuffer(stream=io.StringIO())
+    render(screen, ["a", "b", "c"])
+    assert render(screen, ["a"]) == f"{CSI}2A\r{CSI}J"
+
+
+def test_clear_returns_cursor_to_the_top_of_the_region():
+    screen = ScreenBuffer(stream=io.StringIO())
+    render(screen, ["a", "b", "c"])
+    screen.clear()
+    assert screen.stream.getvalue().endswith(f"{CSI}3A\r{CSI}J")
+    assert render(screen, ["x"]) == "x\n"
@@ -0,0 +1,84 @@
+from core.search import SearchIndex
+
+APPS = [
+    {"id": "postgres", "name": "PostgreSQL"},
+    {"id": "pgadmin", "name": "pgAdmin"},
+    {"id": "n8n", "name": "N8N", "instance": "prod"},
+    {"id": "evolution", "name": "Evolution API"},
+    {"id": "typebot", "name": "Typebot"},
+]
+
+
+def ids(index, query):
+    return [APPS[i]["id"] for i in index.search(query)]
+
+
+def test_empty_query_returns_everything_in_order():
+    assert ids(SearchIndex(APPS), "  ") == [app["id"] for app in APPS]
+
+
+def test_word_prefix_ranks_before_substring_before_fuzzy():
+    index = SearchIndex(APPS)
+    # "po": prefixo de postgres e da instância "prod"; typebot só tem p...o em sequência
+    assert ids(index, "po") == ["postgres", "n8n", "typebot"]
+    assert ids(index, "api") == ["evolution", "pgadmin"]  # substring antes de fuzzy
+    assert ids(SearchIndex(APPS), "pgs")[0] == "postgres"
+
+
+def test_instance_is_searchable():
+    assert ids(SearchIndex(APPS), "prod") == ["n8n"]
+
+
+def test_incremental_search_matches_a_fresh_search():
+    incremental = SearchIndex(APPS)
+    for prefix in ("t", "ty", "typ", "type"):
+        incremental.search(prefix)
+    assert ids(incremental, "type") == ids(SearchIndex(APPS), "type") == ["typebot"]
+    # Backspace volta para o resultado já calculado
+    assert ids(incremental, "ty") == ids(SearchIndex(APPS), "ty")
+    # Query que não estende a anterior recomeça do índice
+    assert ids(incremental, "evo") == ["evolution"]
+
+
+def test_no_match_returns_empty():
+    assert ids(SearchIndex(APPS), "zzz") == []
+
+
+def test_match_positions_prefers_substring():
+    assert SearchIndex.match_positions("PostgreSQL", "gre") == [4, 5, 6]
+    assert SearchIndex.match_positions("PostgreSQL", "pql") == [0, 8, 9]
+    assert SearchIndex.match_positions("PostgreSQL", "xyz") == []
+
+
+def brute_force(query):
+    """Mesmas faixas da SearchIndex, calculadas sem índice (ordem do catálogo dentro de cada faixa)"""
+    bands = ([], [], [])
+    for idx, app in enumerate(APPS):
+        text = " ".join(str(app[f]) for f in ("id", "name", "instance") if app.get(f)).lower()
+        words = text.replace("_", " ").replace("-", " ").split()
+        if any(word.startswith(query) for word in words):
+            bands[0].append(idx)
+        elif query in text:
+            bands[1].append(idx)
+        elif SearchIndex._gaps(text, query) is not None:
+            bands[2].append(idx)
+    return bands[0] + bands[1] + bands[2]
+
+
+def test_two_letter_queries_match_a_brute_force_ranking():
+    letters = sorted(set("".join(f"{app['id']}{app['name']}" for app in APPS).lower()) - {" "})
+    incremental = SearchIndex(APPS)
+    for head in letters:
+        for tail in letters:
+            query = head + tail
+            assert SearchIndex(APPS).search(query) == brute_force(query), query
+            incremental.search(head)
+            assert incremental.search(query) == brute_force(query), query
+
+
+def test_short_queries_are_memoized_across_backspace():
+    index = SearchIndex(APPS)
+    one, two = index.search("p"), index.search("po")
+    index.search("")
+    assert index.search("p") is one
+    assert index.search("po") is two
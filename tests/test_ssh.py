@@ -0,0 +1,141 @@
+import time
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from core.ssh import ServerInfo, SSHError, SSHPool  # noqa: E402
+from tests.fakes.ssh_server import FakeSSHServer  # noqa: E402
+
+
+@pytest.fixture
+def ssh_server():
+    with FakeSSHServer(username="root", password="secret") as server:
+        yield server
+
+
+def pool_for(tmp_path, prompt):
+    return SSHPool(known_hosts=str(tmp_path / "known_hosts"), connect_timeout=5, prompt=prompt)
+
+
+def test_password_is_never_written_to_config():
+    server = ServerInfo("vps1", "203.0.113.10", password="secret")
+    assert server.to_config() == {"host": "203.0.113.10", "port": 22, "user": "root", "ask_password": True}
+    # Configs antigas com senha: o valor gravado é ignorado
+    legacy = ServerInfo.from_config("vps1", {"host": "203.0.113.10", "password": "secret"})
+    assert legacy.password is None and legacy.ask_password
+
+
+def test_password_is_asked_once_per_session(tmp_path, ssh_server):
+    asked = []
+
+    def prompt(server):
+        asked.append(server.name)
+        return "secret"
+
+    pool = pool_for(tmp_path, prompt)
+    server = ServerInfo("fake", "127.0.0.1", ssh_server.port, ask_password=True)
+    try:
+        assert pool.run(server, "echo ok", timeout=10).stdout == "ok\n"
+        pool.close_all()  # reconecta: a senha fica em memória, sem novo pedido
+        assert pool.run(server, "echo de novo", timeout=10).stdout == "de novo\n"
+    finally:
+        pool.close_all()
+    assert asked == ["fake"]
+    assert ssh_server.handshakes == 2
+
+
+def test_without_prompt_password_servers_fail_cleanly(tmp_path, ssh_server):
+    pool = pool_for(tmp_path, None)
+    pool.prompt = None
+    server = ServerInfo("fake", "127.0.0.1", ssh_server.port, ask_password=True)
+    with pytest.raises(SSHError, match="autenticação falhou"):
+        pool.run(server, "true", timeout=10)
+    pool.close_all()
+
+
+def password_server(ssh_server):
+    return ServerInfo("fake", "127.0.0.1", ssh_server.port, password="secret")
+
+
+def test_many_commands_share_one_handshake(tmp_path, ssh_server):
+    import threading
+
+    pool = pool_for(tmp_path, None)
+    server = password_server(ssh_server)
+    outputs = []
+    try:
+        for i in range(5):
+            outputs.append(pool.run(server, f"echo {i}", timeout=10).stdout)
+        threads = [threading.Thread(target=lambda i=i: outputs.append(pool.run(server, f"echo {i}", timeout=10).stdout))
+                   for i in range(5, 10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+    finally:
+        pool.close_all()
+    assert sorted(outputs) == sorted(f"{i}\n" for i in range(10))
+    assert ssh_server.handshakes == pool.handshakes == 1
+
+
+def test_evict_idle_closes_idle_transports(tmp_path, ssh_server):
+    pool = SSHPool(known_hosts=str(tmp_path / "known_hosts"), connect_timeout=5, idle_timeout=0.05, prompt=None)
+    server = password_server(ssh_server)
+    try:
+        pool.run(server, "true", timeout=10)
+        transport = pool.transport(server)
+        assert pool.evict_idle() == 0  # acabou de ser usada
+        time.sleep(0.1)
+        assert pool.evict_idle() == 1
+        assert not transport.is_active()
+        assert pool.stats()["connections"] == 0
+        assert pool.run(server, "echo volta", timeout=10).stdout == "volta\n"
+    finally:
+        pool.close_all()
+    assert ssh_server.handshakes == 2
+
+
+def test_dropped_transport_reconnects_transparently(tmp_path, ssh_server):
+    pool = pool_for(tmp_path, None)
+    server = password_server(ssh_server)
+    try:
+        transport = pool.transport(server)
+        assert pool.run(server, "echo antes", timeout=10).ok
+        ssh_server.drop_connections()
+        deadline = time.monotonic() + 5
+        while transport.is_active() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.run(server, "echo depois", timeout=10).stdout == "depois\n"
+    finally:
+        pool.close_all()
+    assert ssh_server.handshakes == 2
+
+
+def test_no_connection_is_opened_while_the_pool_closes(tmp_path, ssh_server, monkeypatch):
+    pool = pool_for(tmp_path, None)
+    server = password_server(ssh_server)
+    pool.run(server, "true", timeout=10)
+    closing = []
+    close = SSHPool._close
+
+    other = ServerInfo("outro", "127.0.0.1", ssh_server.port, password="secret")
+
+    def close_and_reconnect(conn):
+        close(conn)
+        closing.append(pool._closing.is_set())
+        # Outra thread pedindo conexão no meio do fechamento (o lock do servidor está com o close_all)
+        with pytest.raises(SSHError, match="sendo fechado"):
+            pool.transport(other)
+
+    monkeypatch.setattr(pool, "_close", close_and_reconnect)
+    pool.close_all()
+    monkeypatch.undo()
+
+    assert closing == [True]
+    assert pool.stats()["connections"] == 0 and ssh_server.handshakes == 1
+    assert not pool._reaper.is_alive()
+    try:
+        assert pool.run(server, "echo ok", timeout=10).stdout == "ok\n"  # utilizável depois
+    finally:
+        pool.close_all()
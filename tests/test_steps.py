@@ -0,0 +1,77 @@
+import os
+import re
+import subprocess
+
+from core.catalog import get_catalog
+from core.steps import app_plan, count_steps, database_step, preflight_plan, volumes_step
+
+# `docker` falso: registra as chamadas; volumes/bancos "existentes" vêm do ambiente
+FAKE_DOCKER = """#!/bin/sh
+echo "$*" >> "$DOCKER_LOG"
+case "$1 $2" in
+  "volume inspect") case " $EXISTING " in *" $3 "*) exit 0;; *) exit 1;; esac;;
+  "ps -q") echo abc123;;
+  "exec abc123") case "$*" in *-tAc*) [ -n "$DB_EXISTS" ] && echo 1;; esac;;
+esac
+exit 0
+"""
+
+
+def run(step, tmp_path, **env):
+    fake = tmp_path / "bin" / "docker"
+    fake.parent.mkdir(exist_ok=True)
+    fake.write_text(FAKE_DOCKER)
+    fake.chmod(0o755)
+    log = tmp_path / "docker.log"
+    log.write_text("")
+    environ = dict(os.environ, PATH=f"{fake.parent}:{os.environ['PATH']}", DOCKER_LOG=str(log), **env)
+    result = subprocess.run(["sh", "-c", step.command], env=environ, capture_output=True, text=True)
+    return result.returncode, log.read_text().splitlines()
+
+
+def test_plan_creates_volumes_and_database_before_deploy():
+    catalog = get_catalog()
+    n8n = app_plan(catalog.load("n8n"), "n8n_dev", {"n8n.yaml": ""}, "net")
+    assert [step.key for step in n8n] == ["network", "database", "deploy"]
+    postgres = app_plan(catalog.load("postgres"), "postgres", {"postgres.yaml": ""}, "net")
+    assert [step.key for step in postgres] == ["network", "volumes", "deploy"]
+    assert "postgres_data" in postgres[1].command
+    assert count_steps(catalog.load("n8n")) == 3 + 3
+
+
+def test_every_external_volume_of_the_templates_is_created():
+    catalog = get_catalog()
+    templates_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+    for entry in catalog.entries():
+        definition = catalog.load(entry["id"])
+        declared = {volume.format(stack="STACK") for volume in definition.get("volumes") or []}
+        for template in definition.get("templates") or []:
+            with open(os.path.join(templates_dir, template)) as f:
+                text = f.read().replace("{{ stack }}", "STACK")
+            section = re.search(r"^volumes:\n((?:[ \t].*\n|\n)*)", text, re.M)
+            external = re.findall(r"^\s+name: (\S+)", section.group(1), re.M) if section else []
+            assert set(external) <= declared, f"{entry['id']}: volume externo sem passo de criação"
+
+
+def test_volumes_are_created_only_when_missing(tmp_path):
+    step = volumes_step("redis", ["{stack}_data", "shared"])
+    code, calls = run(step, tmp_path, EXISTING="shared")
+    assert code == 0
+    assert "volume create redis_data" in calls
+    assert "volume create shared" not in calls
+
+
+def test_database_is_created_once(tmp_path):
+    step = database_step("n8n_dev")
+    code, calls = run(step, tmp_path)
+    assert code == 0
+    assert calls[-1] == 'exec abc123 psql -U postgres -c CREATE DATABASE "n8n_dev"'
+
+    code, calls = run(step, tmp_path, DB_EXISTS="1")
+    assert code == 0
+    assert not any("CREATE DATABASE" in call for call in calls)
+
+
+def test_preflight_skips_the_docker_check_when_docker_is_being_installed():
+    assert [step.key for step in preflight_plan()] == ["os", "docker"]
+    assert [step.key for step in preflight_plan(installs_docker=True)] == ["os"]
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+pytest.importorskip("paramiko")
+
+from core.ssh import ServerInfo, SSHPool  # noqa: E402
+from core.sync import LARGE_FILE, MANIFEST_NAME, BundleSync  # noqa: E402
+from tests.fakes.ssh_server import FakeSSHServer  # noqa: E402
+
+BIG = bytes(range(256)) * (LARGE_FILE // 256 * 3)
+
+
+def mode(path):
+    return os.stat(path).st_mode & 0o777
+
+
+@pytest.fixture
+def remote(tmp_path):
+    with FakeSSHServer() as server:
+        pool = SSHPool(known_hosts=str(tmp_path / "known_hosts"), connect_timeout=5, prompt=None)
+        target = ServerInfo("fake", "127.0.0.1", server.port, password=server.password)
+        try:
+            yield server, BundleSync(pool, target)
+        finally:
+            pool.close_all()
+
+
+@pytest.fixture
+def bundle(tmp_path):
+    bundle = tmp_path / "bundle"
+    bundle.mkdir()
+    (bundle / "stack.yaml").write_text("services: {}\n")
+    (bundle / ".env").write_text("oculto\n")
+    (bundle / "seed.sql").write_bytes(BIG)
+    return bundle
+
+
+def test_first_sync_uploads_everything_with_private_modes(tmp_path, remote, bundle):
+    server, sync = remote
+    target = tmp_path / "srv" / "stacks" / "n8n"
+
+    report = sync.sync(bundle, str(target))
+
+    assert sorted(report.uploaded) == ["seed.sql", "stack.yaml"]
+    assert (target / "stack.yaml").read_text() == "services: {}\n"
+    assert (target / "seed.sql").read_bytes() == BIG
+    assert not (target / ".env").exists()
+    assert mode(target) == mode(target.parent) == 0o700
+    assert mode(target / "stack.yaml") == mode(target / "seed.sql") == mode(target / MANIFEST_NAME) == 0o600
+
+
+def test_unchanged_manifest_uploads_nothing(tmp_path, remote, bundle):
+    server, sync = remote
+    target = str(tmp_path / "remote")
+    sync.sync(bundle, target)
+    commands = len(server.commands)
+
+    report = sync.sync(bundle, target)
+
+    assert report.uploaded == [] and report.bytes_sent == 0
+    assert sorted(report.unchanged) == ["seed.sql", "stack.yaml"]
+    assert len(server.commands) == commands  # nem o tar de arquivos pequenos
+
+
+def test_partial_upload_resumes_from_its_offset(tmp_path, remote, bundle):
+    server, sync = remote
+    target = tmp_path / "remote"
+    target.mkdir()
+    offset = len(BIG) // 3
+    (target / "seed.sql.part").write_bytes(BIG[:offset])
+
+    report = sync.sync(bundle, str(target))
+
+    assert report.resumed == ["seed.sql"]
+    assert report.bytes_sent - len(BIG[offset:]) < LARGE_FILE  # o resto + o tar dos pequenos
+    assert (target / "seed.sql").read_bytes() == BIG
+    assert not (target / "seed.sql.part").exists()
+
+
+def test_part_with_other_content_starts_over(tmp_path, remote, bundle):
+    server, sync = remote
+    target = tmp_path / "remote"
+    target.mkdir()
+    (target / "seed.sql.part").write_bytes(b"x" * 1000)
+
+    report = sync.sync(bundle, str(target))
+
+    assert report.resumed == []
+    assert (target / "seed.sql").read_bytes() == BIG
+
+
+def test_files_deleted_locally_are_removed_remotely(tmp_path, remote, bundle):
+    server, sync = remote
+    target = tmp_path / "remote"
+    (bundle / "extra.yaml").write_text("x: 1\n")
+    sync.sync(bundle, str(target))
+    assert (target / "extra.yaml").exists()
+
+    (bundle / "extra.yaml").unlink()
+    report = sync.sync(bundle, str(target))
+
+    assert report.removed == ["extra.yaml"] and report.uploaded == []
+    assert not (target / "extra.yaml").exists()
+    assert (target / "stack.yaml").exists()
@@ -0,0 +1,99 @@
+from core.viewport import Viewport
+
+
+def window(viewport):
+    visible = viewport.visible()
+    return visible.start, visible.stop
+
+
+def test_paging_moves_cursor_and_window_by_a_page():
+    viewport = Viewport(total=100, height=10)
+    viewport.page_down()
+    assert viewport.cursor == 10 and window(viewport) == (10, 20)
+    viewport.page_down()
+    viewport.page_up()
+    assert viewport.cursor == 10 and window(viewport) == (10, 20)
+    viewport.page_up()
+    viewport.page_up()  # já no topo
+    assert viewport.cursor == 0 and window(viewport) == (0, 10)
+
+
+def test_paging_stops_at_the_ends():
+    viewport = Viewport(total=25, height=10)
+    for _ in range(5):
+        viewport.page_down()
+    assert viewport.cursor == 24 and window(viewport) == (15, 25)
+    viewport.end()
+    viewport.down()
+    assert viewport.cursor == 24
+    viewport.home()
+    viewport.up()
+    assert viewport.cursor == 0 and window(viewport) == (0, 10)
+
+
+def test_small_moves_scroll_the_minimum():
+    viewport = Viewport(total=50, height=5)
+    for _ in range(5):
+        viewport.down()
+    assert viewport.cursor == 5 and window(viewport) == (1, 6)
+    for _ in range(2):
+        viewport.up()
+    assert viewport.cursor == 3 and window(viewport) == (1, 6)  # ainda visível: não rola
+
+
+def test_shrinking_terminal_keeps_the_cursor_visible():
+    viewport = Viewport(total=100, height=20)
+    viewport.move_to(19)
+    viewport.resize(height=5)
+    assert viewport.cursor == 19 and viewport.cursor in viewport.visible()
+    assert window(viewport) == (15, 20)
+    viewport.resize(height=0)  # terminal minúsculo: ainda uma linha
+    assert viewport.height == 1 and list(viewport.visible()) == [19]
+
+
+def test_shrinking_list_clamps_the_cursor():
+    viewport = Viewport(total=100, height=10)
+    viewport.end()
+    viewport.resize(total=3)
+    assert viewport.cursor == 2 and window(viewport) == (0, 3)
+    viewport.resize(total=0)
+    assert viewport.cursor == 0 and list(viewport.visible()) == []
+
+
+def test_jump_to_item_scrolls_it_into_view():
+    viewport = Viewport(total=2000, height=10)
+    viewport.move_to(1234)
+    assert window(viewport) == (1225, 1235)
+    viewport.move_to(40)
+    assert window(viewport) == (40, 50)
+    viewport.move_to(5000)
+    assert viewport.cursor == 1999 and window(viewport) == (1990, 2000)
+
+
+def test_terminal_rows_leave_room_for_the_frame(monkeypatch):
+    monkeypatch.setenv("LINES", "30")
+    assert Viewport.terminal_rows(reserved=12) == 18
+    monkeypatch.setenv("LINES", "8")
+    assert Viewport.terminal_rows(reserved=12) == 3
+
+
+def test_menu_keeps_the_cursor_on_screen_when_the_terminal_shrinks(monkeypatch):
+    import io
+
+    from core.logger import Logger
+    from core.menu import InteractiveMenu
+    from core.screen import ScreenBuffer
+
+    monkeypatch.setenv("LINES", "60")
+    menu = InteractiveMenu(Logger(stream=io.StringIO()), {})
+    menu.screen = ScreenBuffer(stream=io.StringIO())
+    menu._draw_menu()
+    menu._handle_key("END")
+    last = menu.selected_index
+    assert last == len(menu.apps) - 1
+
+    monkeypatch.setenv("LINES", "10")
+    menu._draw_menu()
+    assert menu.selected_index == last
+    assert last in menu.viewport.visible()
+    assert len(menu.viewport.visible()) < len(menu.apps)
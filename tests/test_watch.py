@@ -0,0 +1,74 @@
+import io
+import time
+
+import pytest
+
+from core.docker_api import DockerClient
+from core.logger import Logger
+from core.watch import StatusWatch, describe_event
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condição não atingida a tempo")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def watch(engine):
+    engine.set_service("n8n_web", "n8n", 1, 1)
+    engine.set_service("n8n_worker", "n8n", 1, 1)
+    engine.set_service("postgres_postgres", "postgres", 1, 1)
+    watch = StatusWatch(Logger(stream=io.StringIO()), DockerClient(engine.path), interval=0)
+    watch.start()
+    wait_for(lambda: watch._events_ok and engine.subscribers() == 1)
+    yield watch
+    watch.close()
+
+
+def services_calls(engine):
+    return [call for call in engine.calls if call == ("GET", "/services")]
+
+
+def test_container_event_updates_exactly_one_row(engine, watch):
+    before = watch.frame()
+    calls = len(services_calls(engine))
+    # Mudanças sem evento no postgres não podem aparecer: só o stack do evento é consultado
+    engine.services["postgres_postgres"]["running"] = 0
+    engine.services["n8n_worker"]["running"] = 0
+    engine.publish({"Type": "container", "Action": "die",
+                    "Actor": {"Attributes": {"com.docker.stack.namespace": "n8n",
+                                             "com.docker.swarm.service.name": "n8n_worker",
+                                             "exitCode": "137"}}})
+    wait_for(lambda: watch._dirty)
+
+    watch.update()
+    after = watch.frame()
+
+    assert len(services_calls(engine)) == calls + 1
+    # Linhas dos stacks (depois das 4 de cabeçalho), na ordem alfabética: n8n, postgres
+    changed = [i for i in range(4, 6) if before[i] != after[i]]
+    assert changed == [4]
+    assert (watch.rows["n8n"].running, watch.rows["n8n"].desired) == (1, 2)
+    assert watch.rows["n8n"].failed and "parou (código 137)" in watch.rows["n8n"].event
+    assert watch.rows["postgres"].running == 1
+
+
+def test_service_event_maps_the_service_to_its_stack(engine, watch):
+    engine.set_service("postgres_postgres", "postgres", 0, 1)
+    wait_for(lambda: watch._dirty)
+    watch.update()
+    assert watch.rows["postgres"].running == 0
+    assert watch.rows["n8n"].event == ""
+
+
+def test_describe_event_flags_failures():
+    unhealthy = {"Type": "container", "Action": "health_status: unhealthy",
+                 "Actor": {"Attributes": {"com.docker.swarm.service.name": "n8n_web"}}, "time": 0}
+    text, failed = describe_event(unhealthy)
+    assert text.endswith("n8n_web unhealthy") and failed
+    clean_exit = {"Type": "container", "Action": "die",
+                  "Actor": {"Attributes": {"name": "n8n_web.1", "exitCode": "0"}}, "time": 0}
+    assert describe_event(clean_exit)[1] is False